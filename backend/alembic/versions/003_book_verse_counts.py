@@ -0,0 +1,43 @@
+"""Materialize per-chapter verse counts on bible_books
+
+Revision ID: 003
+Revises: 7ff3637a87d7
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "003"
+down_revision: Union[str, None] = "7ff3637a87d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("bible_books", sa.Column("verse_counts", postgresql.JSONB(), nullable=True))
+    # Backfill from existing verses; scripts/migrate_bible_data.py refreshes it on every load.
+    op.execute(
+        """
+        UPDATE bible_books b
+        SET verse_counts = c.counts
+        FROM (
+            SELECT book_id, jsonb_agg(n ORDER BY chapter) AS counts
+            FROM (
+                SELECT book_id, chapter, count(*) AS n
+                FROM bible_verses
+                GROUP BY book_id, chapter
+            ) per_chapter
+            GROUP BY book_id
+        ) c
+        WHERE c.book_id = b.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("bible_books", "verse_counts")
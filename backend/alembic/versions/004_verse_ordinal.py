@@ -0,0 +1,42 @@
+"""Add global canonical ordinal to bible_verses
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("bible_verses", sa.Column("ordinal", sa.Integer(), nullable=True))
+    # 1..N across the canon by (book_number, chapter, verse_number); the loader renumbers after imports.
+    op.execute(
+        """
+        UPDATE bible_verses v
+        SET ordinal = o.n
+        FROM (
+            SELECT bv.id, row_number() OVER (
+                ORDER BY bb.book_number, bv.chapter, bv.verse_number
+            ) AS n
+            FROM bible_verses bv
+            JOIN bible_books bb ON bb.id = bv.book_id
+        ) o
+        WHERE o.id = v.id
+        """
+    )
+    op.create_index("idx_bible_verses_ordinal", "bible_verses", ["ordinal"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_bible_verses_ordinal", table_name="bible_verses")
+    op.drop_column("bible_verses", "ordinal")
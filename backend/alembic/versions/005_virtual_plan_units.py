@@ -0,0 +1,34 @@
+"""Add virtual unit mode to plans
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("plans", sa.Column("unit_mode", sa.Text(), server_default="materialized", nullable=False))
+    op.add_column("plans", sa.Column("verses_per_unit", sa.Integer(), nullable=True))
+    op.add_column("plans", sa.Column("layout_origin", postgresql.JSONB(), nullable=True))
+    op.create_check_constraint(
+        "plans_unit_mode_check", "plans", "unit_mode IN ('materialized','virtual')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("plans_unit_mode_check", "plans", type_="check")
+    op.drop_column("plans", "layout_origin")
+    op.drop_column("plans", "verses_per_unit")
+    op.drop_column("plans", "unit_mode")
@@ -0,0 +1,30 @@
+"""Add read-state bitmaps to plans
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing plans; PlanService rebuilds them from reading_units on first use
+    op.add_column("plans", sa.Column("read_bitmap", sa.LargeBinary(), nullable=True))
+    op.add_column("plans", sa.Column("delivered_bitmap", sa.LargeBinary(), nullable=True))
+    op.add_column("plans", sa.Column("unit_verse_prefix", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("plans", "unit_verse_prefix")
+    op.drop_column("plans", "delivered_bitmap")
+    op.drop_column("plans", "read_bitmap")
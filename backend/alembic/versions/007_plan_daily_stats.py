@@ -0,0 +1,43 @@
+"""Add plan_daily_stats reading rollup
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "plan_daily_stats",
+        sa.Column("plan_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("plans.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("verses_read", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("units_read", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("plan_id", "date"),
+    )
+    # Existing reads; scripts/backfill_plan_daily_stats.py re-derives the table the same way.
+    op.execute(
+        """
+        INSERT INTO plan_daily_stats (plan_id, date, verses_read, units_read)
+        SELECT plan_id, date(timezone('UTC', read_at)), sum(verse_end - verse_start + 1), count(*)
+        FROM reading_units
+        WHERE state = 'read' AND read_at IS NOT NULL
+        GROUP BY plan_id, date(timezone('UTC', read_at))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("plan_daily_stats")
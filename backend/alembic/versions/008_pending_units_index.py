@@ -0,0 +1,32 @@
+"""Partial index for the next pending unit of a plan
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # next-unit reads the lowest pending unit_index; skip read units instead of scanning past them
+    op.create_index(
+        "idx_reading_units_pending",
+        "reading_units",
+        ["plan_id", "unit_index"],
+        unique=False,
+        postgresql_where=sa.text("state = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_reading_units_pending", table_name="reading_units")
@@ -0,0 +1,25 @@
+"""Add last_delivered_at to plans for push delivery
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("plans", sa.Column("last_delivered_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("plans", "last_delivered_at")
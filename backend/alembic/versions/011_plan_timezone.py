@@ -0,0 +1,25 @@
+"""Add timezone to plans so delivery windows are read in the reader's local time
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("plans", sa.Column("timezone", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("plans", "timezone")
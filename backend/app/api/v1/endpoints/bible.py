@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.services.bible_service import BibleService
+from app.schemas.bible import OrdinalVerseResponse, VerseBatchRequest, VerseRangeResult
+from app.services.bible_service import MAX_VERSE_SPAN, BibleService
 
 router = APIRouter()
 router_metadata = APIRouter()
@@ -36,3 +37,59 @@ async def get_verses(
     svc = BibleService(db)
     verses = await svc.get_verse_range(book, chapter, start, end)
     return [v.model_dump() for v in verses]
+
+
+@router_verses.post("/batch", response_model=list[VerseRangeResult])
+async def get_verses_batch(payload: VerseBatchRequest, db: AsyncSession = Depends(get_db)):
+    """Fetch several verse ranges in one request; results follow request order."""
+    for rng in payload.ranges:
+        if rng.start > rng.end:
+            raise HTTPException(status_code=400, detail="Invalid verse range")
+    svc = BibleService(db)
+    results = await svc.get_verse_ranges(
+        [(rng.book, rng.chapter, rng.start, rng.end) for rng in payload.ranges]
+    )
+    return [
+        VerseRangeResult(**rng.model_dump(), verses=verses)
+        for rng, verses in zip(payload.ranges, results)
+    ]
+
+
+@router_verses.get("/ordinal/{start}/{end}", response_model=list[OrdinalVerseResponse])
+async def get_verses_by_ordinal(
+    start: int = Path(..., ge=1),
+    end: int = Path(..., ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Verses by global ordinal interval (1..N across the canon); may span chapters and books."""
+    if start > end:
+        raise HTTPException(status_code=400, detail="Invalid ordinal range")
+    if end - start + 1 > MAX_VERSE_SPAN:
+        raise HTTPException(status_code=400, detail=f"Range exceeds {MAX_VERSE_SPAN} verses")
+    svc = BibleService(db)
+    return await svc.get_verses_by_ordinal(start, end)
+
+
+@router_verses.get("/passage", response_model=list[OrdinalVerseResponse])
+async def get_passage(
+    start_book: str,
+    start_chapter: int = Query(..., ge=1),
+    start_verse: int = Query(..., ge=1),
+    end_chapter: int = Query(..., ge=1),
+    end_verse: int = Query(..., ge=1),
+    end_book: str | None = Query(None, description="Defaults to start_book"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Verses from start to end position in canonical order, across chapters and books."""
+    svc = BibleService(db)
+    try:
+        return await svc.get_passage(
+            start_book,
+            start_chapter,
+            start_verse,
+            end_book or start_book,
+            end_chapter,
+            end_verse,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
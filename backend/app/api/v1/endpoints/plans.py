@@ -1,15 +1,15 @@
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.models import Plan, ReadingUnit
-from app.schemas.plan import PlanCreate, PlanUpdate, PlanResponse, PlanCalculateResponse, ReadingUnitInPlan, PlanProgress
-from app.schemas.unit import NextUnitResponse, ReadingUnitResponse
-from app.services.bible_service import BibleService
-from app.services.plan_service import PlanService
+from app.core.database import PLAN_CHANGED_CHANNEL, get_db, notify
+from app.models import Plan
+from app.schemas.plan import PlanCreate, PlanUpdate, PlanResponse, PlanCalculateResponse, ReadingUnitInPlan, ProjectedUnitInPlan, PlanProgress
+from app.schemas.unit import DeliveryBundleResponse, NextUnitResponse, ReadingUnitResponse
+from app.services.plan_service import UNIT_FIELDS, PlanService
 from app.services.scheduler_service import SchedulerService
 
 router = APIRouter()
@@ -31,6 +31,7 @@ async def create_plan(payload: PlanCreate, db: AsyncSession = Depends(get_db)):
     svc = PlanService(db)
     try:
         plan = await svc.create_plan(payload.device_id, payload)
+        await notify(db, PLAN_CHANGED_CHANNEL, str(plan.id))
         return {"plan_id": str(plan.id), "message": "Plan created"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -46,27 +47,32 @@ async def plan_calculate(id: UUID, db: AsyncSession = Depends(get_db)):
     return PlanCalculateResponse(**data)
 
 
-@router.get("/{id}", response_model=PlanResponse)
-async def get_plan(id: UUID, db: AsyncSession = Depends(get_db)):
-    """Get plan state including units and read statuses. SRS."""
+@router.get("/{id}", response_model=PlanResponse, response_model_exclude_unset=True)
+async def get_plan(
+    id: UUID,
+    after: int | None = Query(None, ge=-1, description="Cursor: only units with unit_index > after"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size; all units if omitted"),
+    state: str | None = Query(None, pattern="^(pending|delivered|read)$"),
+    fields: str | None = Query(None, description="Comma-separated unit fields, e.g. unit_index,state"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get plan state including units and read statuses. SRS. Units page by unit_index cursor."""
+    field_list = None
+    if fields is not None:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(field_list) - set(UNIT_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown unit fields: {', '.join(sorted(unknown))}")
     r = await db.execute(select(Plan).where(Plan.id == id))
     plan = r.scalar_one_or_none()
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
-    r2 = await db.execute(
-        select(ReadingUnit).where(ReadingUnit.plan_id == id).order_by(ReadingUnit.unit_index)
+    units, next_cursor = await PlanService(db).list_units(
+        plan, after=after, limit=limit, state=state, fields=field_list
     )
-    units = r2.scalars().all()
+    # Full stored rows keep the required-field schema; projections and virtual units do not
     unit_list = [
-        ReadingUnitInPlan(
-            id=u.id,
-            book=u.book,
-            chapter=u.chapter,
-            verse_start=u.verse_start,
-            verse_end=u.verse_end,
-            unit_index=u.unit_index,
-            state=u.state,
-        )
+        ReadingUnitInPlan(**u) if field_list is None and u["id"] is not None else ProjectedUnitInPlan(**u)
         for u in units
     ]
     return PlanResponse(
@@ -78,10 +84,14 @@ async def get_plan(id: UUID, db: AsyncSession = Depends(get_db)):
         frequency=plan.frequency,
         quiet_hours=plan.quiet_hours,
         working_hours=plan.working_hours,
+        timezone=plan.timezone,
         max_verses_per_unit=plan.max_verses_per_unit,
         time_lap_minutes=plan.time_lap_minutes,
         state=plan.state,
+        unit_mode=plan.unit_mode,
+        version=plan.version,
         units=unit_list,
+        next_cursor=next_cursor,
     )
 
 
@@ -89,41 +99,42 @@ async def get_plan(id: UUID, db: AsyncSession = Depends(get_db)):
 async def update_plan(id: UUID, payload: PlanUpdate, db: AsyncSession = Depends(get_db)):
     """Modify plan (pause/extend/modify). SRS: Recalculate; preserve read states."""
     svc = PlanService(db)
-    plan = await svc.update_plan(id, payload)
+    try:
+        plan = await svc.update_plan(id, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
+    await notify(db, PLAN_CHANGED_CHANNEL, str(plan.id))
     return {"message": "Plan updated", "id": str(id)}
 
 
 @router.get("/{id}/next-unit", response_model=NextUnitResponse)
 async def get_next_unit(id: UUID, db: AsyncSession = Depends(get_db)):
     """SDS: Used by service worker. First pending unit with text."""
-    r = await db.execute(
-        select(ReadingUnit).where(
-            ReadingUnit.plan_id == id,
-            ReadingUnit.state == "pending",
-        ).order_by(ReadingUnit.unit_index).limit(1)
-    )
-    unit = r.scalar_one_or_none()
+    unit = await PlanService(db).next_unit_with_text(id)
     if not unit:
         return NextUnitResponse(unit=None, message="No pending unit")
-    bible = BibleService(db)
-    verses = await bible.get_verse_range(
-        unit.book, unit.chapter, unit.verse_start, unit.verse_end
-    )
-    text = " ".join(v.text for v in verses)
-    return NextUnitResponse(
-        unit=ReadingUnitResponse(
-            id=unit.id,
-            book=unit.book,
-            chapter=unit.chapter,
-            verse_start=unit.verse_start,
-            verse_end=unit.verse_end,
-            text=text,
-            unit_index=unit.unit_index,
-            state=unit.state,
-        )
-    )
+    return NextUnitResponse(unit=ReadingUnitResponse(**unit))
+
+
+@router.get("/{id}/delivery-bundle", response_model=DeliveryBundleResponse)
+async def get_delivery_bundle(
+    id: UUID,
+    count: int = Query(10, ge=1, le=50, description="Units to bundle"),
+    tz: str | None = Query(None, description="IANA time zone of quiet/working hours (default: the plan's), e.g. Africa/Addis_Ababa"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Next pending units with text and delivery times, so the extension schedules locally."""
+    try:
+        zone = ZoneInfo(tz) if tz else None
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}")
+    svc = PlanService(db)
+    plan = await svc.get_plan(id)
+    if not plan:
+        raise HTTPException(status_code=404, detail="Plan not found")
+    return await svc.delivery_bundle(plan, count, zone)
 
 
 @router.put("/{id}/extend", response_model=dict)
@@ -137,6 +148,7 @@ async def extend_plan(
     plan = await svc.extend_plan(id, additional_days=additional_days)
     if not plan:
         raise HTTPException(status_code=404, detail="Plan not found")
+    await notify(db, PLAN_CHANGED_CHANNEL, str(plan.id))
     return {
         "message": "Plan extended",
         "id": str(id),
@@ -0,0 +1,44 @@
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models import Device
+from app.services.push_hub import get_push_hub
+
+router = APIRouter()
+
+
+@router.get("/{device_id}/events")
+async def device_events(device_id: UUID):
+    """
+    Server-sent events for one device: `unit` events carry a due reading unit (with
+    plan_id) at its delivery time; idle streams get a keepalive comment.
+    """
+    # Not Depends(get_db): that session would stay checked out for the life of the stream.
+    async with async_session_factory() as session:
+        r = await session.execute(select(Device.id).where(Device.id == device_id))
+        if r.scalar_one_or_none() is None:
+            raise HTTPException(status_code=404, detail="Device not found")
+
+    hub = get_push_hub()
+
+    async def stream():
+        sub = hub.subscribe(device_id)
+        try:
+            yield "retry: 10000\n\n"
+            while True:
+                frames = await sub.wait(settings.push_heartbeat_seconds)
+                for frame in frames or (": keepalive\n\n",):
+                    yield frame
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
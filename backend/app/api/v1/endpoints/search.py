@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.schemas.search import SearchResponse
+from app.services.bible_service import BibleService
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResponse)
+async def search_verses(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    """Full-text search over verse text. Ranked hits with book/chapter/verse."""
+    svc = BibleService(db)
+    result = await svc.search(q, page=page, page_size=page_size)
+    if result is None:
+        raise HTTPException(status_code=503, detail="Search index not loaded")
+    return result
@@ -1,4 +1,3 @@
-from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -8,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.models import ReadingUnit
 from app.schemas.unit import UnitReadResponse, ReadingUnitResponse
+from app.services.plan_service import PlanService
 
 router = APIRouter()
 
@@ -44,9 +44,6 @@ async def mark_unit_read(id: UUID, db: AsyncSession = Depends(get_db)):
     unit = r.scalar_one_or_none()
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
-    if unit.state == "read":
+    if unit.state == "read" or not await PlanService(db).mark_unit_read(id):
         return UnitReadResponse(message="Already read", unit_id=id)
-    unit.state = "read"
-    unit.read_at = datetime.utcnow()
-    await db.flush()
     return UnitReadResponse(unit_id=id)
@@ -19,6 +19,12 @@ class Settings(BaseSettings):
     # Security (SDS: 100 req/min per IP)
     rate_limit_per_minute: int = 100
 
+    # Keep bible_books/bible_verses in memory per worker (immutable after migration)
+    bible_corpus_enabled: bool = True
+
+    # Idle event streams get a comment frame this often so dead connections are noticed
+    push_heartbeat_seconds: int = 25
+
     debug: bool = False
 
 
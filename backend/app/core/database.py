@@ -1,9 +1,16 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+
+import asyncpg
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from app.core.config import settings
 from app.models import Base
 
+logger = logging.getLogger(__name__)
+
 _db_url = settings.database_url
 if _db_url.startswith("postgresql://") and "+asyncpg" not in _db_url:
     _db_url = _db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
@@ -24,6 +31,57 @@ async_session_factory = async_sessionmaker(
 )
 
 
+# scripts/migrate_bible_data.py sends NOTIFY on this channel after loading Bible data.
+BIBLE_DATA_CHANNEL = "bible_data_changed"
+
+# The plan endpoints send the plan id on this channel after creating or changing a plan,
+# so every worker's DeliveryScheduler picks up the new timing.
+PLAN_CHANGED_CHANNEL = "plan_changed"
+
+
+LISTEN_RETRY_SECONDS = (1, 2, 5, 15, 30)
+
+
+async def listen(channel: str, callback: Callable[[str | None], None]) -> None:
+    """
+    LISTEN on a dedicated asyncpg connection (not from the pool) until cancelled; run it
+    as a task. callback gets each notification's payload. A lost connection is retried with
+    backoff; notifications sent meanwhile are gone, so callback(None) runs after reconnecting.
+    """
+    dsn = _db_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    attempt = 0
+    reconnecting = False
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(dsn)
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            await conn.add_listener(channel, lambda _conn, _pid, _channel, payload: callback(payload))
+            if reconnecting:
+                logger.info("LISTEN %s: reconnected", channel)
+                callback(None)
+            attempt = 0
+            await closed.wait()
+            logger.warning("LISTEN %s: connection lost", channel)
+        except asyncio.CancelledError:
+            if conn is not None:
+                await conn.close()
+            raise
+        except Exception as e:
+            logger.warning("LISTEN %s unavailable: %s", channel, e)
+        if conn is not None and not conn.is_closed():
+            conn.terminate()
+        reconnecting = True
+        await asyncio.sleep(LISTEN_RETRY_SECONDS[min(attempt, len(LISTEN_RETRY_SECONDS) - 1)])
+        attempt += 1
+
+
+async def notify(db: AsyncSession, channel: str, payload: str) -> None:
+    """NOTIFY channel; Postgres delivers it to listeners when db's transaction commits."""
+    await db.execute(select(func.pg_notify(channel, payload)))
+
+
 async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -1,17 +1,132 @@
+import asyncio
+import traceback
+import uuid
 from contextlib import asynccontextmanager
+from datetime import datetime, time, timedelta, timezone
 
 from fastapi import FastAPI
 
-from app.core.database import init_db
+from app.core.database import BIBLE_DATA_CHANNEL, PLAN_CHANGED_CHANNEL, async_session_factory, init_db, listen
 from app.core.security import RateLimitMiddleware
 from app.core.config import settings
 from app.api.v1 import api_router
+from app.services.bible_corpus import load_corpus
+from app.services.bible_service import clear_bible_caches
+from app.services.delivery_scheduler import DeliveryScheduler, set_delivery_scheduler
+from app.services.plan_service import PlanService
+from app.services.push_hub import PushHub, set_push_hub
+from app.services.topic_catalogue import invalidate_topic_catalogue
+from app.services.verse_search import VerseSearchIndex, set_search_index
+
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def reload_bible_data() -> None:
+    clear_bible_caches()
+    invalidate_topic_catalogue()
+    if settings.bible_corpus_enabled:
+        async with async_session_factory() as session:
+            corpus = await load_corpus(session)
+        # Tokenizing every verse takes a moment; keep the event loop free meanwhile.
+        set_search_index(await asyncio.to_thread(VerseSearchIndex, corpus) if corpus else None)
+
+
+def _spawn(coro) -> None:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def _on_bible_data_changed(payload: str | None) -> None:
+    _spawn(reload_bible_data())
+
+
+async def deliver_due_plans(plan_ids: list[uuid.UUID], now: datetime) -> None:
+    """
+    DeliveryScheduler callback. Each due plan is claimed and its next unit pushed, then
+    rescheduled from the last_delivered_at the claim saw: another worker holding a stream
+    of the same device may have delivered it first.
+    """
+    connected = [p for p in plan_ids if push_hub.is_connected(delivery_scheduler.device_of(p))]
+    deliveries = {}
+    if connected:
+        async with async_session_factory() as session:
+            deliveries = await PlanService(session).deliver_units(connected, now)
+            await session.commit()
+    for plan_id in plan_ids:
+        delivery = deliveries.get(plan_id)
+        if delivery is None or delivery.exhausted:
+            # Not active, its device gone or nothing pending; a plan change tracks it again.
+            delivery_scheduler.untrack(plan_id)
+            continue
+        if delivery.unit is not None:
+            push_hub.publish(delivery_scheduler.device_of(plan_id), "unit", delivery.unit)
+        delivery_scheduler.reschedule_after(plan_id, delivery.last_delivered_at, now)
+
+
+async def load_device_plans(device_ids: list[uuid.UUID]) -> None:
+    async with async_session_factory() as session:
+        await delivery_scheduler.load(session, device_ids)
+    for device_id in device_ids:
+        if not push_hub.is_connected(device_id):  # disconnected while loading
+            delivery_scheduler.untrack_device(device_id)
+
+
+async def reload_plan(plan_id: uuid.UUID) -> None:
+    async with async_session_factory() as session:
+        plan = await PlanService(session).get_plan(plan_id)
+    if plan is None or not push_hub.is_connected(plan.device_id):
+        delivery_scheduler.untrack(plan_id)
+    else:
+        delivery_scheduler.track_plan(plan)
+
+
+def _on_device_connected(device_id: uuid.UUID) -> None:
+    _spawn(load_device_plans([device_id]))
+
+
+def _on_plan_changed(payload: str | None) -> None:
+    if payload is None:
+        # Notifications were missed while reconnecting
+        _spawn(load_device_plans(push_hub.connected_devices()))
+    else:
+        _spawn(reload_plan(uuid.UUID(payload)))
+
+
+async def rebuild_schedule_nightly() -> None:
+    """Recalculate the connected devices' plans from the plans table once a day."""
+    while True:
+        now = datetime.now(timezone.utc)
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min, timezone.utc)
+        await asyncio.sleep((midnight - now).total_seconds())
+        try:
+            await load_device_plans(push_hub.connected_devices())
+        except Exception:
+            traceback.print_exc()
+
+
+# Only the plans of devices with a stream open on this worker are scheduled here.
+delivery_scheduler = DeliveryScheduler()
+push_hub = PushHub(on_connect=_on_device_connected, on_disconnect=delivery_scheduler.untrack_device)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    await reload_bible_data()
+    set_push_hub(push_hub)
+    set_delivery_scheduler(delivery_scheduler)
+    scheduler_tasks = [
+        asyncio.create_task(delivery_scheduler.run(deliver_due_plans)),
+        asyncio.create_task(rebuild_schedule_nightly()),
+        # Bible data only changes when the loader runs; it notifies every worker.
+        asyncio.create_task(listen(BIBLE_DATA_CHANNEL, _on_bible_data_changed)),
+        # Plan endpoints notify every worker, whichever one holds the device's stream.
+        asyncio.create_task(listen(PLAN_CHANGED_CHANNEL, _on_plan_changed)),
+    ]
     yield
+    for task in scheduler_tasks:
+        task.cancel()
 
 
 app = FastAPI(
@@ -10,6 +10,7 @@ from app.models.bible_topic import BibleTopic, BibleTopicVerse
 from app.models.device import Device
 from app.models.feedback import Feedback
 from app.models.plan import Plan
+from app.models.plan_daily_stats import PlanDailyStats
 from app.models.reading_unit import ReadingUnit
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     "Device",
     "Feedback",
     "Plan",
+    "PlanDailyStats",
     "ReadingUnit",
 ]
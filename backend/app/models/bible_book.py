@@ -1,4 +1,5 @@
 from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -13,6 +14,7 @@ class BibleBook(Base):
     book_number: Mapped[int] = mapped_column(Integer, nullable=False, unique=True)  # from filename 01_, 02_, ...
     title: Mapped[str] = mapped_column(Text, nullable=False)
     abbv: Mapped[str] = mapped_column(Text, nullable=False, server_default="")
+    verse_counts: Mapped[list | None] = mapped_column(JSONB, nullable=True)  # per chapter, filled by loader
 
     verses = relationship("BibleVerse", back_populates="book", cascade="all, delete-orphan")
 
@@ -31,5 +33,6 @@ class BibleVerse(Base):
     chapter: Mapped[int] = mapped_column(Integer, nullable=False)
     verse_number: Mapped[int] = mapped_column(Integer, nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
+    ordinal: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 1..N in canonical order
 
     book = relationship("BibleBook", back_populates="verses")
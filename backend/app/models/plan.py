@@ -1,7 +1,7 @@
 from datetime import date, datetime
 import uuid
 
-from sqlalchemy import Date, DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, LargeBinary, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -30,9 +30,19 @@ class Plan(Base):
     )  # CHECK in migration
     quiet_hours: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # {"start":"22:00","end":"06:00"}
     working_hours: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # {"start":"08:00","end":"17:00"}
+    timezone: Mapped[str | None] = mapped_column(Text, nullable=True)  # IANA zone of quiet/working hours; NULL = UTC
     max_verses_per_unit: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
     time_lap_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=60)
     state: Mapped[str] = mapped_column(Text, nullable=False, default="active")  # active, paused, completed
+    last_delivered_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # push channel
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)  # bumped when schedule or units change
+    unit_mode: Mapped[str] = mapped_column(Text, nullable=False, default="materialized")  # materialized, virtual
+    verses_per_unit: Mapped[int | None] = mapped_column(Integer, nullable=True)  # unit size used by segmentation
+    layout_origin: Mapped[dict | None] = mapped_column(JSONB, nullable=True)  # virtual: where an extension resumed
+    # ReadState columns (bit i = unit_index i); NULL means rebuild from reading_units on next use
+    read_bitmap: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    delivered_bitmap: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    unit_verse_prefix: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)  # uint32 LE, units + 1
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -0,0 +1,23 @@
+from datetime import date
+import uuid
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class PlanDailyStats(Base):
+    """Per-plan reading totals by UTC day, maintained by mark_unit_read (progress history)."""
+
+    __tablename__ = "plan_daily_stats"
+
+    plan_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("plans.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    verses_read: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    units_read: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -4,11 +4,26 @@ from app.schemas.plan import (
     PlanResponse,
     PlanCalculateResponse,
     ReadingUnitInPlan,
+    ProjectedUnitInPlan,
+)
+from app.schemas.unit import (
+    ReadingUnitResponse,
+    UnitReadResponse,
+    NextUnitResponse,
+    ScheduledUnit,
+    DeliveryBundleResponse,
 )
-from app.schemas.unit import ReadingUnitResponse, UnitReadResponse, NextUnitResponse
 from app.schemas.feedback import FeedbackSubmit
 from app.schemas.random_verse import RandomVerseRequest, RandomVerseResponse
-from app.schemas.bible import MetadataResponse, VerseResponse
+from app.schemas.bible import (
+    MetadataResponse,
+    VerseResponse,
+    OrdinalVerseResponse,
+    VerseRangeRequest,
+    VerseBatchRequest,
+    VerseRangeResult,
+)
+from app.schemas.search import SearchHit, SearchResponse
 
 __all__ = [
     "PlanCreate",
@@ -18,9 +33,17 @@ __all__ = [
     "ReadingUnitResponse",
     "UnitReadResponse",
     "NextUnitResponse",
+    "ScheduledUnit",
+    "DeliveryBundleResponse",
     "FeedbackSubmit",
     "RandomVerseRequest",
     "RandomVerseResponse",
     "MetadataResponse",
     "VerseResponse",
+    "OrdinalVerseResponse",
+    "VerseRangeRequest",
+    "VerseBatchRequest",
+    "VerseRangeResult",
+    "SearchHit",
+    "SearchResponse",
 ]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MetadataResponse(BaseModel):
@@ -17,3 +17,28 @@ class VerseResponse(BaseModel):
     chapter: int
     verse: int
     text: str
+
+
+class OrdinalVerseResponse(VerseResponse):
+    """Verse with its global canonical ordinal (1..N across the canon)."""
+
+    ordinal: int
+
+
+class VerseRangeRequest(BaseModel):
+    """One contiguous range within a chapter."""
+
+    book: str
+    chapter: int = Field(..., ge=1)
+    start: int = Field(..., ge=1)
+    end: int = Field(..., ge=1)
+
+
+class VerseBatchRequest(BaseModel):
+    """POST /verses/batch body: ranges are answered in request order."""
+
+    ranges: list[VerseRangeRequest] = Field(..., min_length=1, max_length=100)
+
+
+class VerseRangeResult(VerseRangeRequest):
+    verses: list[VerseResponse] = []
@@ -46,8 +46,18 @@ class PlanCreate(BaseModel):
         None,
         description="Time periods when notifications are allowed"
     )
+    timezone: str | None = Field(
+        None,
+        description="IANA time zone of quiet/working hours (UTC when omitted)",
+        examples=["Africa/Addis_Ababa"],
+    )
     max_verses_per_unit: int = Field(3, ge=1, le=50, description="Maximum verses delivered in a single notification")
     time_lap_minutes: int = Field(60, ge=1, le=1440, description="Interval between notifications in minutes")
+    unit_mode: str = Field(
+        "materialized",
+        pattern="^(materialized|virtual)$",
+        description="virtual: units are computed on demand and only delivered/read units are stored",
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -80,6 +90,7 @@ class PlanUpdate(BaseModel):
     frequency: str | None = None
     quiet_hours: QuietHoursSchema | None = None
     working_hours: QuietHoursSchema | None = None
+    timezone: str | None = None
     max_verses_per_unit: int | None = None
     time_lap_minutes: int | None = None
     state: str | None = Field(None, pattern="^(active|paused|completed)$")
@@ -104,6 +115,24 @@ class ReadingUnitInPlan(BaseModel):
         from_attributes = True
 
 
+class ProjectedUnitInPlan(BaseModel):
+    """
+    Unit in a plan response that is not a full stored row: with ?fields= only the requested
+    fields (and unit_index) are present; id is None for not-yet-delivered virtual units.
+    """
+
+    id: UUID | None = None
+    book: str | None = None
+    chapter: int | None = None
+    verse_start: int | None = None
+    verse_end: int | None = None
+    unit_index: int
+    state: str | None = None
+
+    class Config:
+        from_attributes = True
+
+
 class PlanResponse(BaseModel):
     """SRS: Plan schema with units."""
 
@@ -115,10 +144,14 @@ class PlanResponse(BaseModel):
     frequency: str | None
     quiet_hours: QuietHoursSchema | None
     working_hours: QuietHoursSchema | None
+    timezone: str | None = None
     max_verses_per_unit: int
     time_lap_minutes: int
     state: str
-    units: list[ReadingUnitInPlan] = []
+    unit_mode: str = "materialized"
+    version: int = 1  # bumped on update/extend; delivery bundles of older versions are stale
+    units: list[ReadingUnitInPlan | ProjectedUnitInPlan] = []
+    next_cursor: int | None = None  # pass as ?after= for the next page of units
 
     class Config:
         from_attributes = True
@@ -136,6 +169,7 @@ class PlanCalculateResponse(BaseModel):
 class DailyHistoryItem(BaseModel):
     date: date
     verses_read: int
+    units_read: int = 0
 
 class PlanProgress(BaseModel):
     """Used for /v1/plan/{id}/progress."""
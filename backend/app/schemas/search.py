@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """One verse matching a search query."""
+
+    book: str
+    chapter: int
+    verse: int
+    text: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    """GET /v1/search - ranked verse hits, one page at a time."""
+
+    query: str
+    total: int
+    page: int
+    page_size: int
+    hits: list[SearchHit] = []
@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -31,3 +32,21 @@ class NextUnitResponse(BaseModel):
 
     unit: ReadingUnitResponse | None = None
     message: str | None = None  # e.g. "No pending unit"
+
+
+class ScheduledUnit(ReadingUnitResponse):
+    """Bundled unit with the moment the client should show it."""
+
+    deliver_at: datetime
+
+
+class DeliveryBundleResponse(BaseModel):
+    """
+    GET /v1/plan/{id}/delivery-bundle - next units with text and delivery times.
+    Refetch at refresh_at (bundle exhausted) or once a bundle reports a newer version.
+    """
+
+    plan_id: UUID
+    version: int
+    units: list[ScheduledUnit] = []
+    refresh_at: datetime | None = None
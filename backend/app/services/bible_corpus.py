@@ -0,0 +1,173 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BibleBook, BibleVerse
+from app.schemas.bible import MetadataResponse, VerseResponse
+from app.utils.verse_index import VerseIndex
+
+
+class BibleCorpus:
+    """
+    Immutable in-memory copy of bible_books/bible_verses (Architecture: loaded at startup).
+
+    All verse texts live in one string; integer arrays index into it:
+    - _verse_offsets[i]..[i+1] is the text of global verse i (canonical order)
+    - _chapter_first[c] is the first global verse of global chapter c
+    - _book_first_chapter[b] is the first global chapter of book b
+    Chapters and verses are assumed numbered 1..n, as written by migrate_bible_data.py.
+    """
+
+    def __init__(self, books: Iterable[tuple[str, list[list[str]]]]):
+        titles: list[str] = []
+        parts: list[str] = []
+        verse_offsets = array("L", [0])
+        chapter_first = array("L")
+        book_first_chapter = array("L")
+        pos = 0
+        for title, chapters in books:
+            titles.append(title)
+            book_first_chapter.append(len(chapter_first))
+            for verses in chapters:
+                chapter_first.append(len(verse_offsets) - 1)
+                for text in verses:
+                    parts.append(text)
+                    pos += len(text)
+                    verse_offsets.append(pos)
+        book_first_chapter.append(len(chapter_first))
+        chapter_first.append(len(verse_offsets) - 1)
+
+        self._titles = titles
+        self._book_index = {t: i for i, t in enumerate(titles)}
+        self._text = "".join(parts)
+        self._verse_offsets = verse_offsets
+        self._chapter_first = chapter_first
+        self._book_first_chapter = book_first_chapter
+        self._verse_indexes: dict[str, VerseIndex] = {}
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "BibleCorpus":
+        """Read every verse once, in canonical order (book_number, chapter, verse_number)."""
+        r = await db.execute(
+            select(BibleBook.title, BibleVerse.chapter, BibleVerse.text)
+            .join(BibleVerse, BibleVerse.book_id == BibleBook.id)
+            .order_by(BibleBook.book_number, BibleVerse.chapter, BibleVerse.verse_number)
+        )
+        books: list[tuple[str, list[list[str]]]] = []
+        last_chapter = None
+        for title, chapter, text in r.all():
+            if not books or books[-1][0] != title:
+                books.append((title, []))
+                last_chapter = None
+            if chapter != last_chapter:
+                books[-1][1].append([])
+                last_chapter = chapter
+            books[-1][1][-1].append(text)
+        return cls(books)
+
+    def __len__(self) -> int:
+        return len(self._verse_offsets) - 1
+
+    def __contains__(self, book: str) -> bool:
+        return book in self._book_index
+
+    def list_books(self) -> list[str]:
+        return list(self._titles)
+
+    def verse_counts(self, book: str) -> list[int] | None:
+        """Verses per chapter for a book, or None if unknown."""
+        b = self._book_index.get(book)
+        if b is None:
+            return None
+        cf = self._chapter_first
+        return [
+            cf[c + 1] - cf[c]
+            for c in range(self._book_first_chapter[b], self._book_first_chapter[b + 1])
+        ]
+
+    def verse_index(self, book: str) -> VerseIndex | None:
+        index = self._verse_indexes.get(book)
+        if index is None:
+            counts = self.verse_counts(book)
+            if counts is None:
+                return None
+            index = self._verse_indexes[book] = VerseIndex(counts)
+        return index
+
+    def get_metadata(self, book: str) -> MetadataResponse | None:
+        counts = self.verse_counts(book)
+        if counts is None:
+            return None
+        return MetadataResponse(
+            book=book,
+            chapter_count=len(counts),
+            verse_counts=counts,
+            tags=[],
+        )
+
+    def verse_text(self, i: int) -> str:
+        """Text of global verse i (0-based, canonical order)."""
+        return self._text[self._verse_offsets[i] : self._verse_offsets[i + 1]]
+
+    def locate(self, i: int) -> tuple[str, int, int]:
+        """(book, chapter, verse) of global verse i."""
+        c = bisect_right(self._chapter_first, i) - 1
+        b = bisect_right(self._book_first_chapter, c) - 1
+        return (
+            self._titles[b],
+            c - self._book_first_chapter[b] + 1,
+            i - self._chapter_first[c] + 1,
+        )
+
+    def _chapter_slice(self, book: str, chapter: int) -> tuple[int, int] | None:
+        """Global [first, last) verse indexes of a chapter, or None if it does not exist."""
+        b = self._book_index.get(book)
+        if b is None or chapter < 1:
+            return None
+        c = self._book_first_chapter[b] + chapter - 1
+        if c >= self._book_first_chapter[b + 1]:
+            return None
+        return self._chapter_first[c], self._chapter_first[c + 1]
+
+    def ordinal(self, book: str, chapter: int, verse: int) -> int | None:
+        """Global ordinal (1-based, as bible_verses.ordinal) of an existing verse."""
+        bounds = self._chapter_slice(book, chapter)
+        if not bounds or verse < 1 or verse > bounds[1] - bounds[0]:
+            return None
+        return bounds[0] + verse
+
+    def get_verse_range(
+        self, book: str, chapter: int, start: int, end: int
+    ) -> list[VerseResponse]:
+        bounds = self._chapter_slice(book, chapter)
+        if not bounds:
+            return []
+        first, stop = bounds
+        lo = max(start, 1)
+        hi = min(end, stop - first)
+        return [
+            VerseResponse(book=book, chapter=chapter, verse=v, text=self.verse_text(first + v - 1))
+            for v in range(lo, hi + 1)
+        ]
+
+
+_corpus: BibleCorpus | None = None
+
+
+def get_corpus() -> BibleCorpus | None:
+    """Process-wide corpus, or None when not loaded (BibleService then falls back to SQL)."""
+    return _corpus
+
+
+def set_corpus(corpus: BibleCorpus | None) -> None:
+    global _corpus
+    # An empty corpus (data not migrated yet) must not shadow the database.
+    _corpus = corpus if corpus is not None and len(corpus) else None
+
+
+async def load_corpus(db: AsyncSession) -> BibleCorpus | None:
+    set_corpus(await BibleCorpus.load(db))
+    return _corpus
@@ -1,29 +1,42 @@
 import random
 
-from sqlalchemy import select, func
+from sqlalchemy import and_, literal_column, or_, select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import (
-    BibleBook, 
-    BibleVerse, 
-    BibleTopic,
-    BibleTopicVerse
-    )
+from app.models import BibleBook, BibleVerse
 from app.schemas.bible import (
     MetadataResponse,
-    VerseResponse
+    OrdinalVerseResponse,
+    VerseResponse,
 )
 from app.schemas.random_verse import RandomVerseResponse
+from app.schemas.search import SearchHit, SearchResponse
+from app.services.bible_corpus import get_corpus
+from app.services.topic_catalogue import get_topic_catalogue
+from app.services.verse_search import get_search_index
+from app.utils.verse_index import VerseIndex
+
+# Bible data is immutable after migration, so per-book indexes live for the process.
+_verse_index_cache: dict[str, VerseIndex] = {}
+# (min id, max id) of bible_verses; ids are dense after the bulk load.
+_verse_id_bounds: tuple[int, int] | None = None
+# Most verses one ordinal or passage request may return.
+MAX_VERSE_SPAN = 500
 
 
 class BibleService:
-    """Read-only Bible data from PostgreSQL."""
+    """Read-only Bible data from PostgreSQL (or the in-memory corpus when loaded)."""
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.corpus = get_corpus()
+        self.search_index = get_search_index()
 
     async def list_books(self) -> list[str]:
         """SRS: GET /books - list all book names (titles)."""
+        if self.corpus:
+            return self.corpus.list_books()
         r = await self.db.execute(
             select(BibleBook.title).order_by(BibleBook.book_number)
         )
@@ -31,22 +44,19 @@ class BibleService:
 
     async def get_metadata(self, book: str) -> MetadataResponse | None:
         """SRS: GET /metadata/{book} - chapter count, verse counts per chapter, tags."""
-        book_row = await self.db.execute(
-            select(BibleBook).where(BibleBook.title == book)
-        )
-        b = book_row.scalar_one_or_none()
-        if not b:
-            return None
-        # Verse counts per chapter
+        if self.corpus:
+            return self.corpus.get_metadata(book)
         r = await self.db.execute(
-            select(BibleVerse.chapter, func.count(BibleVerse.id))
-            .where(BibleVerse.book_id == b.id)
-            .group_by(BibleVerse.chapter)
-            .order_by(BibleVerse.chapter)
+            select(BibleBook.id, BibleBook.verse_counts).where(BibleBook.title == book)
         )
-        rows = r.all()
-        chapter_count = len(rows)
-        verse_counts = [count for _, count in rows]
+        row = r.one_or_none()
+        if not row:
+            return None
+        book_id, verse_counts = row
+        if verse_counts is None:
+            # Not materialized yet (loader not re-run since migration 003)
+            verse_counts = await self._aggregate_verse_counts(book_id)
+        chapter_count = len(verse_counts)
         return MetadataResponse(
             book=book,
             chapter_count=chapter_count,
@@ -54,10 +64,54 @@ class BibleService:
             tags=[],  
         )
 
+    async def get_metadata_many(self, books: list[str]) -> dict[str, MetadataResponse]:
+        """Metadata for several books in one query; titles that do not exist are absent."""
+        if self.corpus:
+            return {
+                book: meta
+                for book in dict.fromkeys(books)
+                if (meta := self.corpus.get_metadata(book)) is not None
+            }
+        r = await self.db.execute(
+            select(BibleBook.title, BibleBook.id, BibleBook.verse_counts).where(
+                BibleBook.title.in_(set(books))
+            )
+        )
+        rows = r.all()
+        counts = {title: verse_counts for title, _, verse_counts in rows}
+        pending = {book_id: title for title, book_id, verse_counts in rows if verse_counts is None}
+        if pending:
+            # Not materialized yet (loader not re-run since migration 003)
+            r = await self.db.execute(
+                select(BibleVerse.book_id, func.count(BibleVerse.id))
+                .where(BibleVerse.book_id.in_(pending))
+                .group_by(BibleVerse.book_id, BibleVerse.chapter)
+                .order_by(BibleVerse.book_id, BibleVerse.chapter)
+            )
+            for title in pending.values():
+                counts[title] = []
+            for book_id, n in r.all():
+                counts[pending[book_id]].append(n)
+        return {
+            title: MetadataResponse(book=title, chapter_count=len(vc), verse_counts=vc, tags=[])
+            for title, vc in counts.items()
+        }
+
+    async def _aggregate_verse_counts(self, book_id: int) -> list[int]:
+        r = await self.db.execute(
+            select(func.count(BibleVerse.id))
+            .where(BibleVerse.book_id == book_id)
+            .group_by(BibleVerse.chapter)
+            .order_by(BibleVerse.chapter)
+        )
+        return list(r.scalars().all())
+
     async def get_verse_range(
         self, book: str, chapter: int, start: int, end: int
     ) -> list[VerseResponse]:
         """SRS: GET /verses/{book}/{chapter}/{start}/{end} - contiguous verse texts."""
+        if self.corpus:
+            return self.corpus.get_verse_range(book, chapter, start, end)
         book_row = await self.db.execute(
             select(BibleBook).where(BibleBook.title == book)
         )
@@ -80,6 +134,172 @@ class BibleService:
             for v in verses
         ]
 
+    def range_text_subquery(self, book, chapter, start, end):
+        """
+        Correlated scalar subquery: the verse texts of (book, chapter, start..end) joined by
+        spaces in verse order, so a range's text comes back inside the caller's statement.
+        """
+        return (
+            select(func.string_agg(BibleVerse.text, aggregate_order_by(literal_column("' '"), BibleVerse.verse_number)))
+            .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+            .where(
+                BibleBook.title == book,
+                BibleVerse.chapter == chapter,
+                BibleVerse.verse_number.between(start, end),
+            )
+            .scalar_subquery()
+        )
+
+    async def get_verse_ranges(
+        self, ranges: list[tuple[str, int, int, int]]
+    ) -> list[list[VerseResponse]]:
+        """Several (book, chapter, start, end) ranges in one pass / one query, in request order."""
+        if self.corpus:
+            return [self.corpus.get_verse_range(*rng) for rng in ranges]
+        r = await self.db.execute(
+            select(BibleBook.title, BibleVerse.chapter, BibleVerse.verse_number, BibleVerse.text)
+            .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+            .where(
+                or_(
+                    *(
+                        and_(
+                            BibleBook.title == book,
+                            BibleVerse.chapter == chapter,
+                            BibleVerse.verse_number.between(start, end),
+                        )
+                        for book, chapter, start, end in ranges
+                    )
+                )
+            )
+        )
+        texts: dict[tuple[str, int, int], str] = {
+            (title, chapter, verse): text for title, chapter, verse, text in r.all()
+        }
+        out = []
+        for book, chapter, start, end in ranges:
+            out.append(
+                [
+                    VerseResponse(book=book, chapter=chapter, verse=v, text=texts[(book, chapter, v)])
+                    for v in range(start, end + 1)
+                    if (book, chapter, v) in texts
+                ]
+            )
+        return out
+
+    async def to_ordinal(self, book: str, chapter: int, verse: int) -> int | None:
+        """(book, chapter, verse) -> global ordinal, or None if the verse does not exist."""
+        if self.corpus:
+            return self.corpus.ordinal(book, chapter, verse)
+        r = await self.db.execute(
+            select(BibleVerse.ordinal)
+            .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+            .where(
+                BibleBook.title == book,
+                BibleVerse.chapter == chapter,
+                BibleVerse.verse_number == verse,
+            )
+        )
+        return r.scalar_one_or_none()
+
+    async def from_ordinal(self, ordinal: int) -> tuple[str, int, int] | None:
+        """Global ordinal -> (book, chapter, verse)."""
+        if self.corpus:
+            if not 1 <= ordinal <= len(self.corpus):
+                return None
+            return self.corpus.locate(ordinal - 1)
+        r = await self.db.execute(
+            select(BibleBook.title, BibleVerse.chapter, BibleVerse.verse_number)
+            .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+            .where(BibleVerse.ordinal == ordinal)
+        )
+        row = r.one_or_none()
+        return tuple(row) if row else None
+
+    async def get_verses_by_ordinal(self, start: int, end: int) -> list[OrdinalVerseResponse]:
+        """Verses with start <= ordinal <= end in canonical order; may cross chapters and books."""
+        if self.corpus:
+            return self._corpus_verses_between(start, end)
+        return await self._db_verses_between(start, end)
+
+    async def get_passage(
+        self,
+        start_book: str,
+        start_chapter: int,
+        start_verse: int,
+        end_book: str,
+        end_chapter: int,
+        end_verse: int,
+    ) -> list[OrdinalVerseResponse]:
+        """
+        Verses from one position to another, across chapters and books, in canonical order.
+        Empty if either endpoint does not exist or the end precedes the start.
+        Raises ValueError if the passage is longer than MAX_VERSE_SPAN verses.
+        """
+        if self.corpus:
+            start = self.corpus.ordinal(start_book, start_chapter, start_verse)
+            end = self.corpus.ordinal(end_book, end_chapter, end_verse)
+            if start is None or end is None:
+                return []
+            if end - start + 1 > MAX_VERSE_SPAN:
+                raise ValueError(f"Passage exceeds {MAX_VERSE_SPAN} verses")
+            return self._corpus_verses_between(start, end)
+        # Both endpoints resolve inside the same statement: one indexed BETWEEN scan,
+        # stopped one row past the cap.
+        verses = await self._db_verses_between(
+            self._ordinal_of(start_book, start_chapter, start_verse),
+            self._ordinal_of(end_book, end_chapter, end_verse),
+            limit=MAX_VERSE_SPAN + 1,
+        )
+        if len(verses) > MAX_VERSE_SPAN:
+            raise ValueError(f"Passage exceeds {MAX_VERSE_SPAN} verses")
+        return verses
+
+    def _ordinal_of(self, book: str, chapter: int, verse: int):
+        return (
+            select(BibleVerse.ordinal)
+            .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+            .where(
+                BibleBook.title == book,
+                BibleVerse.chapter == chapter,
+                BibleVerse.verse_number == verse,
+            )
+            .scalar_subquery()
+        )
+
+    def _corpus_verses_between(self, start: int, end: int) -> list[OrdinalVerseResponse]:
+        out = []
+        for i in range(max(start, 1) - 1, min(end, len(self.corpus))):
+            book, chapter, verse = self.corpus.locate(i)
+            out.append(
+                OrdinalVerseResponse(
+                    book=book,
+                    chapter=chapter,
+                    verse=verse,
+                    text=self.corpus.verse_text(i),
+                    ordinal=i + 1,
+                )
+            )
+        return out
+
+    async def _db_verses_between(self, start, end, limit: int | None = None) -> list[OrdinalVerseResponse]:
+        r = await self.db.execute(
+            select(
+                BibleBook.title,
+                BibleVerse.chapter,
+                BibleVerse.verse_number,
+                BibleVerse.text,
+                BibleVerse.ordinal,
+            )
+            .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+            .where(BibleVerse.ordinal.between(start, end))
+            .order_by(BibleVerse.ordinal)
+            .limit(limit)
+        )
+        return [
+            OrdinalVerseResponse(book=title, chapter=chapter, verse=verse, text=text, ordinal=ordinal)
+            for title, chapter, verse, text, ordinal in r.all()
+        ]
+
     async def count_verses_in_range(
         self,
         book: str,
@@ -88,28 +308,50 @@ class BibleService:
         chapter_end: int,
         verse_end: int,
     ) -> int:
-        """SDS: For plan segmentation."""
-        book_row = await self.db.execute(
-            select(BibleBook).where(BibleBook.title == book)
-        )
-        b = book_row.scalar_one_or_none()
-        if not b:
+        """SDS: For plan segmentation. O(1) via the cached prefix-sum index."""
+        index = await self.verse_index(book)
+        if not index:
             return 0
-        # Single book; range may span chapters
-        total = 0
-        for ch in range(chapter_start, chapter_end + 1):
-            v_start = verse_start if ch == chapter_start else 1
-            v_end = verse_end if ch == chapter_end else 9999
-            r = await self.db.execute(
-                select(func.count(BibleVerse.id)).where(
-                    BibleVerse.book_id == b.id,
-                    BibleVerse.chapter == ch,
-                    BibleVerse.verse_number >= v_start,
-                    BibleVerse.verse_number <= v_end,
+        return index.count(chapter_start, verse_start, chapter_end, verse_end)
+
+    async def verse_index(self, book: str) -> VerseIndex | None:
+        """Cumulative verse counts for a book, built once from chapter verse counts."""
+        if self.corpus:
+            return self.corpus.verse_index(book)
+        index = _verse_index_cache.get(book)
+        if index is None:
+            meta = await self.get_metadata(book)
+            if not meta:
+                return None
+            index = _verse_index_cache[book] = VerseIndex(meta.verse_counts)
+        return index
+
+    async def search(self, query: str, page: int = 1, page_size: int = 20) -> SearchResponse | None:
+        """
+        Ranked verse search over the in-memory index. None while the index is not loaded
+        (BIBLE_CORPUS_ENABLED off or no Bible data): there is no SQL fallback, since it
+        could not match the index's normalization, OR semantics and ranking.
+        """
+        if not self.search_index:
+            return None
+        offset = (page - 1) * page_size
+        corpus = self.search_index.corpus
+        total, ranked = self.search_index.top(query, offset + page_size)
+        hits = []
+        for i, score in ranked[offset:]:
+            book, chapter, verse = corpus.locate(i)
+            hits.append(
+                SearchHit(
+                    book=book,
+                    chapter=chapter,
+                    verse=verse,
+                    text=corpus.verse_text(i),
+                    score=round(score, 4),
                 )
             )
-            total += r.scalar_one() or 0
-        return total
+        return SearchResponse(
+            query=query, total=total, page=page, page_size=page_size, hits=hits
+        )
 
     async def get_random_verse(
         self,
@@ -121,9 +363,8 @@ class BibleService:
         FR-4.1.1: filter by themes.
         FR-4.1.2: adapt selection based on time_of_day bucket using topic_index.
         """
-        # Load all topics once for filtering
-        r_topics = await self.db.execute(select(BibleTopic))
-        topics = list(r_topics.scalars().all())
+        catalogue = await get_topic_catalogue(self.db)
+        topics = catalogue.topics
         if not topics:
             # No topic-based data; fallback to plain random verse
             return await self._random_verse_from_db()
@@ -131,14 +372,11 @@ class BibleService:
         # 1) Filter by explicit themes (substring match, case-insensitive)
         candidate_topics = topics
         if themes:
-            lowered = [t.lower() for t in themes]
-            candidate_topics = [
-                t for t in topics if any(key in t.topic.lower() for key in lowered)
-            ]
+            candidate_topics = catalogue.match_themes(themes)
 
         # 2) If time_of_day is provided, narrow candidates into buckets by topic_index
         if time_of_day:
-            bucketed = self._filter_topics_by_time_of_day(
+            bucketed = catalogue.bucket(
                 candidate_topics if candidate_topics else topics,
                 time_of_day,
             )
@@ -150,10 +388,7 @@ class BibleService:
             return await self._random_verse_from_db()
 
         topic = random.choice(candidate_topics)
-        r_verses = await self.db.execute(
-            select(BibleTopicVerse).where(BibleTopicVerse.topic_id == topic.id)
-        )
-        verses = list(r_verses.scalars().all())
+        verses = catalogue.verses(topic.id)
         if not verses:
             # Topic has no verses; fallback
             return await self._random_verse_from_db()
@@ -163,43 +398,29 @@ class BibleService:
             chapter=0,
             verse=0,
             text=tv.text,
-            book_and_verse=tv.book_and_verse or "",
+            book_and_verse=tv.book_and_verse,
         )
 
-    def _filter_topics_by_time_of_day(
-        self,
-        topics: list[BibleTopic],
-        time_of_day: str,
-    ) -> list[BibleTopic]:
-        """Bucket topics by topic_index to roughly adapt tone by time of day."""
-        if not topics:
-            return []
-        sorted_topics = sorted(topics, key=lambda t: t.topic_index)
-        n = len(sorted_topics)
-        if n == 1:
-            return sorted_topics
-        # Split into three buckets: morning (first third), afternoon (middle), evening (last)
-        one_third = max(1, n // 3)
-        if time_of_day == "morning":
-            return sorted_topics[:one_third]
-        if time_of_day == "afternoon":
-            return sorted_topics[one_third : 2 * one_third]
-        # evening or anything else -> last third
-        return sorted_topics[2 * one_third :]
-
     async def _random_verse_from_db(self) -> RandomVerseResponse | None:
-        """Random verse from bible_verses."""
-        r = await self.db.execute(
-            select(func.count(BibleVerse.id))
-        )
-        n = r.scalar_one() or 0
-        if n == 0:
+        """Random verse from bible_verses: O(1) in the corpus, one PK index probe otherwise."""
+        if self.corpus:
+            i = random.randrange(len(self.corpus))
+            book, chapter, verse = self.corpus.locate(i)
+            return RandomVerseResponse(
+                book=book,
+                chapter=chapter,
+                verse=verse,
+                text=self.corpus.verse_text(i),
+                book_and_verse=f"{book} {chapter}:{verse}",
+            )
+        bounds = await self._verse_id_bounds()
+        if not bounds:
             return None
-        offset = random.randint(0, n - 1)
         r = await self.db.execute(
             select(BibleVerse, BibleBook)
             .join(BibleBook, BibleVerse.book_id == BibleBook.id)
-            .offset(offset)
+            .where(BibleVerse.id >= random.randint(*bounds))
+            .order_by(BibleVerse.id)
             .limit(1)
         )
         row = r.one_or_none()
@@ -213,3 +434,20 @@ class BibleService:
             text=v.text,
             book_and_verse=f"{book.title} {v.chapter}:{v.verse_number}",
         )
+
+    async def _verse_id_bounds(self) -> tuple[int, int] | None:
+        global _verse_id_bounds
+        if _verse_id_bounds is None:
+            r = await self.db.execute(select(func.min(BibleVerse.id), func.max(BibleVerse.id)))
+            lo, hi = r.one()
+            if lo is None:
+                return None
+            _verse_id_bounds = (lo, hi)
+        return _verse_id_bounds
+
+
+def clear_bible_caches() -> None:
+    """Drop per-process indexes derived from bible_verses (after the loader runs)."""
+    global _verse_id_bounds
+    _verse_index_cache.clear()
+    _verse_id_bounds = None
@@ -0,0 +1,226 @@
+import asyncio
+import heapq
+import traceback
+import uuid
+from collections.abc import Awaitable, Callable, Collection, Iterable
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Plan
+from app.utils.delivery_window import DeliveryWindow, plan_window
+from app.utils.time_helpers import next_delivery_after_windows
+
+# Plans whose delivery failed are retried after this long
+RETRY_AFTER = timedelta(minutes=1)
+
+
+class PlanTiming(NamedTuple):
+    """What decides a plan's delivery times, kept in memory so rescheduling needs no query."""
+
+    device_id: uuid.UUID
+    window: DeliveryWindow
+    time_lap_minutes: int
+
+    def next_after(self, last_delivered_at: datetime | None, now: datetime) -> datetime | None:
+        return self.window.next_after(self.time_lap_minutes, last_delivered_at, now)
+
+
+Deliver = Callable[[list[uuid.UUID], datetime], Awaitable[None]]
+
+
+class DeliveryScheduler:
+    """
+    Min-heap of (due_at, plan_id) over the active plans of the devices connected to this
+    worker. Rescheduling pushes a new entry and
+    leaves the old one behind; an entry is live only while it matches _due[plan_id], and
+    stale entries are dropped when they surface (or by compaction). Track/reschedule are
+    O(log n), untrack O(1), popping k due plans O(k log n), rebuild O(n).
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, uuid.UUID]] = []
+        self._due: dict[uuid.UUID, datetime] = {}
+        self._timing: dict[uuid.UUID, PlanTiming] = {}
+        self._by_device: dict[uuid.UUID, set[uuid.UUID]] = {}
+        self._wakeup: asyncio.Event | None = None
+
+    def __len__(self) -> int:
+        return len(self._timing)
+
+    def __contains__(self, plan_id: uuid.UUID) -> bool:
+        return plan_id in self._timing
+
+    def device_of(self, plan_id: uuid.UUID) -> uuid.UUID | None:
+        timing = self._timing.get(plan_id)
+        return timing.device_id if timing else None
+
+    def plans_of(self, device_id: uuid.UUID) -> set[uuid.UUID]:
+        return set(self._by_device.get(device_id, ()))
+
+    def due_at(self, plan_id: uuid.UUID) -> datetime | None:
+        return self._due.get(plan_id)
+
+    def track(self, plan_id: uuid.UUID, timing: PlanTiming, due_at: datetime | None) -> None:
+        """Add or replace a plan; due_at None keeps it known but unscheduled."""
+        old = self._timing.get(plan_id)
+        if old and old.device_id != timing.device_id:
+            self._by_device[old.device_id].discard(plan_id)
+        self._timing[plan_id] = timing
+        self._by_device.setdefault(timing.device_id, set()).add(plan_id)
+        self.reschedule(plan_id, due_at)
+
+    def track_plan(self, plan: Plan, now: datetime | None = None) -> None:
+        """Follow a created or changed plan; plans that are not active are dropped."""
+        if plan.state != "active":
+            self.untrack(plan.id)
+            return
+        timing = PlanTiming(plan.device_id, plan_window(plan), plan.time_lap_minutes)
+        self.track(plan.id, timing, timing.next_after(plan.last_delivered_at, now or datetime.now(timezone.utc)))
+
+    def untrack(self, plan_id: uuid.UUID) -> None:
+        timing = self._timing.pop(plan_id, None)
+        self._due.pop(plan_id, None)
+        if timing:
+            plans = self._by_device.get(timing.device_id)
+            if plans is not None:
+                plans.discard(plan_id)
+                if not plans:
+                    del self._by_device[timing.device_id]
+
+    def reschedule(self, plan_id: uuid.UUID, due_at: datetime | None) -> None:
+        if plan_id not in self._timing:
+            return
+        if due_at is None:
+            self._due.pop(plan_id, None)
+            return
+        head = self.next_due()
+        self._due[plan_id] = due_at
+        heapq.heappush(self._heap, (due_at, plan_id))
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._compact()
+        if self._wakeup is not None and (head is None or due_at < head):
+            self._wakeup.set()
+
+    def reschedule_after(self, plan_id: uuid.UUID, last_delivered_at: datetime | None, now: datetime) -> None:
+        """Reschedule from the plan's own timing (no query)."""
+        timing = self._timing.get(plan_id)
+        if timing:
+            self.reschedule(plan_id, timing.next_after(last_delivered_at, now))
+
+    def next_due(self) -> datetime | None:
+        heap = self._heap
+        while heap:
+            due_at, plan_id = heap[0]
+            if self._due.get(plan_id) == due_at:
+                return due_at
+            heapq.heappop(heap)
+        return None
+
+    def pop_due(self, now: datetime) -> list[uuid.UUID]:
+        """Plans due at or before now, earliest first; they stay tracked but unscheduled."""
+        out = []
+        while (due_at := self.next_due()) is not None and due_at <= now:
+            _, plan_id = heapq.heappop(self._heap)
+            del self._due[plan_id]
+            out.append(plan_id)
+        return out
+
+    def rebuild(self, entries: Iterable[tuple[uuid.UUID, PlanTiming, datetime | None]]) -> None:
+        """Replace everything with (plan_id, timing, due_at) in one heapify."""
+        self._due.clear()
+        self._timing.clear()
+        self._by_device.clear()
+        for plan_id, timing, due_at in entries:
+            self._timing[plan_id] = timing
+            self._by_device.setdefault(timing.device_id, set()).add(plan_id)
+            if due_at is not None:
+                self._due[plan_id] = due_at
+        self._compact()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _compact(self) -> None:
+        self._heap = [(due_at, plan_id) for plan_id, due_at in self._due.items()]
+        heapq.heapify(self._heap)
+
+    def untrack_device(self, device_id: uuid.UUID) -> None:
+        for plan_id in self.plans_of(device_id):
+            self.untrack(plan_id)
+
+    async def load(self, db: AsyncSession, device_ids: Collection[uuid.UUID]) -> int:
+        """
+        Active plans of these devices from the plans table, replacing what is tracked for
+        them. Returns plans loaded.
+        """
+        if not device_ids:
+            return 0
+        rows = (
+            await db.execute(
+                select(
+                    Plan.id,
+                    Plan.version,
+                    Plan.device_id,
+                    Plan.quiet_hours,
+                    Plan.working_hours,
+                    Plan.timezone,
+                    Plan.time_lap_minutes,
+                    Plan.last_delivered_at,
+                ).where(Plan.state == "active", Plan.device_id.in_(device_ids))
+            )
+        ).all()
+        windows = [plan_window(row) for row in rows]
+        due = next_delivery_after_windows(
+            windows,
+            [row.time_lap_minutes for row in rows],
+            [row.last_delivered_at for row in rows],
+            datetime.now(timezone.utc),
+        )
+        for device_id in device_ids:
+            self.untrack_device(device_id)
+        for row, window, due_at in zip(rows, windows, due):
+            self.track(row.id, PlanTiming(row.device_id, window, row.time_lap_minutes), due_at)
+        return len(rows)
+
+    async def run(self, deliver: Deliver) -> None:
+        """
+        Sleep until the earliest due plan (or an earlier one is scheduled), then hand every
+        due plan to deliver(plan_ids, now), which reschedules or untracks them.
+        """
+        self._wakeup = asyncio.Event()
+        while True:
+            due_at = self.next_due()
+            now = datetime.now(timezone.utc)
+            if due_at is None or due_at > now:
+                timeout = None if due_at is None else (due_at - now).total_seconds()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            plan_ids = self.pop_due(now)
+            try:
+                await deliver(plan_ids, now)
+            except Exception:
+                traceback.print_exc()
+                for plan_id in plan_ids:
+                    if self.due_at(plan_id) is None:
+                        self.reschedule(plan_id, now + RETRY_AFTER)
+
+
+_scheduler: DeliveryScheduler | None = None
+
+
+def get_delivery_scheduler() -> DeliveryScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = DeliveryScheduler()
+    return _scheduler
+
+
+def set_delivery_scheduler(scheduler: DeliveryScheduler | None) -> None:
+    global _scheduler
+    _scheduler = scheduler
@@ -1,12 +1,28 @@
 import uuid
 from datetime import date, datetime, timedelta
+from typing import NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, null, or_, select, true, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Device, Plan, ReadingUnit
+from app.models import Device, Plan, PlanDailyStats, ReadingUnit
 from app.schemas.plan import PlanCreate, PlanUpdate
 from app.services.bible_service import BibleService
+from app.utils.read_state import ReadState
+from app.utils.segmentation import UnitLayout, book_spans, chapter_spans, segment, unit_spans
+from app.utils.delivery_window import DeliveryWindow, plan_window
+from app.utils.time_helpers import DEFAULT_TZ
+from app.utils.verse_index import VerseIndex
+
+
+class Delivery(NamedTuple):
+    """deliver_units() outcome for one active plan."""
+
+    last_delivered_at: datetime | None
+    unit: dict | None = None  # pushed now
+    exhausted: bool = False  # due, but nothing left to deliver
 
 
 class PlanService:
@@ -27,61 +43,43 @@ class PlanService:
 
     async def create_plan(self, device_id: uuid.UUID | None, payload: PlanCreate) -> Plan:
         """SRS: Create plan; precompute units using metadata. SDS segmentation."""
+        _check_timezone(payload.timezone)
         did = await self.get_or_create_device(device_id)
         # Validate books and get metadata for each
         total_verses = 0
         book_meta: list[tuple[str, list[int]]] = []  # (book, verse_counts per chapter)
+        metas = await self.bible.get_metadata_many(payload.books)
+        missing = [book for book in payload.books if book not in metas]
+        if missing:
+            raise ValueError(f"Book not found: {', '.join(missing)}")
         for book in payload.books:
-            meta = await self.bible.get_metadata(book)
-            if not meta:
-                raise ValueError(f"Book not found: {book}")
-            book_meta.append((book, meta.verse_counts))
+            book_meta.append((book, metas[book].verse_counts))
 
         # Boundaries: optional {chapter_start, verse_start, chapter_end, verse_end}
-        b = payload.boundaries.model_dump() if payload.boundaries else {}
-        ch_start = b.get("chapter_start", 1)
-        v_start = b.get("verse_start", 1)
-        ch_end = b.get("chapter_end")
-        v_end = b.get("verse_end")
-
-        # Compute total verses in selected range (same logic as _segment)
-        for i, (book, v_counts) in enumerate(book_meta):
-            nch = len(v_counts)
-            if len(payload.books) == 1:
-                start_ch, start_v = ch_start, v_start
-                end_ch = ch_end if ch_end is not None else nch
-                end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
-            else:
-                if i == 0:
-                    start_ch, start_v = ch_start, v_start
-                    end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
-                elif i == len(payload.books) - 1:
-                    start_ch, start_v = 1, 1
-                    end_ch = ch_end if ch_end is not None else nch
-                    end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
-                else:
-                    start_ch, start_v = 1, 1
-                    end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
-            for c in range(start_ch, end_ch + 1):
-                vc = v_counts[c - 1] if c <= nch else 0
-                low = start_v if c == start_ch else 1
-                high = end_v if c == end_ch else vc
-                total_verses += max(0, high - low + 1)
+        boundaries_dict = payload.boundaries.model_dump() if payload.boundaries else None
+
+        # Compute total verses in selected range (same spans as segmentation)
+        for _, v_counts, start_ch, start_v, end_ch, end_v in book_spans(book_meta, boundaries_dict):
+            total_verses += VerseIndex(v_counts).count(start_ch, start_v, end_ch, end_v)
 
         # SDS: target_units, base_verses_per_unit, verses_per_unit
-        today = date.today()
-        target_date_val = payload.target_date or today
-        days_remaining = max(0, (target_date_val - today).days) or 1
-        frequency = payload.frequency or "daily"
-        
-        from app.utils.time_helpers import calculate_active_minutes
-        active_mins_per_day = calculate_active_minutes(payload.working_hours.model_dump() if payload.working_hours else None)
-        deliveries_per_day = max(1, active_mins_per_day // payload.time_lap_minutes)
-        
-        target_units = days_remaining * (deliveries_per_day if frequency == "daily" else 7 * deliveries_per_day)
-        target_units = max(1, target_units)
-        base_verses_per_unit = max(1, total_verses // target_units)
-        verses_per_unit = min(base_verses_per_unit, payload.max_verses_per_unit)
+        verses_per_unit = _unit_size(
+            total_verses,
+            payload.target_date,
+            payload.frequency,
+            payload.working_hours.model_dump() if payload.working_hours else None,
+            payload.time_lap_minutes,
+            payload.max_verses_per_unit,
+        )
+
+        # Virtual plans store no units up front; they are computed from the layout on demand
+        if payload.unit_mode == "virtual":
+            units = None
+            layout = UnitLayout(chapter_spans(book_meta, boundaries_dict), verses_per_unit)
+        else:
+            # Segment: produce reading_units (book, chapter, verse_start, verse_end)
+            units = layout = segment(book_meta, boundaries_dict, verses_per_unit)
+        state = ReadState.build((i, ve - vs + 1, "pending") for i, (_, _, vs, ve) in enumerate(layout))
 
         plan = Plan(
             device_id=did,
@@ -93,87 +91,512 @@ class PlanService:
             max_verses_per_unit=payload.max_verses_per_unit,
             time_lap_minutes=payload.time_lap_minutes,
             working_hours=payload.working_hours.model_dump() if payload.working_hours else None,
+            timezone=payload.timezone,
             state="active",
+            unit_mode=payload.unit_mode,
+            verses_per_unit=verses_per_unit,
+            **state.to_columns(),
         )
         self.db.add(plan)
         await self.db.flush()
+        if units:
+            await self._insert_units(plan.id, units)
+        return plan
 
-        # Segment: produce reading_units (book, chapter, verse_start, verse_end)
-        boundaries_dict = payload.boundaries.model_dump() if payload.boundaries else None
-        units = self._segment(book_meta, payload.books, boundaries_dict, verses_per_unit)
-        for idx, (book, chapter, vs, ve) in enumerate(units):
-            self.db.add(
-                ReadingUnit(
-                    plan_id=plan.id,
-                    book=book,
-                    chapter=chapter,
-                    verse_start=vs,
-                    verse_end=ve,
-                    unit_index=idx,
-                    state="pending",
+    async def read_state(self, plan: Plan) -> ReadState:
+        """
+        The plan's unit-state bitmaps; rebuilt in memory from reading_units (and the layout)
+        when cleared. Reads never write them back - see _persist_read_state().
+        """
+        if plan.unit_verse_prefix is not None:
+            return ReadState.from_columns(plan.read_bitmap, plan.delivered_bitmap, plan.unit_verse_prefix)
+        r = await self.db.execute(
+            select(
+                ReadingUnit.unit_index,
+                ReadingUnit.verse_end - ReadingUnit.verse_start + 1,
+                ReadingUnit.state,
+            ).where(ReadingUnit.plan_id == plan.id)
+        )
+        units = [tuple(row) for row in r.all()]
+        if plan.unit_mode == "virtual":
+            layout = await self.plan_layout(plan)
+            stored = {index for index, _, _ in units}
+            units += [
+                (i, ve - vs + 1, "pending")
+                for i, (_, _, vs, ve) in enumerate(layout, layout.first_index)
+                if i not in stored
+            ]
+        return ReadState.build(units)
+
+    async def _persist_read_state(self, plan: Plan) -> None:
+        """Rebuild the bitmaps from the units as they are now and store them on the plan row."""
+        _clear_read_state(plan)
+        for column, value in (await self.read_state(plan)).to_columns().items():
+            setattr(plan, column, value)
+        await self.db.flush()
+
+    async def _set_unit_state(self, plan_id: uuid.UUID, unit_index: int, state: str) -> None:
+        """
+        Mirror one unit's new state into the plan bitmaps with set_bit() in SQL, so concurrent
+        updates to other units of the plan never overwrite each other.
+        """
+        r = await self.db.execute(
+            update(Plan)
+            .where(Plan.id == plan_id, func.length(Plan.read_bitmap) > unit_index // 8)
+            .values(
+                read_bitmap=func.set_bit(Plan.read_bitmap, unit_index, int(state == "read")),
+                delivered_bitmap=func.set_bit(Plan.delivered_bitmap, unit_index, int(state == "delivered")),
+            )
+        )
+        if r.rowcount == 0:
+            # Bitmaps missing or too short for this unit: rebuild them, this unit included
+            await self._persist_read_state(await self.get_plan(plan_id))
+
+    async def _lock_plan(self, plan: Plan) -> None:
+        """
+        SELECT ... FOR UPDATE the plan row and reload it. Virtual plans pick the next
+        unit_index from the bitmaps, so concurrent deliveries must take turns.
+        """
+        await self.db.execute(
+            select(Plan)
+            .where(Plan.id == plan.id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+
+    async def mark_unit_read(self, unit_id: uuid.UUID) -> bool:
+        """
+        SRS: mark unit read; the plan's read bitmap and daily rollup change in the same transaction.
+        The conditional UPDATE lets only one of concurrent calls flip the unit, so only that one
+        sets the bit and counts it. Returns False when the unit was already read (or is gone).
+        """
+        read_at = datetime.utcnow()
+        r = await self.db.execute(
+            update(ReadingUnit)
+            .where(ReadingUnit.id == unit_id, ReadingUnit.state != "read")
+            .values(state="read", read_at=read_at)
+            .returning(
+                ReadingUnit.plan_id, ReadingUnit.unit_index, ReadingUnit.verse_start, ReadingUnit.verse_end
+            )
+        )
+        row = r.one_or_none()
+        if row is None:
+            return False
+        await self._set_unit_state(row.plan_id, row.unit_index, "read")
+        stmt = pg_insert(PlanDailyStats).values(
+            plan_id=row.plan_id,
+            date=read_at.date(),
+            verses_read=row.verse_end - row.verse_start + 1,
+            units_read=1,
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[PlanDailyStats.plan_id, PlanDailyStats.date],
+                set_={
+                    "verses_read": PlanDailyStats.verses_read + stmt.excluded.verses_read,
+                    "units_read": PlanDailyStats.units_read + stmt.excluded.units_read,
+                },
+            )
+        )
+        return True
+
+    async def plan_layout(self, plan: Plan) -> UnitLayout:
+        """Unit layout of a virtual plan, rebuilt from book metadata and the stored origin."""
+        metas = await self.bible.get_metadata_many(plan.books)
+        book_meta = [(book, metas[book].verse_counts) for book in plan.books if book in metas]
+        return UnitLayout.from_origin(
+            chapter_spans(book_meta, plan.boundaries), plan.verses_per_unit, plan.layout_origin
+        )
+
+    async def list_units(
+        self,
+        plan: Plan,
+        after: int | None = None,
+        limit: int | None = None,
+        state: str | None = None,
+        fields: list[str] | None = None,
+    ) -> tuple[list[dict], int | None]:
+        """
+        Units of a plan in unit_index order: those after the cursor `after`, at most `limit`,
+        optionally only in `state` and only `fields` (unit_index is always kept).
+        Virtual plans merge the computed layout with the stored delivered/read rows; units
+        that were never delivered have id None. Returns (units, next_cursor), next_cursor
+        None on the last page.
+        """
+        fields = [f for f in UNIT_FIELDS if fields is None or f in fields or f == "unit_index"]
+        where = [ReadingUnit.plan_id == plan.id]
+        if after is not None:
+            where.append(ReadingUnit.unit_index > after)
+        if plan.unit_mode != "virtual" or state in ("delivered", "read"):
+            if state:
+                where.append(ReadingUnit.state == state)
+            stmt = (
+                select(*(getattr(ReadingUnit, f) for f in fields))
+                .where(*where)
+                .order_by(ReadingUnit.unit_index)
+            )
+            if limit is not None:
+                stmt = stmt.limit(limit + 1)
+            r = await self.db.execute(stmt)
+            units = [dict(row._mapping) for row in r.all()]
+        else:
+            units = [
+                {f: u[f] for f in fields}
+                for u in await self._virtual_units(plan, where, after, limit, state)
+            ]
+        if limit is not None and len(units) > limit:
+            return units[:limit], units[limit - 1]["unit_index"]
+        return units, None
+
+    async def _virtual_units(
+        self,
+        plan: Plan,
+        where: list,
+        after: int | None,
+        limit: int | None,
+        state: str | None,
+    ) -> list[dict]:
+        """Up to limit + 1 units of a virtual plan after the cursor, all states or pending only."""
+        layout = await self.plan_layout(plan)
+        want = None if limit is None else limit + 1
+        index = layout.first_index if after is None else max(after + 1, layout.first_index)
+        stored: dict[int, ReadingUnit] = {}
+        taken = 0
+        out = []
+        if state is None:
+            # Rows from before the layout (a re-cut plan) come first, then rows inside the
+            # page; in unit_index order the first `want` rows are all the page can use.
+            stmt = select(ReadingUnit).where(*where).order_by(ReadingUnit.unit_index)
+            if want is not None:
+                stmt = stmt.limit(want)
+            r = await self.db.execute(stmt)
+            stored = {u.unit_index: u for u in r.scalars().all()}
+            out = [_unit_dict(u) for i, u in stored.items() if i < layout.first_index]
+        else:
+            # Pending only: the bitmaps tell which units are taken; the only stored pending
+            # rows are those /next-unit handed out
+            read_state = await self.read_state(plan)
+            taken = read_state.read | read_state.delivered
+            r = await self.db.execute(select(ReadingUnit).where(*where, ReadingUnit.state == "pending"))
+            stored = {u.unit_index: u for u in r.scalars().all()}
+        while index < layout.end and (want is None or len(out) < want):
+            u = stored.get(index)
+            if u is not None:
+                out.append(_unit_dict(u))
+            elif not taken >> index & 1:
+                book, chapter, vs, ve = layout.unit(index)
+                out.append(
+                    {
+                        "id": None,
+                        "book": book,
+                        "chapter": chapter,
+                        "verse_start": vs,
+                        "verse_end": ve,
+                        "unit_index": index,
+                        "state": "pending",
+                    }
                 )
+            index += 1
+        return out
+
+    async def get_next_unit(self, plan: Plan) -> ReadingUnit | None:
+        """
+        SDS: first pending unit; units already delivered (pushed or bundled) are skipped.
+        A virtual plan stores it as a pending row, like a materialized unit, so it can be
+        marked read by id and repeated calls return the same unit.
+        """
+        if plan.unit_mode != "virtual":
+            index = (await self.read_state(plan)).next_pending()
+            if index is None:
+                return None
+            r = await self.db.execute(
+                select(ReadingUnit).where(
+                    ReadingUnit.plan_id == plan.id,
+                    ReadingUnit.unit_index >= index,
+                    ReadingUnit.state == "pending",
+                ).order_by(ReadingUnit.unit_index).limit(1)
+            )
+            return r.scalar_one_or_none()
+
+        await self._lock_plan(plan)
+        index = (await self.read_state(plan)).next_pending()
+        if index is None:
+            return None
+        r = await self.db.execute(
+            select(ReadingUnit).where(
+                ReadingUnit.plan_id == plan.id,
+                ReadingUnit.unit_index == index,
             )
+        )
+        unit = r.scalar_one_or_none()
+        if unit is not None:
+            return unit
+        layout = await self.plan_layout(plan)
+        book, chapter, vs, ve = layout.unit(index)
+        unit = ReadingUnit(
+            plan_id=plan.id,
+            book=book,
+            chapter=chapter,
+            verse_start=vs,
+            verse_end=ve,
+            unit_index=index,
+            state="pending",
+        )
+        self.db.add(unit)
         await self.db.flush()
-        return plan
+        return unit
+
+    async def next_unit_with_text(self, plan_id: uuid.UUID) -> dict | None:
+        """
+        SDS hot path (extension check-delivery alarm): the first pending unit of a plan
+        and its text in one statement - plan, unit via LATERAL and, without the corpus
+        cache, the text via string_agg. Virtual plans go through get_next_unit().
+        """
+        unit = (
+            select(ReadingUnit)
+            .where(ReadingUnit.plan_id == Plan.id, ReadingUnit.state == "pending")
+            .order_by(ReadingUnit.unit_index)
+            .limit(1)
+            .lateral("next_unit")
+        )
+        corpus = self.bible.corpus
+        text = (
+            null()
+            if corpus
+            else self.bible.range_text_subquery(unit.c.book, unit.c.chapter, unit.c.verse_start, unit.c.verse_end)
+        )
+        r = await self.db.execute(
+            select(
+                Plan.unit_mode,
+                unit.c.id,
+                unit.c.book,
+                unit.c.chapter,
+                unit.c.verse_start,
+                unit.c.verse_end,
+                unit.c.unit_index,
+                unit.c.state,
+                text.label("text"),
+            )
+            .select_from(Plan)
+            .outerjoin(unit, true())
+            .where(Plan.id == plan_id)
+        )
+        row = r.first()
+        if row is None:
+            return None
+        if row.unit_mode == "virtual":
+            unit = await self.get_next_unit(await self.get_plan(plan_id))
+            found = _unit_dict(unit) if unit else None
+        else:
+            found = {k: v for k, v in row._mapping.items() if k in UNIT_FIELDS} if row.id else None
+            if found and not corpus:
+                return {**found, "text": row.text or ""}
+        if not found:
+            return None
+        verses = await self.bible.get_verse_range(
+            found["book"], found["chapter"], found["verse_start"], found["verse_end"]
+        )
+        return {**found, "text": " ".join(v.text for v in verses)}
+
+    async def delivery_bundle(self, plan: Plan, count: int, tz: ZoneInfo | None = None) -> dict:
+        """
+        The next `count` units with text and delivery times for the client to schedule
+        locally, plus the plan version: a client holding a bundle of an older version
+        must drop it. Times follow `tz` when given, else the plan's own time zone.
+        Bundled units are marked delivered, so neither push nor /next-unit hands them out
+        again; units delivered but still unread lead the next bundle. Paused/completed
+        plans bundle nothing.
+        """
+        units: list[dict] = []
+        if plan.state == "active":
+            if plan.unit_mode == "virtual":
+                units = await self._deliver_virtual_units(plan, count)
+            else:
+                units = await self._deliver_materialized_units(plan.id, count)
+        ranges = [(u["book"], u["chapter"], u["verse_start"], u["verse_end"]) for u in units]
+        texts = await self.bible.get_verse_ranges(ranges) if ranges else []
+        window = plan_window(plan) if tz is None else DeliveryWindow.compile(plan.quiet_hours, plan.working_hours, tz)
+        times = window.times(plan.time_lap_minutes, len(units), datetime.now(DEFAULT_TZ))
+        scheduled = [
+            {**u, "text": " ".join(v.text for v in verses), "deliver_at": at}
+            for u, verses, at in zip(units, texts, times)
+        ]
+        return {
+            "plan_id": plan.id,
+            "version": plan.version,
+            "units": scheduled,
+            "refresh_at": scheduled[-1]["deliver_at"] if scheduled else None,
+        }
 
-    def _segment(
-        self,
-        book_meta: list[tuple[str, list[int]]],
-        books: list[str],
-        boundaries: dict | None,
-        verses_per_unit: int,
-    ) -> list[tuple[str, int, int, int]]:
-        """Produce list of (book, chapter, verse_start, verse_end) for each unit."""
-        b = boundaries or {}
-        ch_start = b.get("chapter_start", 1)
-        v_start = b.get("verse_start", 1)
-        ch_end = b.get("chapter_end")
-        v_end = b.get("verse_end")
-        out: list[tuple[str, int, int, int]] = []
-        acc = 0
-        unit_book, unit_ch, unit_vs, unit_ve = "", 0, 0, 0
-
-        for bi, (book, v_counts) in enumerate(book_meta):
-            nch = len(v_counts)
-            if len(books) == 1:
-                start_ch, start_v = ch_start, v_start
-                end_ch = ch_end if ch_end is not None else nch
-                end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
+    async def _deliver_materialized_units(self, plan_id: uuid.UUID, count: int) -> list[dict]:
+        """Unread delivered units of a materialized plan, topped up by marking the next pending units delivered."""
+        r = await self.db.execute(
+            select(*(getattr(ReadingUnit, f) for f in UNIT_FIELDS))
+            .where(ReadingUnit.plan_id == plan_id, ReadingUnit.state == "delivered")
+            .order_by(ReadingUnit.unit_index)
+            .limit(count)
+        )
+        units = [dict(row._mapping) for row in r.all()]
+        if len(units) == count:
+            return units
+        return units + await self._mark_next_delivered(plan_id, count - len(units))
+
+    async def _mark_next_delivered(self, plan_id: uuid.UUID, count: int) -> list[dict]:
+        """Mark the next `count` pending units of a materialized plan delivered; returns them in order."""
+        pending = (
+            select(ReadingUnit.id)
+            .where(ReadingUnit.plan_id == plan_id, ReadingUnit.state == "pending")
+            .order_by(ReadingUnit.unit_index)
+            .limit(count)
+        )
+        r = await self.db.execute(
+            update(ReadingUnit)
+            .where(ReadingUnit.id.in_(pending.scalar_subquery()), ReadingUnit.state == "pending")
+            .values(state="delivered", delivered_at=datetime.utcnow())
+            .returning(*(getattr(ReadingUnit, f) for f in UNIT_FIELDS))
+            .execution_options(synchronize_session=False)
+        )
+        units = sorted((dict(row._mapping) for row in r.all()), key=lambda u: u["unit_index"])
+        for u in units:
+            await self._set_unit_state(plan_id, u["unit_index"], "delivered")
+        return units
+
+    async def _deliver_virtual_units(self, plan: Plan, count: int) -> list[dict]:
+        """Unread delivered units of a virtual plan, topped up by storing the next layout units as delivered."""
+        await self._lock_plan(plan)
+        r = await self.db.execute(
+            select(*(getattr(ReadingUnit, f) for f in UNIT_FIELDS))
+            .where(ReadingUnit.plan_id == plan.id, ReadingUnit.state == "delivered")
+            .order_by(ReadingUnit.unit_index)
+            .limit(count)
+        )
+        units = [dict(row._mapping) for row in r.all()]
+        if len(units) == count:
+            return units
+        return units + await self._store_next_delivered(plan, count - len(units))
+
+    async def _store_next_delivered(self, plan: Plan, count: int) -> list[dict]:
+        """
+        Store the next `count` layout units of a virtual plan as delivered; returns them.
+        The caller holds the plan row lock (_lock_plan, or deliver_units' FOR UPDATE).
+        """
+        index = (await self.read_state(plan)).next_pending()
+        if index is None:
+            return []
+        layout = await self.plan_layout(plan)
+        now = datetime.utcnow()
+        new_rows = []
+        for index in range(index, min(layout.end, index + count)):
+            book, chapter, vs, ve = layout.unit(index)
+            new_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "plan_id": plan.id,
+                    "book": book,
+                    "chapter": chapter,
+                    "verse_start": vs,
+                    "verse_end": ve,
+                    "unit_index": index,
+                    "state": "delivered",
+                    "delivered_at": now,
+                }
+            )
+        if not new_rows:
+            return []
+        # The first may already be stored as pending by /next-unit; keep that row's id
+        stmt = pg_insert(ReadingUnit).values(new_rows)
+        r = await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="unique_unit",
+                set_={"state": stmt.excluded.state, "delivered_at": stmt.excluded.delivered_at},
+            ).returning(*(getattr(ReadingUnit, f) for f in UNIT_FIELDS))
+        )
+        units = sorted((dict(row._mapping) for row in r.all()), key=lambda u: u["unit_index"])
+        for u in units:
+            await self._set_unit_state(plan.id, u["unit_index"], "delivered")
+        return units
+
+    async def deliver_units(self, plan_ids: list[uuid.UUID], now: datetime) -> dict[uuid.UUID, Delivery]:
+        """
+        Push channel: lock the plans that are still active (in id order, so workers
+        delivering overlapping batches queue up instead of deadlocking), and for each whose
+        lap has passed and whose window allows `now`, mark its next pending unit delivered,
+        move last_delivered_at to `now` and return the unit with text. The checks run on the
+        locked rows, so a plan another worker just delivered, or whose hours just changed,
+        is left alone. Unread delivered units are not pushed again. Plans no longer active
+        are left out.
+        """
+        if not plan_ids:
+            return {}
+        r = await self.db.execute(
+            select(
+                Plan.id,
+                Plan.version,
+                Plan.unit_mode,
+                Plan.quiet_hours,
+                Plan.working_hours,
+                Plan.timezone,
+                Plan.time_lap_minutes,
+                Plan.last_delivered_at,
+            )
+            .where(Plan.id.in_(plan_ids), Plan.state == "active")
+            .order_by(Plan.id)
+            .with_for_update()
+        )
+        out: dict[uuid.UUID, Delivery] = {}
+        claimed = []
+        for row in r.all():
+            last = row.last_delivered_at
+            lap_over = last is None or last + timedelta(minutes=row.time_lap_minutes) <= now
+            if not (lap_over and plan_window(row).allows(now)):
+                out[row.id] = Delivery(last)
+                continue
+            if row.unit_mode == "virtual":
+                units = await self._store_next_delivered(await self.get_plan(row.id), 1)
             else:
-                if bi == 0:
-                    start_ch, start_v = ch_start, v_start
-                    end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
-                elif bi == len(books) - 1:
-                    start_ch, start_v = 1, 1
-                    end_ch = ch_end if ch_end is not None else nch
-                    end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
-                else:
-                    start_ch, start_v = 1, 1
-                    end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
-
-            for c in range(start_ch, end_ch + 1):
-                vc = v_counts[c - 1] if c <= len(v_counts) else 0
-                low = start_v if c == start_ch else 1
-                high = end_v if c == end_ch else vc
-                for v in range(low, high + 1):
-                    if acc == 0:
-                        unit_book, unit_ch, unit_vs, unit_ve = book, c, v, v
-                        acc = 1
-                    else:
-                        if unit_book == book and unit_ch == c and unit_ve == v - 1 and acc < verses_per_unit:
-                            unit_ve = v
-                            acc += 1
-                        else:
-                            out.append((unit_book, unit_ch, unit_vs, unit_ve))
-                            unit_book, unit_ch, unit_vs, unit_ve = book, c, v, v
-                            acc = 1
-                    if acc == verses_per_unit:
-                        out.append((unit_book, unit_ch, unit_vs, unit_ve))
-                        acc = 0
-        if acc > 0:
-            out.append((unit_book, unit_ch, unit_vs, unit_ve))
+                units = await self._mark_next_delivered(row.id, 1)
+            if not units:
+                out[row.id] = Delivery(last, exhausted=True)
+                continue
+            unit = units[0]
+            verses = await self.bible.get_verse_range(
+                unit["book"], unit["chapter"], unit["verse_start"], unit["verse_end"]
+            )
+            out[row.id] = Delivery(now, {**unit, "text": " ".join(v.text for v in verses), "plan_id": row.id})
+            claimed.append(row.id)
+        if claimed:
+            await self.db.execute(update(Plan).where(Plan.id.in_(claimed)).values(last_delivered_at=now))
         return out
 
+    async def remaining_verses(self, plan: Plan) -> int:
+        """Verses in units that are still pending or delivered (not read)."""
+        return (await self.read_state(plan)).remaining_verses
+
+    async def _insert_units(
+        self,
+        plan_id: uuid.UUID,
+        units: list[tuple[str, int, int, int]],
+        first_index: int = 0,
+    ) -> None:
+        """Insert pending units as plain rows (batched multi-row INSERTs, no ORM objects)."""
+        if not units:
+            return
+        await self.db.execute(
+            insert(ReadingUnit),
+            [
+                {
+                    "plan_id": plan_id,
+                    "book": book,
+                    "chapter": chapter,
+                    "verse_start": vs,
+                    "verse_end": ve,
+                    "unit_index": first_index + i,
+                    "state": "pending",
+                }
+                for i, (book, chapter, vs, ve) in enumerate(units)
+            ],
+        )
+
     async def get_plan(self, plan_id: uuid.UUID) -> Plan | None:
         r = await self.db.execute(select(Plan).where(Plan.id == plan_id))
         return r.scalar_one_or_none()
@@ -182,6 +605,9 @@ class PlanService:
         plan = await self.get_plan(plan_id)
         if not plan:
             return None
+        if plan.unit_mode == "virtual" and (payload.books is not None or payload.boundaries is not None):
+            # The layout (and every stored unit_index and read-state bit) derives from them
+            raise ValueError("books and boundaries of a virtual plan cannot be changed")
         if payload.books is not None:
             plan.books = payload.books
         if payload.boundaries is not None:
@@ -198,8 +624,12 @@ class PlanService:
             plan.time_lap_minutes = payload.time_lap_minutes
         if payload.working_hours is not None:
             plan.working_hours = payload.working_hours.model_dump()
+        if payload.timezone is not None:
+            _check_timezone(payload.timezone)
+            plan.timezone = payload.timezone
         if payload.state is not None:
             plan.state = payload.state
+        plan.version += 1
         plan.updated_at = datetime.utcnow()
         await self.db.flush()
         return plan
@@ -213,36 +643,34 @@ class PlanService:
             return None
         if plan.state == "completed":
             return plan  
+        if plan.unit_mode == "virtual":
+            return await self._extend_virtual(plan, additional_days)
 
-        # Find last read unit to determine where to continue
+        # Continue with the units not yet read, by unit_index; new indexes go after the last read unit
         r = await self.db.execute(
-            select(ReadingUnit)
-            .where(ReadingUnit.plan_id == plan_id, ReadingUnit.state == "read")
-            .order_by(ReadingUnit.unit_index.desc())
-            .limit(1)
-        )
-        last_read = r.scalar_one_or_none()
-        last_read_index = last_read.unit_index if last_read else -1
-
-        # Get all units to find the continuation point
-        r2 = await self.db.execute(
-            select(ReadingUnit)
-            .where(ReadingUnit.plan_id == plan_id)
+            select(
+                ReadingUnit.book,
+                ReadingUnit.chapter,
+                ReadingUnit.verse_start,
+                ReadingUnit.verse_end,
+                ReadingUnit.unit_index,
+            )
+            .where(ReadingUnit.plan_id == plan_id, ReadingUnit.state.in_(["pending", "delivered"]))
             .order_by(ReadingUnit.unit_index)
         )
-        all_units = r2.scalars().all()
-
-        # Determine remaining verses: from first pending/delivered unit onwards
-        remaining_units = [u for u in all_units if u.state in ("pending", "delivered")]
-        if not remaining_units:
+        unread = r.all()
+        if not unread:
             plan.state = "completed"
             await self.db.flush()
             return plan
-
-        # Calculate remaining verses from pending units
-        remaining_verses = sum(
-            u.verse_end - u.verse_start + 1 for u in remaining_units
+        r = await self.db.execute(
+            select(func.max(ReadingUnit.unit_index))
+            .where(ReadingUnit.plan_id == plan_id, ReadingUnit.state == "read")
         )
+        last_read_index = r.scalar_one_or_none()
+        first_index = unread[0].unit_index
+        if last_read_index is not None:
+            first_index = max(first_index, last_read_index + 1)
 
         # Extend target_date (default: add 7 days for daily, 1 week for weekly)
         if additional_days is None:
@@ -251,107 +679,58 @@ class PlanService:
         new_target = current_target + timedelta(days=additional_days)
         plan.target_date = new_target
 
-        # Recalculate verses_per_unit for remaining verses
-        today = date.today()
-        days_remaining = max(1, (new_target - today).days)
-        frequency = plan.frequency or "daily"
-        
-        from app.utils.time_helpers import calculate_active_minutes
-        active_mins_per_day = calculate_active_minutes(plan.working_hours)
-        deliveries_per_day = max(1, active_mins_per_day // plan.time_lap_minutes)
-        
-        target_units = days_remaining * (deliveries_per_day if frequency == "daily" else 7 * deliveries_per_day)
-        target_units = max(1, target_units)
-        base_verses_per_unit = max(1, remaining_verses // target_units)
-        verses_per_unit = min(base_verses_per_unit, plan.max_verses_per_unit)
-
-        # Get metadata for books to rebuild remaining units
-        book_meta: list[tuple[str, list[int]]] = []
-        for book in plan.books:
-            meta = await self.bible.get_metadata(book)
-            if meta:
-                book_meta.append((book, meta.verse_counts))
-
-        # Find where to continue: get the book/chapter/verse from first pending unit
-        first_pending = remaining_units[0]
-
-        # Preserve read units
-        read_units = [u for u in all_units if u.state == "read"]
-
-        # Delete all pending/delivered units
-        for u in remaining_units:
-            await self.db.delete(u)
-        await self.db.flush()
+        # Remaining verses: the unread units' own chapter runs. Never looked up by
+        # (book, chapter, verse), which is ambiguous when a plan lists a book twice.
+        spans = unit_spans([(u.book, u.chapter, u.verse_start, u.verse_end) for u in unread])
 
-        # Re-segment remaining verses starting from first_pending's position
-        new_units = []
-        current_book = first_pending.book
-        current_chapter = first_pending.chapter
-        current_verse = first_pending.verse_start
-        unit_index = first_pending.unit_index
-
-        verses_left = remaining_verses
-
-        def advance_position(book, chapter, verse, book_meta):
-            verse_counts = dict(book_meta)
-            while verses_left > 0:
-                max_verse = verse_counts.get(book, [0])[chapter - 1] if chapter - 1 < len(verse_counts.get(book, [])) else 0
-                if verse < max_verse:
-                    return book, chapter, verse + 1
-                else:
-                    # Move to next chapter or book
-                    chapter += 1
-                    if chapter > len(verse_counts.get(book, [])):
-                        # Move to next book
-                        book_index = [b for b, _ in book_meta].index(book)
-                        if book_index + 1 < len(book_meta):
-                            book = book_meta[book_index + 1][0]
-                            chapter = 1
-                            verse = 1
-                        else:
-                            return None, None, None
-                    else:
-                        verse = 1
-            return book, chapter, verse
-
-        while verses_left > 0:
-            # Calculate verses in this unit
-            verses_in_unit = min(verses_per_unit, verses_left)
-            # Calculate verse_end
-            verse_end = current_verse + verses_in_unit - 1
-            # Check if verse_end exceeds chapter limit
-            verse_counts = dict(book_meta)
-            max_verse = verse_counts.get(current_book, [0])[current_chapter - 1] if current_chapter - 1 < len(verse_counts.get(current_book, [])) else 0
-            if verse_end > max_verse:
-                verse_end = max_verse
-
-            # Create new ReadingUnit
-            new_unit = ReadingUnit(
-                plan_id=plan_id,
-                book=current_book,
-                chapter=current_chapter,
-                verse_start=current_verse,
-                verse_end=verse_end,
-                unit_index=unit_index,
-                state="pending",
-            )
-            new_units.append(new_unit)
+        # Recalculate verses_per_unit for remaining verses
+        remaining_verses = sum(high - low + 1 for _, _, low, high in spans)
+        verses_per_unit = _plan_unit_size(plan, remaining_verses)
 
-            # Advance position
-            verses_left -= (verse_end - current_verse + 1)
-            current_book, current_chapter, current_verse = advance_position(
-                current_book, current_chapter, verse_end + 1, book_meta
+        await self.db.execute(
+            delete(ReadingUnit).where(
+                ReadingUnit.plan_id == plan_id,
+                ReadingUnit.state.in_(["pending", "delivered"]),
             )
-            unit_index += 1
+        )
+        await self._insert_units(plan_id, list(UnitLayout(spans, verses_per_unit)), first_index=first_index)
 
-        # Add new units to DB
-        for unit in new_units:
-            self.db.add(unit)
+        plan.verses_per_unit = verses_per_unit
+        await self._persist_read_state(plan)
+        plan.version += 1
+        plan.updated_at = datetime.utcnow()
+        await self.db.flush()
+        return plan
 
-        # Preserve read units by re-adding them
-        for unit in read_units:
-            self.db.add(unit)
+    async def _extend_virtual(self, plan: Plan, additional_days: int | None) -> Plan:
+        """
+        Re-cut a virtual plan after its last read unit. Only the layout origin and unit
+        size change; unread delivered rows past that point are dropped so they re-deliver.
+        """
+        layout = await self.plan_layout(plan)
+        state = await self.read_state(plan)
+        resume_at = max(layout.first_index, state.read.bit_length())
+        if resume_at >= layout.end:
+            if state.completed_units == state.units:
+                plan.state = "completed"
+                await self.db.flush()
+            return plan
 
+        plan.target_date = (plan.target_date or date.today()) + timedelta(days=7 if additional_days is None else additional_days)
+        remaining_verses = layout.total_verses - layout.verses_before(resume_at)
+        verses_per_unit = _plan_unit_size(plan, remaining_verses)
+        await self.db.execute(
+            delete(ReadingUnit).where(
+                ReadingUnit.plan_id == plan.id,
+                ReadingUnit.unit_index >= resume_at,
+                ReadingUnit.state != "read",
+            )
+        )
+        resumed = layout.resume(resume_at, verses_per_unit)
+        plan.verses_per_unit = verses_per_unit
+        plan.layout_origin = resumed.origin()
+        await self._persist_read_state(plan)
+        plan.version += 1
         plan.updated_at = datetime.utcnow()
         await self.db.flush()
         return plan
@@ -362,35 +741,106 @@ class PlanService:
         if not plan:
             return None
         
-        r = await self.db.execute(
-            select(ReadingUnit)
+        # One statement: the totals aggregate over reading_units, joined to the plan's
+        # daily rollup rows (the totals repeat on each history row)
+        verses = ReadingUnit.verse_end - ReadingUnit.verse_start + 1
+        is_read = ReadingUnit.state == "read"
+        totals = (
+            select(
+                func.count().filter(is_read).label("completed_units"),
+                func.count().label("total_units"),
+                func.coalesce(func.sum(verses).filter(is_read), 0).label("completed_verses"),
+                func.coalesce(func.sum(verses), 0).label("total_verses"),
+            )
             .where(ReadingUnit.plan_id == plan_id)
-            .order_by(ReadingUnit.unit_index)
+            .subquery("totals")
         )
-        units = r.scalars().all()
-        
-        total_units = len(units)
-        completed_units = sum(1 for u in units if u.state == "read")
-        
-        total_verses = sum(u.verse_end - u.verse_start + 1 for u in units)
-        completed_verses = sum(u.verse_end - u.verse_start + 1 for u in units if u.state == "read")
-        
-        # Daily history: group by read_at date
-        history_map = {}
-        for u in units:
-            if u.state == "read" and u.read_at:
-                d = u.read_at.date()
-                history_map[d] = history_map.get(d, 0) + (u.verse_end - u.verse_start + 1)
-        
-        daily_history = [
-            {"date": d, "verses_read": count} 
-            for d, count in sorted(history_map.items())
-        ]
-        
-        return {
+        r = await self.db.execute(
+            select(totals, PlanDailyStats.date, PlanDailyStats.verses_read, PlanDailyStats.units_read)
+            .select_from(totals)
+            .outerjoin(PlanDailyStats, PlanDailyStats.plan_id == plan_id)
+            .order_by(PlanDailyStats.date)
+        )
+        rows = r.all()
+        completed_units, total_units, completed_verses, total_verses = rows[0][:4]
+        progress = {
             "completed_units": completed_units,
             "total_units": total_units,
             "completed_verses": completed_verses,
             "total_verses": total_verses,
-            "daily_history": daily_history
+            "daily_history": [
+                {"date": d, "verses_read": verses_read, "units_read": units_read}
+                for *_, d, verses_read, units_read in rows
+                if d is not None
+            ],
         }
+
+        if plan.unit_mode == "virtual":
+            # Units never delivered have no rows; the layout-backed read state knows the totals
+            state = await self.read_state(plan)
+            progress.update(total_units=state.units, total_verses=state.total_verses)
+        return progress
+
+
+UNIT_FIELDS = ("id", "book", "chapter", "verse_start", "verse_end", "unit_index", "state")
+
+_CLEARED_READ_STATE = {"read_bitmap": None, "delivered_bitmap": None, "unit_verse_prefix": None}
+
+
+def _clear_read_state(plan: Plan) -> None:
+    """Drop the bitmaps so the next read_state() rebuilds them from the units."""
+    for column, value in _CLEARED_READ_STATE.items():
+        setattr(plan, column, value)
+
+
+def _unit_dict(u: ReadingUnit) -> dict:
+    return {
+        "id": u.id,
+        "book": u.book,
+        "chapter": u.chapter,
+        "verse_start": u.verse_start,
+        "verse_end": u.verse_end,
+        "unit_index": u.unit_index,
+        "state": u.state,
+    }
+
+
+def _check_timezone(name: str | None) -> None:
+    if name is None:
+        return
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}")
+
+
+def _unit_size(
+    total_verses: int,
+    target_date: date | None,
+    frequency: str | None,
+    working_hours: dict | None,
+    time_lap_minutes: int,
+    max_verses_per_unit: int,
+) -> int:
+    """SDS: verses_per_unit = min(max(1, total_verses // target_units), max_verses_per_unit)."""
+    from app.utils.time_helpers import calculate_active_minutes
+
+    today = date.today()
+    days_remaining = max(1, ((target_date or today) - today).days)
+    active_mins_per_day = calculate_active_minutes(working_hours)
+    deliveries_per_day = max(1, active_mins_per_day // time_lap_minutes)
+    target_units = days_remaining * (deliveries_per_day if (frequency or "daily") == "daily" else 7 * deliveries_per_day)
+    target_units = max(1, target_units)
+    base_verses_per_unit = max(1, total_verses // target_units)
+    return min(base_verses_per_unit, max_verses_per_unit)
+
+
+def _plan_unit_size(plan: Plan, remaining_verses: int) -> int:
+    return _unit_size(
+        remaining_verses,
+        plan.target_date,
+        plan.frequency,
+        plan.working_hours,
+        plan.time_lap_minutes,
+        plan.max_verses_per_unit,
+    )
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import uuid
+from collections.abc import Callable
+
+
+def format_event(event: str, data: dict) -> str:
+    """One server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str, ensure_ascii=False)}\n\n"
+
+
+class Subscription:
+    """
+    One open event stream. While idle it holds no queue and no task of its own,
+    only the future its stream is awaiting.
+    """
+
+    __slots__ = ("device_id", "_events", "_waiter")
+
+    def __init__(self, device_id: uuid.UUID):
+        self.device_id = device_id
+        self._events: list[str] | None = None
+        self._waiter: asyncio.Future | None = None
+
+    def push(self, frame: str) -> None:
+        if self._events is None:
+            self._events = []
+        self._events.append(frame)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def wait(self, timeout: float) -> list[str]:
+        """Frames pushed so far, waiting up to timeout seconds for one; [] on timeout."""
+        if not self._events:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except TimeoutError:
+                pass
+            finally:
+                self._waiter = None
+        frames, self._events = self._events or [], None
+        return frames
+
+
+class PushHub:
+    """
+    Per-worker registry device_id -> open event streams. Delivery times live in the
+    DeliveryScheduler; the hub only tells it when a device opens its first stream
+    (on_connect(device_id)) so that device's plans are loaded and checked, and when it
+    closes its last one (on_disconnect(device_id)) so they are dropped.
+    """
+
+    def __init__(
+        self,
+        on_connect: Callable[[uuid.UUID], None] | None = None,
+        on_disconnect: Callable[[uuid.UUID], None] | None = None,
+    ):
+        self.on_connect = on_connect
+        self.on_disconnect = on_disconnect
+        self._streams: dict[uuid.UUID, set[Subscription]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(subs) for subs in self._streams.values())
+
+    @property
+    def devices(self) -> int:
+        return len(self._streams)
+
+    def is_connected(self, device_id: uuid.UUID) -> bool:
+        return device_id in self._streams
+
+    def connected_devices(self) -> list[uuid.UUID]:
+        return list(self._streams)
+
+    def subscribe(self, device_id: uuid.UUID) -> Subscription:
+        sub = Subscription(device_id)
+        subs = self._streams.get(device_id)
+        if subs is None:
+            subs = self._streams[device_id] = set()
+            if self.on_connect is not None:
+                self.on_connect(device_id)
+        subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        subs = self._streams.get(sub.device_id)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            del self._streams[sub.device_id]
+            if self.on_disconnect is not None:
+                self.on_disconnect(sub.device_id)
+
+    def publish(self, device_id: uuid.UUID, event: str, data: dict) -> int:
+        """Send to every open stream of the device; returns how many received it."""
+        subs = self._streams.get(device_id, ())
+        if subs:
+            frame = format_event(event, data)
+            for sub in subs:
+                sub.push(frame)
+        return len(subs)
+
+
+_hub: PushHub | None = None
+
+
+def get_push_hub() -> PushHub:
+    global _hub
+    if _hub is None:
+        _hub = PushHub()
+    return _hub
+
+
+def set_push_hub(hub: PushHub | None) -> None:
+    global _hub
+    _hub = hub
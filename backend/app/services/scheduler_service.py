@@ -4,12 +4,14 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.utils.time_helpers import calculate_active_minutes
-from app.models import Plan, ReadingUnit
+from app.models import Plan
+from app.services.plan_service import PlanService
 from app.utils.compensation import (
     calculate_missed_working_days,
     adjusted_verses_per_unit,
 )
-from app.utils.time_helpers import is_in_quiet_hours, next_valid_delivery_timestamp
+from app.utils.delivery_window import plan_window
+from app.utils.time_helpers import DEFAULT_TZ
 
 
 class SchedulerService:
@@ -24,16 +26,10 @@ class SchedulerService:
 
     async def remaining_verses(self, plan_id: UUID) -> int:
         """Count verses in units that are still pending or delivered (not read)."""
-        r = await self.db.execute(
-            select(ReadingUnit)
-            .where(
-                ReadingUnit.plan_id == plan_id,
-                ReadingUnit.state.in_(["pending", "delivered"]),
-            )
-            .order_by(ReadingUnit.unit_index)
-        )
-        units = r.scalars().all()
-        return sum(u.verse_end - u.verse_start + 1 for u in units)
+        plan = await self.get_plan_with_units(plan_id)
+        if not plan:
+            return 0
+        return await PlanService(self.db).remaining_verses(plan)
 
     async def calculate(
         self,
@@ -46,7 +42,7 @@ class SchedulerService:
             return {}
         from_date = from_date or date.today()
         target = plan.target_date or from_date
-        remaining_verses = await self.remaining_verses(plan_id)
+        remaining_verses = await PlanService(self.db).remaining_verses(plan)
         remaining_days = max(0, (target - from_date).days) or 1
         frequency = plan.frequency or "daily"
       
@@ -65,11 +61,7 @@ class SchedulerService:
             missed_days=missed,
             deliveries_per_day=deliveries_per_day,
         )
-        next_ts = next_valid_delivery_timestamp(
-            plan.quiet_hours,
-            None,
-            datetime.now(),
-        )
+        next_ts = plan_window(plan).next_allowed(datetime.now(DEFAULT_TZ))
         return {
             "remaining_verses": remaining_verses,
             "remaining_days": remaining_days,
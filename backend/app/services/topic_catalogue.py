@@ -0,0 +1,103 @@
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BibleTopic, BibleTopicVerse
+from app.utils.trigram import TrigramIndex
+
+TIMES_OF_DAY = ("morning", "afternoon", "evening")
+
+
+class CatalogueTopic(NamedTuple):
+    id: int
+    topic: str
+    topic_index: int
+
+
+class TopicVerse(NamedTuple):
+    text: str
+    book_and_verse: str
+
+
+def split_by_time_of_day(topics: list[CatalogueTopic], time_of_day: str) -> list[CatalogueTopic]:
+    """
+    FR-4.1.2: topics (sorted by topic_index) split into thirds -
+    morning (first), afternoon (middle), evening or anything else (last).
+    """
+    n = len(topics)
+    if n <= 1:
+        return list(topics)
+    one_third = max(1, n // 3)
+    if time_of_day == "morning":
+        return topics[:one_third]
+    if time_of_day == "afternoon":
+        return topics[one_third : 2 * one_third]
+    return topics[2 * one_third :]
+
+
+class TopicCatalogue:
+    """
+    bible_topics/bible_topic_verses held per process for random mode.
+    Topics are kept sorted by topic_index so buckets never need re-sorting.
+    """
+
+    def __init__(
+        self,
+        topics: list[CatalogueTopic],
+        verses: dict[int, tuple[TopicVerse, ...]],
+    ):
+        self.topics = sorted(topics, key=lambda t: t.topic_index)
+        self._verses = verses
+        self._buckets = {tod: split_by_time_of_day(self.topics, tod) for tod in TIMES_OF_DAY}
+        self._names = TrigramIndex(t.topic for t in self.topics)
+
+    @classmethod
+    async def load(cls, db: AsyncSession) -> "TopicCatalogue":
+        r = await db.execute(select(BibleTopic.id, BibleTopic.topic, BibleTopic.topic_index))
+        topics = [CatalogueTopic(*row) for row in r.all()]
+        r = await db.execute(
+            select(BibleTopicVerse.topic_id, BibleTopicVerse.text, BibleTopicVerse.book_and_verse)
+            .order_by(BibleTopicVerse.topic_id, BibleTopicVerse.verse_index)
+        )
+        grouped: dict[int, list[TopicVerse]] = {}
+        for topic_id, text, book_and_verse in r.all():
+            grouped.setdefault(topic_id, []).append(TopicVerse(text, book_and_verse or ""))
+        return cls(topics, {tid: tuple(vs) for tid, vs in grouped.items()})
+
+    def match_themes(self, themes: list[str]) -> list[CatalogueTopic]:
+        """
+        FR-4.1.1: topics matching any theme, in topic_index order.
+        Names containing the theme (after fidel normalization) win; only when a
+        theme has no such match do its fuzzy trigram matches count.
+        """
+        positions: set[int] = set()
+        for theme in themes:
+            hits = self._names.search(theme)
+            exact = [pos for pos, score in hits if score == 1.0]
+            positions.update(exact or (pos for pos, _ in hits))
+        return [self.topics[pos] for pos in sorted(positions)]
+
+    def bucket(self, topics: list[CatalogueTopic], time_of_day: str) -> list[CatalogueTopic]:
+        if topics is self.topics:
+            return self._buckets.get(time_of_day, self._buckets["evening"])
+        return split_by_time_of_day(topics, time_of_day)
+
+    def verses(self, topic_id: int) -> tuple[TopicVerse, ...]:
+        return self._verses.get(topic_id, ())
+
+
+_catalogue: TopicCatalogue | None = None
+
+
+async def get_topic_catalogue(db: AsyncSession) -> TopicCatalogue:
+    """Build on first use; reused until invalidate_topic_catalogue()."""
+    global _catalogue
+    if _catalogue is None:
+        _catalogue = await TopicCatalogue.load(db)
+    return _catalogue
+
+
+def invalidate_topic_catalogue() -> None:
+    global _catalogue
+    _catalogue = None
@@ -0,0 +1,95 @@
+import math
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+from app.services.bible_corpus import BibleCorpus
+from app.utils.amharic import tokenize
+
+# Amharic attaches suffixes to words, so query words also match words they prefix.
+MIN_PREFIX_LEN = 2
+MAX_PREFIX_TERMS = 200
+PREFIX_WEIGHT = 0.5
+
+
+class VerseSearchIndex:
+    """
+    Inverted index over the corpus: normalized word -> ascending global verse indexes.
+    Hits are ranked by summed idf of matched query words (prefix matches count half),
+    then by canonical order. Scores are accumulated in one array per query, so a page
+    of hits costs a partition of that array rather than a sort of every match.
+    """
+
+    def __init__(self, corpus: BibleCorpus):
+        postings: dict[str, array] = {}
+        for i in range(len(corpus)):
+            for term in set(tokenize(corpus.verse_text(i))):
+                p = postings.get(term)
+                if p is None:
+                    p = postings[term] = array("I")
+                p.append(i)
+        self.corpus = corpus
+        self._postings = {term: np.frombuffer(p, np.uint32) for term, p in postings.items()}
+        self._terms = sorted(postings)
+        self._n = max(1, len(corpus))
+
+    def _idf(self, term: str) -> float:
+        return math.log(1 + self._n / len(self._postings[term]))
+
+    def _expand(self, word: str) -> list[tuple[str, float]]:
+        """(term, weight) pairs for one query word: exact term plus terms it prefixes."""
+        out = [(word, 1.0)] if word in self._postings else []
+        if len(word) >= MIN_PREFIX_LEN:
+            pos = bisect_left(self._terms, word)
+            for term in self._terms[pos : pos + MAX_PREFIX_TERMS + 1]:
+                if not term.startswith(word):
+                    break
+                if term != word:
+                    out.append((term, PREFIX_WEIGHT))
+        return out
+
+    def _scores(self, query: str) -> np.ndarray:
+        """Score of every verse (0.0: no match)."""
+        scores = np.zeros(self._n)
+        best = np.zeros(self._n)
+        for word in dict.fromkeys(tokenize(query)):
+            best.fill(0.0)
+            for term, weight in self._expand(word):
+                hits = self._postings[term]
+                best[hits] = np.maximum(best[hits], weight * self._idf(term))
+            scores += best
+        return scores
+
+    def search(self, query: str) -> list[tuple[int, float]]:
+        """All matching (global verse index, score), best first."""
+        scores = self._scores(query)
+        matches = np.flatnonzero(scores)
+        order = np.lexsort((matches, -scores[matches]))
+        return list(zip(matches[order].tolist(), scores[matches[order]].tolist()))
+
+    def top(self, query: str, k: int) -> tuple[int, list[tuple[int, float]]]:
+        """(number of matches, the best k of them), ranked like search()."""
+        scores = self._scores(query)
+        matches = np.flatnonzero(scores)
+        total = len(matches)
+        if k <= 0:
+            return total, []
+        if total > k:
+            # Everything scoring at least the k-th best; ties there are cut in canonical order
+            kth = np.partition(scores[matches], total - k)[total - k]
+            matches = matches[scores[matches] >= kth]
+        order = np.lexsort((matches, -scores[matches]))[:k]
+        return total, list(zip(matches[order].tolist(), scores[matches[order]].tolist()))
+
+
+_search_index: VerseSearchIndex | None = None
+
+
+def get_search_index() -> VerseSearchIndex | None:
+    return _search_index
+
+
+def set_search_index(index: VerseSearchIndex | None) -> None:
+    global _search_index
+    _search_index = index
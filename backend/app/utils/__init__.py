@@ -1,7 +1,12 @@
 from app.utils.time_helpers import (
     is_in_quiet_hours,
     get_time_of_day,
+    is_delivery_allowed,
     next_valid_delivery_timestamp,
+    next_delivery_times,
+    next_delivery_after,
+    next_delivery_after_batch,
+    next_delivery_after_windows,
 )
 from app.utils.compensation import (
     calculate_missed_working_days,
@@ -11,7 +16,12 @@ from app.utils.compensation import (
 __all__ = [
     "is_in_quiet_hours",
     "get_time_of_day",
+    "is_delivery_allowed",
     "next_valid_delivery_timestamp",
+    "next_delivery_times",
+    "next_delivery_after",
+    "next_delivery_after_batch",
+    "next_delivery_after_windows",
     "calculate_missed_working_days",
     "adjusted_verses_per_unit",
 ]
@@ -0,0 +1,42 @@
+import re
+
+# Ethiopic syllables come in blocks of 8 code points (one consonant, 7-8 vowel orders).
+# Homophone consonant families are spelled interchangeably in practice:
+# ሀ/ሐ/ኀ (h), ሰ/ሠ (s), አ/ዐ (glottal), ጸ/ፀ (ts').
+_FAMILY_ALIASES = {
+    0x1200: 0x1200,  # ሀ
+    0x1210: 0x1200,  # ሐ -> ሀ
+    0x1280: 0x1200,  # ኀ -> ሀ
+    0x1230: 0x1230,  # ሰ
+    0x1220: 0x1230,  # ሠ -> ሰ
+    0x12A0: 0x12A0,  # አ
+    0x12D0: 0x12A0,  # ዐ -> አ
+    0x1338: 0x1338,  # ጸ
+    0x1340: 0x1338,  # ፀ -> ጸ
+}
+# For the h and glottal families the 1st and 4th orders sound alike (ሀ/ሃ, አ/ኣ).
+_FOURTH_ORDER_FOLDED = {0x1200, 0x12A0}
+
+
+def _build_fidel_table() -> dict[int, int]:
+    table: dict[int, int] = {}
+    for base, canonical in _FAMILY_ALIASES.items():
+        for order in range(8):
+            target = canonical + (0 if order == 3 and canonical in _FOURTH_ORDER_FOLDED else order)
+            if base + order != target:
+                table[base + order] = target
+    return table
+
+
+_FIDEL_TABLE = _build_fidel_table()
+_WORD_RE = re.compile(r"\w+")
+
+
+def normalize_fidel(text: str) -> str:
+    """Lowercase and fold homophone fidel variants to one spelling (e.g. ሐ/ኀ/ሃ -> ሀ)."""
+    return text.lower().translate(_FIDEL_TABLE)
+
+
+def tokenize(text: str) -> list[str]:
+    """Normalized words; Ethiopic punctuation (፡ ። ፣ ፤) and whitespace separate words."""
+    return _WORD_RE.findall(normalize_fidel(text))
@@ -0,0 +1,198 @@
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+MINUTES_PER_DAY = 1440
+FULL_DAY = (1 << MINUTES_PER_DAY) - 1
+NEVER = 0xFFFF  # wait value for windows that never allow delivery
+
+
+@lru_cache(maxsize=1024)
+def parse_minute(s: str) -> int:
+    """'HH:MM' or 'HH:MM:SS' -> minute of day (seconds are dropped)."""
+    parts = s.strip().split(":")
+    h = int(parts[0]) if len(parts) > 0 else 0
+    m = int(parts[1]) if len(parts) > 1 else 0
+    return h * 60 + m
+
+
+def hours_span(hours: dict | None) -> tuple[int, int] | None:
+    """(start, end) minutes of a {"start", "end"} window; None when unset."""
+    if not hours or not isinstance(hours, dict):
+        return None
+    start_s = hours.get("start")
+    end_s = hours.get("end")
+    if not start_s or not end_s:
+        return None
+    return parse_minute(start_s), parse_minute(end_s)
+
+
+@lru_cache(maxsize=1024)
+def span_mask(start: int, end: int) -> int:
+    """Minutes start..end inclusive as bits of a 1440-bit mask; start > end wraps past midnight."""
+    if start <= end:
+        return ((1 << (end - start + 1)) - 1) << start
+    return (FULL_DAY >> start << start) | ((1 << (end + 1)) - 1)
+
+
+def _minute_of(at) -> int:
+    return at.hour * 60 + at.minute
+
+
+class DeliveryWindow:
+    """
+    Quiet and working hours compiled into a 1440-bit minute-of-day mask (bit m set:
+    delivery allowed during minute m) plus, per minute, how many minutes until the next
+    allowed one. "Allowed now?" and "next allowed minute" are single array lookups.
+
+    Minutes are read in `tz` when it is set (datetimes must then be aware), otherwise in
+    whatever wall clock the datetime carries. Both windows are inclusive of their end minute.
+    """
+
+    __slots__ = ("mask", "tz", "_wait")
+
+    def __init__(self, mask: int, tz: tzinfo | None = None):
+        self.mask = mask & FULL_DAY
+        self.tz = tz
+        bits = np.unpackbits(
+            np.frombuffer(self.mask.to_bytes(MINUTES_PER_DAY // 8, "little"), np.uint8), bitorder="little"
+        )
+        allowed = np.flatnonzero(bits)
+        if len(allowed) == 0:
+            self._wait = array("H", [NEVER]) * MINUTES_PER_DAY
+            return
+        # Next allowed minute at or after each minute, wrapping to tomorrow's first one
+        minutes = np.arange(MINUTES_PER_DAY)
+        nxt = np.append(allowed, allowed[0] + MINUTES_PER_DAY)[np.searchsorted(allowed, minutes)]
+        self._wait = array("H", (nxt - minutes).astype(np.uint16).tobytes())
+
+    @classmethod
+    def compile(
+        cls,
+        quiet_hours: dict | None,
+        working_hours: dict | None,
+        tz: str | tzinfo | None = None,
+    ) -> "DeliveryWindow":
+        """Shared instance per distinct (quiet, working, tz name); tz objects without a name are not cached."""
+        quiet, working = hours_span(quiet_hours), hours_span(working_hours)
+        if isinstance(tz, ZoneInfo):
+            tz = tz.key
+        if tz is None or isinstance(tz, str):
+            return _compile(quiet, working, tz)
+        return cls(_allowed_mask(quiet, working), tz)
+
+    @property
+    def allowed_minutes(self) -> int:
+        return self.mask.bit_count()
+
+    @property
+    def waits(self) -> array:
+        """Per minute of day, minutes until the next allowed one (0: allowed, NEVER: never)."""
+        return self._wait
+
+    def minute_of(self, at: datetime) -> int:
+        return _minute_of(at.astimezone(self.tz) if self.tz is not None else at)
+
+    def allows_minute(self, minute: int) -> bool:
+        return self._wait[minute] == 0
+
+    def wait_minutes(self, minute: int) -> int | None:
+        """Minutes from `minute` until the next allowed one (0 if allowed); None if never."""
+        w = self._wait[minute]
+        return None if w == NEVER else w
+
+    def allows(self, at: datetime) -> bool:
+        return self._wait[self.minute_of(at)] == 0
+
+    def next_allowed(self, at: datetime) -> datetime | None:
+        """`at` itself when allowed, else the start of the next allowed minute; None if never."""
+        local = at.astimezone(self.tz) if self.tz is not None else at
+        for _ in range(3):
+            w = self._wait[_minute_of(local)]
+            if w == 0:
+                return local
+            if w == NEVER:
+                return None
+            local = local.replace(second=0, microsecond=0) + timedelta(minutes=w)
+            if self.tz is not None:
+                local = self._first_instant_at_or_after(local, at)
+        return local
+
+    def _first_instant_at_or_after(self, local: datetime, not_before: datetime) -> datetime:
+        """
+        Normalize a wall time in tz. One inside a DST gap becomes the instant the gap ends;
+        one repeated by a fall-back is the occurrence not before `not_before`.
+        """
+        wall = local.replace(tzinfo=None)
+        local = local.replace(fold=0).astimezone(timezone.utc).astimezone(self.tz)
+        if local < not_before:
+            local = local.replace(fold=1).astimezone(timezone.utc).astimezone(self.tz)
+        if local.replace(tzinfo=None) != wall:
+            step = timedelta(minutes=1)
+            utc = local.astimezone(timezone.utc)
+            while (prev := (utc - step).astimezone(self.tz)).replace(tzinfo=None) >= wall:
+                utc, local = utc - step, prev
+        return local
+
+    def next_after(
+        self,
+        time_lap_minutes: int,
+        last_delivered_at: datetime | None,
+        now: datetime,
+    ) -> datetime | None:
+        """Next due moment: time_lap_minutes after the last delivery, never before now."""
+        start = now
+        if last_delivered_at is not None:
+            start = max(now, last_delivered_at + timedelta(minutes=time_lap_minutes))
+        return self.next_allowed(start)
+
+    def times(self, time_lap_minutes: int, count: int, from_dt: datetime) -> list[datetime]:
+        """The next `count` delivery moments from from_dt, time_lap_minutes apart at least."""
+        out: list[datetime] = []
+        at = self.next_allowed(from_dt)
+        while at is not None and len(out) < count:
+            out.append(at)
+            at = self.next_allowed(at + timedelta(minutes=time_lap_minutes))
+        return out
+
+
+def _allowed_mask(quiet: tuple[int, int] | None, working: tuple[int, int] | None) -> int:
+    allowed = FULL_DAY
+    if quiet is not None:
+        allowed &= ~span_mask(*quiet)
+    if working is not None:
+        allowed &= span_mask(*working)
+    return allowed
+
+
+@lru_cache(maxsize=4096)
+def _compile(
+    quiet: tuple[int, int] | None,
+    working: tuple[int, int] | None,
+    tz: str | None,
+) -> DeliveryWindow:
+    return DeliveryWindow(_allowed_mask(quiet, working), ZoneInfo(tz) if tz else None)
+
+
+# Plans whose window is cached; least recently used ones are evicted past this.
+PLAN_WINDOW_CACHE_SIZE = 65536
+
+_plan_windows: OrderedDict = OrderedDict()
+
+
+def plan_window(plan) -> DeliveryWindow:
+    """A plan's compiled window, reused until plan.version changes."""
+    cached = _plan_windows.get(plan.id)
+    if cached is not None and cached[0] == plan.version:
+        _plan_windows.move_to_end(plan.id)
+        return cached[1]
+    window = DeliveryWindow.compile(plan.quiet_hours, plan.working_hours, plan.timezone)
+    _plan_windows[plan.id] = (plan.version, window)
+    _plan_windows.move_to_end(plan.id)
+    if len(_plan_windows) > PLAN_WINDOW_CACHE_SIZE:
+        _plan_windows.popitem(last=False)
+    return window
@@ -0,0 +1,104 @@
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+
+
+def _to_int(buf: bytes | None) -> int:
+    return int.from_bytes(buf or b"", "little")
+
+
+def _runs(bits: int) -> Iterator[tuple[int, int]]:
+    """Maximal runs [start, end) of set bits, lowest first."""
+    while bits:
+        start = (bits & -bits).bit_length() - 1
+        shifted = bits >> start
+        length = (~shifted & (shifted + 1)).bit_length() - 1
+        yield start, start + length
+        bits = (shifted >> length) << (start + length)
+
+
+def _lowest(bits: int) -> int | None:
+    return (bits & -bits).bit_length() - 1 if bits else None
+
+
+class ReadState:
+    """
+    Unit states of one plan as bitsets over unit_index plus verse-weight prefix sums.
+    Bit i is unit i, least significant bit first in each byte - the numbering of
+    Postgres set_bit() on bytea, so single units can be flipped in SQL.
+    read and delivered are exclusive; a unit in neither is pending.
+    """
+
+    __slots__ = ("read", "delivered", "verse_prefix")
+
+    def __init__(self, read: int, delivered: int, verse_prefix: array):
+        self.read = read
+        self.delivered = delivered
+        self.verse_prefix = verse_prefix
+
+    @classmethod
+    def build(cls, units: Iterable[tuple[int, int, str]]) -> "ReadState":
+        """From (unit_index, verse_count, state) in any order; indexes with no unit weigh 0."""
+        weights: dict[int, int] = {}
+        read = bytearray()
+        delivered = bytearray()
+        for index, verses, state in units:
+            weights[index] = verses
+            bits = read if state == "read" else delivered if state == "delivered" else None
+            if bits is not None:
+                if len(bits) <= index >> 3:
+                    bits.extend(bytes((index >> 3) + 1 - len(bits)))
+                bits[index >> 3] |= 1 << (index & 7)
+        prefix = array("I", [0])
+        for index in range(max(weights, default=-1) + 1):
+            prefix.append(prefix[-1] + weights.get(index, 0))
+        return cls(_to_int(read), _to_int(delivered), prefix)
+
+    @classmethod
+    def from_columns(cls, read_bitmap: bytes, delivered_bitmap: bytes, unit_verse_prefix: bytes) -> "ReadState":
+        prefix = array("I")
+        prefix.frombytes(unit_verse_prefix)
+        if sys.byteorder == "big":
+            prefix.byteswap()
+        return cls(_to_int(read_bitmap), _to_int(delivered_bitmap), prefix)
+
+    def to_columns(self) -> dict:
+        """Plan column values: bitmaps sized to the unit count, prefix as little-endian uint32."""
+        size = (self.units + 7) // 8
+        prefix = array("I", self.verse_prefix)
+        if sys.byteorder == "big":
+            prefix.byteswap()
+        return {
+            "read_bitmap": self.read.to_bytes(size, "little"),
+            "delivered_bitmap": self.delivered.to_bytes(size, "little"),
+            "unit_verse_prefix": prefix.tobytes(),
+        }
+
+    @property
+    def units(self) -> int:
+        return len(self.verse_prefix) - 1
+
+    @property
+    def total_verses(self) -> int:
+        return self.verse_prefix[-1]
+
+    @property
+    def completed_units(self) -> int:
+        return self.read.bit_count()
+
+    @property
+    def completed_verses(self) -> int:
+        p = self.verse_prefix
+        return sum(p[end] - p[start] for start, end in _runs(self.read))
+
+    @property
+    def remaining_verses(self) -> int:
+        return self.total_verses - self.completed_verses
+
+    def next_pending(self) -> int | None:
+        """Lowest unit index neither delivered nor read."""
+        return _lowest(~(self.read | self.delivered) & ((1 << self.units) - 1))
+
+    def first_delivered(self) -> int | None:
+        """Lowest unit index delivered but not yet read."""
+        return _lowest(self.delivered)
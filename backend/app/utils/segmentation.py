@@ -0,0 +1,175 @@
+from array import array
+from bisect import bisect_right
+from itertools import repeat
+
+Unit = tuple[str, int, int, int]  # (book, chapter, verse_start, verse_end)
+
+
+def book_spans(
+    book_meta: list[tuple[str, list[int]]],
+    boundaries: dict | None,
+) -> list[tuple[str, list[int], int, int, int, int]]:
+    """
+    SDS segmentation: (book, verse_counts, start_ch, start_v, end_ch, end_v) per plan book.
+    Boundaries start the first book and end the last one; books in between are read whole.
+    """
+    b = boundaries or {}
+    ch_start = b.get("chapter_start", 1)
+    v_start = b.get("verse_start", 1)
+    ch_end = b.get("chapter_end")
+    v_end = b.get("verse_end")
+    last = len(book_meta) - 1
+    spans = []
+    for bi, (book, v_counts) in enumerate(book_meta):
+        nch = len(v_counts)
+        start_ch, start_v = (ch_start, v_start) if bi == 0 else (1, 1)
+        if bi == last:
+            end_ch = ch_end if ch_end is not None else nch
+            end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
+        else:
+            end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
+        spans.append((book, v_counts, start_ch, start_v, end_ch, end_v))
+    return spans
+
+
+def chapter_spans(
+    book_meta: list[tuple[str, list[int]]],
+    boundaries: dict | None,
+) -> list[Unit]:
+    """Non-empty (book, chapter, low, high) verse runs covered by the plan, in reading order."""
+    out: list[Unit] = []
+    for book, v_counts, start_ch, start_v, end_ch, end_v in book_spans(book_meta, boundaries):
+        for c in range(start_ch, end_ch + 1):
+            low = start_v if c == start_ch else 1
+            high = end_v if c == end_ch else (v_counts[c - 1] if c <= len(v_counts) else 0)
+            if high >= low:
+                out.append((book, c, low, high))
+    return out
+
+
+def unit_spans(units: list[Unit]) -> list[Unit]:
+    """
+    Chapter runs covered by units in reading order: a unit continuing the previous
+    one's chapter verse for verse joins its run. Positional, so a book listed twice
+    simply yields its runs twice.
+    """
+    out: list[Unit] = []
+    for book, chapter, vs, ve in units:
+        if out and out[-1][:2] == (book, chapter) and out[-1][3] + 1 == vs:
+            out[-1] = (book, chapter, out[-1][2], ve)
+        else:
+            out.append((book, chapter, vs, ve))
+    return out
+
+
+def segment(
+    book_meta: list[tuple[str, list[int]]],
+    boundaries: dict | None,
+    verses_per_unit: int,
+) -> list[Unit]:
+    """
+    Units never cross a chapter, so each chapter run [low, high] is cut into
+    ceil((high - low + 1) / verses_per_unit) slices by arithmetic alone.
+    """
+    return list(UnitLayout(chapter_spans(book_meta, boundaries), verses_per_unit))
+
+
+class UnitLayout:
+    """
+    Units of a plan as a pure function of its chapter spans and verses_per_unit.
+    Prefix sums over the spans map unit index -> (book, chapter, verse_start, verse_end)
+    with one bisect over chapters, without materializing the units.
+
+    The layout covers unit indexes first_index .. end - 1; spans[0] is base span
+    span_offset (a layout resumed mid-plan after an extension starts mid-chapter).
+    """
+
+    __slots__ = (
+        "spans",
+        "verses_per_unit",
+        "first_index",
+        "span_offset",
+        "_unit_prefix",
+        "_verse_prefix",
+    )
+
+    def __init__(
+        self,
+        spans: list[Unit],
+        verses_per_unit: int,
+        first_index: int = 0,
+        span_offset: int = 0,
+    ):
+        self.spans = spans
+        self.verses_per_unit = verses_per_unit
+        self.first_index = first_index
+        self.span_offset = span_offset
+        self._unit_prefix = array("L", [0])
+        self._verse_prefix = array("L", [0])
+        for _, _, low, high in spans:
+            n = high - low + 1
+            self._unit_prefix.append(self._unit_prefix[-1] + -(-n // verses_per_unit))
+            self._verse_prefix.append(self._verse_prefix[-1] + n)
+
+    def __len__(self) -> int:
+        return self._unit_prefix[-1]
+
+    @property
+    def end(self) -> int:
+        """One past the last unit index."""
+        return self.first_index + len(self)
+
+    @property
+    def total_verses(self) -> int:
+        return self._verse_prefix[-1]
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """(span position, unit offset within the span) of a unit index in range."""
+        j = index - self.first_index
+        if not 0 <= j < len(self):
+            raise IndexError(index)
+        s = bisect_right(self._unit_prefix, j) - 1
+        return s, j - self._unit_prefix[s]
+
+    def unit(self, index: int) -> Unit:
+        s, k = self._locate(index)
+        book, chapter, low, high = self.spans[s]
+        vs = low + k * self.verses_per_unit
+        return book, chapter, vs, min(vs + self.verses_per_unit - 1, high)
+
+    def verses_before(self, index: int) -> int:
+        """Verses in layout units first_index .. index - 1."""
+        if index >= self.end:
+            return self.total_verses
+        s, k = self._locate(index)
+        return self._verse_prefix[s] + k * self.verses_per_unit
+
+    def __iter__(self):
+        for book, chapter, low, high in self.spans:
+            starts = range(low, high + 1, self.verses_per_unit)
+            ends = [*range(low + self.verses_per_unit - 1, high, self.verses_per_unit), high]
+            yield from zip(repeat(book), repeat(chapter), starts, ends)
+
+    def resume(self, index: int, verses_per_unit: int) -> "UnitLayout":
+        """Layout of the remaining verses from unit index on, re-cut with a new unit size."""
+        s, k = self._locate(index)
+        book, chapter, low, high = self.spans[s]
+        spans = [(book, chapter, low + k * self.verses_per_unit, high), *self.spans[s + 1 :]]
+        return UnitLayout(spans, verses_per_unit, first_index=index, span_offset=self.span_offset + s)
+
+    def origin(self) -> dict | None:
+        """JSON-safe description for rebuilding this layout from the base spans (None if it is the base)."""
+        if self.first_index == 0 and self.span_offset == 0:
+            return None
+        return {"unit_index": self.first_index, "span": self.span_offset, "verse": self.spans[0][2]}
+
+    @classmethod
+    def from_origin(cls, base_spans: list[Unit], verses_per_unit: int, origin: dict | None) -> "UnitLayout":
+        if not origin:
+            return cls(base_spans, verses_per_unit)
+        s = origin["span"]
+        if s >= len(base_spans):
+            return cls([], verses_per_unit, first_index=origin["unit_index"], span_offset=s)
+        book, chapter, _, high = base_spans[s]
+        spans = [(book, chapter, origin["verse"], high), *base_spans[s + 1 :]]
+        return cls(spans, verses_per_unit, first_index=origin["unit_index"], span_offset=s)
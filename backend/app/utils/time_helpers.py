@@ -1,35 +1,23 @@
-from datetime import datetime, time, timedelta
+from collections.abc import Sequence
+from itertools import repeat
+from datetime import datetime, time, timedelta, timezone, tzinfo
 from zoneinfo import ZoneInfo
 
-# Default to UTC if no TZ; extension can pass user TZ later
-DEFAULT_TZ = ZoneInfo("UTC")
+import numpy as np
 
+from app.utils.delivery_window import MINUTES_PER_DAY, NEVER, DeliveryWindow, hours_span, span_mask
 
-def _parse_time(s: str) -> time:
-    """Parse 'HH:MM' or 'HH:MM:SS' to time."""
-    parts = s.strip().split(":")
-    h = int(parts[0]) if len(parts) > 0 else 0
-    m = int(parts[1]) if len(parts) > 1 else 0
-    return time(h, m)
+# Default to UTC if no TZ; extension can pass user TZ later
+DEFAULT_TZ = ZoneInfo("UTC")
 
 
 def is_in_quiet_hours(quiet_hours: dict | None, now: datetime | None = None) -> bool:
-    """SRS 4.7.1: Check if current time falls within quiet hours."""
-    if not quiet_hours or not isinstance(quiet_hours, dict):
-        return False
-    start_s = quiet_hours.get("start")
-    end_s = quiet_hours.get("end")
-    if not start_s or not end_s:
+    """SRS 4.7.1: Check if current time falls within quiet hours (end minute included)."""
+    span = hours_span(quiet_hours)
+    if span is None:
         return False
-    now = now or datetime.now(DEFAULT_TZ).time()
-    if isinstance(now, datetime):
-        now = now.time()
-    start_t = _parse_time(start_s)
-    end_t = _parse_time(end_s)
-    if start_t <= end_t:  # e.g. 09:00 - 17:00
-        return start_t <= now <= end_t
-    # e.g. 22:00 - 06:00 (overnight)
-    return now >= start_t or now <= end_t
+    now = now or datetime.now(DEFAULT_TZ)
+    return bool(span_mask(*span) >> (now.hour * 60 + now.minute) & 1)
 
 
 def get_time_of_day(now: datetime | None = None) -> str:
@@ -45,49 +33,200 @@ def get_time_of_day(now: datetime | None = None) -> str:
     return "evening"
 
 
+def _aware(dt: datetime | None) -> datetime:
+    dt = dt or datetime.now(DEFAULT_TZ)
+    return dt.replace(tzinfo=DEFAULT_TZ) if dt.tzinfo is None else dt
+
+
+def is_delivery_allowed(
+    quiet_hours: dict | None,
+    working_hours: dict | None,
+    at: datetime | time,
+) -> bool:
+    """Outside quiet hours and, when set, inside working hours (both windows inclusive)."""
+    return DeliveryWindow.compile(quiet_hours, working_hours).allows(at)
+
+
 def next_valid_delivery_timestamp(
     quiet_hours: dict | None,
     working_hours: dict | None,
     from_dt: datetime | None = None,
 ) -> datetime | None:
-    """Next moment when delivery is allowed (outside quiet hours)."""
-    from_dt = from_dt or datetime.now(DEFAULT_TZ)
-    if isinstance(from_dt, datetime) and from_dt.tzinfo is None:
-        from_dt = from_dt.replace(tzinfo=DEFAULT_TZ)
-    # Simple: if in quiet hours, return next end of quiet period
-    if not quiet_hours:
-        return from_dt
-    end_s = quiet_hours.get("end")
-    if not end_s:
-        return from_dt
-    end_t = _parse_time(end_s)
-    candidate = from_dt.replace(
-        hour=end_t.hour,
-        minute=end_t.minute,
-        second=0,
-        microsecond=0,
+    """Next moment >= from_dt when delivery is allowed; None if the windows never allow it."""
+    return DeliveryWindow.compile(quiet_hours, working_hours).next_allowed(_aware(from_dt))
+
+
+def next_delivery_times(
+    quiet_hours: dict | None,
+    working_hours: dict | None,
+    time_lap_minutes: int,
+    count: int,
+    from_dt: datetime | None = None,
+) -> list[datetime]:
+    """
+    Delivery moments for the next `count` units: the first allowed moment from from_dt,
+    then each at least time_lap_minutes after the previous one, skipping blocked time.
+    """
+    return DeliveryWindow.compile(quiet_hours, working_hours).times(time_lap_minutes, count, _aware(from_dt))
+
+
+def next_delivery_after(
+    quiet_hours: dict | None,
+    working_hours: dict | None,
+    time_lap_minutes: int,
+    last_delivered_at: datetime | None,
+    now: datetime,
+) -> datetime | None:
+    """When a plan's next unit is due: time_lap_minutes after the last delivery, and never before now."""
+    window = DeliveryWindow.compile(quiet_hours, working_hours)
+    return window.next_after(time_lap_minutes, last_delivered_at, now)
+
+
+def next_delivery_after_batch(
+    quiet_hours: Sequence[dict | None],
+    working_hours: Sequence[dict | None],
+    time_lap_minutes: Sequence[int],
+    last_delivered_at: Sequence[datetime | None],
+    now: datetime,
+    timezones: Sequence[str | None] | None = None,
+) -> list[datetime | None]:
+    """
+    next_delivery_after for many plans at once (UTC results): compiles each distinct
+    (quiet, working, zone) window once, then next_delivery_after_windows. Datetimes must
+    be aware; zone None is UTC.
+    """
+    n = len(quiet_hours)
+    timezones = timezones if timezones is not None else [None] * n
+    compiled: dict[tuple, DeliveryWindow] = {}
+    windows = []
+    for q, w, tz in zip(quiet_hours, working_hours, timezones):
+        key = (_hours_key(q), _hours_key(w), tz)
+        window = compiled.get(key)
+        if window is None:
+            window = compiled[key] = DeliveryWindow.compile(q, w, tz or DEFAULT_TZ.key)
+        windows.append(window)
+    return next_delivery_after_windows(windows, time_lap_minutes, last_delivered_at, now)
+
+
+def next_delivery_after_windows(
+    windows: Sequence[DeliveryWindow],
+    time_lap_minutes: Sequence[int],
+    last_delivered_at: Sequence[datetime | None],
+    now: datetime,
+) -> list[datetime | None]:
+    """
+    Per plan window.next_after(lap, last, now) as aware UTC datetimes, through
+    next_delivery_us. Plans sharing a window should share the instance (DeliveryWindow.compile
+    and plan_window do); a window without tz reads UTC minutes.
+    """
+    n = len(windows)
+    if n == 0:
+        return []
+    ids = np.fromiter(map(id, windows), np.int64, n)
+    _, first, row = np.unique(ids, return_index=True, return_inverse=True)
+    last_s = np.fromiter((d.timestamp() if d is not None else np.nan for d in last_delivered_at), np.float64, n)
+    last_us = np.where(np.isnan(last_s), NO_TIME, np.round(last_s * 1e6)).astype(np.int64)
+    due = next_delivery_us(
+        [windows[i] for i in first], row, np.asarray(time_lap_minutes, np.int64), last_us, _epoch_us(now)
     )
-    if from_dt.time() >= end_t and end_t.hour < 12:
-        candidate += timedelta(days=1)
-    if candidate <= from_dt:
-        candidate += timedelta(days=1)
-    return candidate
+    never = np.flatnonzero(due == NO_TIME)
+    due[never] = 0
+    # Seconds as floats round-trip to the exact microsecond at today's epoch magnitudes
+    out = list(map(datetime.fromtimestamp, (due / 1e6).tolist(), repeat(timezone.utc, n)))
+    for i in never:
+        out[i] = None
+    return out
+
+
+# Epoch-microsecond arrays use this for "no delivery yet" (input) and "never" (output)
+NO_TIME = np.iinfo(np.int64).min
+
+
+def next_delivery_us(
+    windows: Sequence[DeliveryWindow],
+    row: np.ndarray,
+    time_lap_minutes: np.ndarray,
+    last_delivered_us: np.ndarray,
+    now_us: int,
+) -> np.ndarray:
+    """
+    The array core: plan i uses windows[row[i]]; times are int64 epoch microseconds and
+    NO_TIME marks plans never delivered (input) or never deliverable (output). Starts, local
+    minutes of day and waits are array arithmetic; each window is one row of a
+    (windows x 1440) wait table. UTC offsets are computed once per distinct (zone, minute).
+    The few results that cross a DST change are recomputed by the scalar path, so results
+    equal window.next_after.
+    """
+    n = len(row)
+    if n == 0:
+        return np.empty(0, np.int64)
+    waits = np.array([np.frombuffer(w.waits, dtype=np.uint16) for w in windows])
+    zone_codes: dict[tzinfo, int] = {}
+    window_zone = np.array(
+        [zone_codes.setdefault(w.tz or DEFAULT_TZ, len(zone_codes)) for w in windows], np.intp
+    )
+    zones = list(zone_codes)
+    zone = window_zone[row]
+
+    has_last = last_delivered_us != NO_TIME
+    last = np.where(has_last, last_delivered_us, now_us)
+    start = np.where(has_last, np.maximum(now_us, last + time_lap_minutes * _MINUTE_US), now_us)
+
+    offset = _utc_offsets(zones, zone, start)
+    local = start + offset
+    wait = waits[row, (local // _MINUTE_US) % MINUTES_PER_DAY].astype(np.int64)
+    never = wait == NEVER
+    due_local = np.where(wait == 0, local, (local // _MINUTE_US + wait) * _MINUTE_US)
+    due = due_local - offset
+    # Wall-clock waits that cross a DST change: redo those with the scalar path
+    crossed = np.flatnonzero(~never & (_utc_offsets(zones, zone, due) != offset))
+    due[never] = NO_TIME
+    now = _EPOCH + timedelta(microseconds=now_us)
+    for i in crossed:
+        last_at = _EPOCH + timedelta(microseconds=int(last[i])) if has_last[i] else None
+        at = windows[row[i]].next_after(int(time_lap_minutes[i]), last_at, now)
+        due[i] = NO_TIME if at is None else _epoch_us(at)
+    return due
+
+
+def _hours_key(hours) -> tuple | None:
+    """Hashable stand-in for a {"start", "end"} dict (cheaper than parsing it)."""
+    return (hours.get("start"), hours.get("end")) if isinstance(hours, dict) else None
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MINUTE_US = 60_000_000
+
+
+def _epoch_us(dt: datetime) -> int:
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _utc_offsets(zones: list[tzinfo], zone: np.ndarray, at_us: np.ndarray) -> np.ndarray:
+    """UTC offset (microseconds) of each instant in its zone, one lookup per distinct (zone, minute)."""
+    out = np.zeros(len(at_us), np.int64)
+    for code, tz in enumerate(zones):
+        if tz is DEFAULT_TZ or tz is timezone.utc:
+            continue
+        rows = np.flatnonzero(zone == code)
+        if len(rows) == 0:
+            continue
+        minutes, inverse = np.unique(at_us[rows] // _MINUTE_US, return_inverse=True)
+        offsets = [
+            (_EPOCH + timedelta(minutes=int(m))).astimezone(tz).utcoffset() // timedelta(microseconds=1)
+            for m in minutes
+        ]
+        out[rows] = np.asarray(offsets, np.int64)[inverse]
+    return out
+
+
 def calculate_active_minutes(working_hours: dict | None) -> int:
     """Calculate duration of working hours in minutes."""
-    if not working_hours:
+    span = hours_span(working_hours)
+    if span is None:
         return 1440  # Default to 24 hours if not set
-    start_s = working_hours.get("start")
-    end_s = working_hours.get("end")
-    if not start_s or not end_s:
-        return 1440
-    start_t = _parse_time(start_s)
-    end_t = _parse_time(end_s)
-    
-    start_mins = start_t.hour * 60 + start_t.minute
-    end_mins = end_t.hour * 60 + end_t.minute
-    
+    start_mins, end_mins = span
     if start_mins <= end_mins:
         return end_mins - start_mins
-    else:
-        # Overnight: (midnight - start) + end
-        return (1440 - start_mins) + end_mins
+    # Overnight: (midnight - start) + end
+    return (1440 - start_mins) + end_mins
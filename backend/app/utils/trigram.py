@@ -0,0 +1,53 @@
+from collections import Counter
+from collections.abc import Iterable
+
+from app.utils.amharic import tokenize
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of each normalized word, padded like pg_trgm ("  w" ... "w ")."""
+    grams: set[str] = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Inverted index trigram -> document positions over short strings (topic names).
+    Scores are the share of the query's trigrams found in a document; a document
+    that contains the whole normalized query scores 1.0.
+    """
+
+    def __init__(self, docs: Iterable[str]):
+        self._docs: list[str] = []
+        self._postings: dict[str, list[int]] = {}
+        for pos, doc in enumerate(docs):
+            normalized = " ".join(tokenize(doc))
+            self._docs.append(normalized)
+            for gram in trigrams(normalized):
+                self._postings.setdefault(gram, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def search(self, query: str, threshold: float = 0.5) -> list[tuple[int, float]]:
+        """Document positions scoring >= threshold, best first (ties in document order)."""
+        needle = " ".join(tokenize(query))
+        if not needle:
+            return []
+        grams = trigrams(needle)
+        shared: Counter[int] = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        if len(needle) < 3:
+            # Too short to share a trigram with mid-word occurrences
+            shared.update(pos for pos, doc in enumerate(self._docs) if needle in doc)
+        hits = []
+        for pos, n in shared.items():
+            score = 1.0 if needle in self._docs[pos] else n / len(grams)
+            if score >= threshold:
+                hits.append((pos, score))
+        hits.sort(key=lambda h: (-h[1], h[0]))
+        return hits
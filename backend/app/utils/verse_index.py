@@ -0,0 +1,53 @@
+from array import array
+
+
+class VerseIndex:
+    """
+    Cumulative verse counts for one book (SDS: plan segmentation).
+    prefix[k] = verses in chapters 1..k, so any range count is O(1).
+    """
+
+    __slots__ = ("verse_counts", "prefix")
+
+    def __init__(self, verse_counts: list[int]):
+        self.verse_counts = list(verse_counts)
+        self.prefix = array("L", [0])
+        for n in self.verse_counts:
+            self.prefix.append(self.prefix[-1] + n)
+
+    @property
+    def chapter_count(self) -> int:
+        return len(self.verse_counts)
+
+    @property
+    def total(self) -> int:
+        return self.prefix[-1]
+
+    def offset(self, chapter: int, verse: int) -> int:
+        """0-based position of chapter:verse within the book (no bounds check)."""
+        return self.prefix[chapter - 1] + verse - 1
+
+    def _count_in_chapter(self, chapter: int, low: int, high: int) -> int:
+        if chapter < 1 or chapter > len(self.verse_counts):
+            return 0
+        return max(0, min(high, self.verse_counts[chapter - 1]) - max(low, 1) + 1)
+
+    def count(
+        self,
+        chapter_start: int,
+        verse_start: int,
+        chapter_end: int,
+        verse_end: int,
+    ) -> int:
+        """Existing verses from chapter_start:verse_start to chapter_end:verse_end inclusive."""
+        if chapter_end < chapter_start:
+            return 0
+        if chapter_start == chapter_end:
+            return self._count_in_chapter(chapter_start, verse_start, verse_end)
+        total = self._count_in_chapter(chapter_start, verse_start, self.total)
+        total += self._count_in_chapter(chapter_end, 1, verse_end)
+        lo = max(chapter_start + 1, 1)
+        hi = min(chapter_end - 1, len(self.verse_counts))
+        if hi >= lo:
+            total += self.prefix[hi] - self.prefix[lo - 1]
+        return total
@@ -78,3 +78,222 @@ async def test_random_verse_no_body(client: AsyncClient):
     r = await client.post("/v1/random-verse", json={})
     # 200 with verse or 200 with null if no data
     assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_verses_batch_invalid_range(client: AsyncClient):
+    """Batch fetch rejects a reversed range like the single-range endpoint."""
+    r = await client.post(
+        "/v1/verses/batch",
+        json={"ranges": [{"book": "Genesis", "chapter": 1, "start": 5, "end": 3}]},
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_verses_batch_preserves_order(client: AsyncClient):
+    ranges = [
+        {"book": "NonExistentBookName", "chapter": 1, "start": 1, "end": 2},
+        {"book": "Genesis", "chapter": 1, "start": 1, "end": 1},
+    ]
+    r = await client.post("/v1/verses/batch", json={"ranges": ranges})
+    assert r.status_code == 200
+    data = r.json()
+    assert [d["book"] for d in data] == ["NonExistentBookName", "Genesis"]
+    assert data[0]["verses"] == []
+
+
+@pytest.mark.asyncio
+async def test_ordinal_range_bounds(client: AsyncClient):
+    assert (await client.get("/v1/verses/ordinal/0/5")).status_code == 422
+    assert (await client.get("/v1/verses/ordinal/5/4")).status_code == 400
+    assert (await client.get("/v1/verses/ordinal/1/501")).status_code == 400
+    assert (await client.get("/v1/verses/ordinal/1/500")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_passage_unknown_book_is_empty(client: AsyncClient):
+    r = await client.get(
+        "/v1/verses/passage",
+        params={"start_book": "NonExistentBookName", "start_chapter": 1, "start_verse": 1, "end_chapter": 2, "end_verse": 1},
+    )
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_passage_over_cap(client: AsyncClient):
+    books = (await client.get("/v1/books")).json()
+    if not books:
+        pytest.skip("Bible data not loaded")
+    r = await client.get(
+        "/v1/verses/passage",
+        params={"start_book": books[0], "start_chapter": 1, "start_verse": 1, "end_book": books[-1], "end_chapter": 1, "end_verse": 1},
+    )
+    assert r.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_plan_progress_404(client: AsyncClient):
+    """Progress of an unknown plan is 404, not an empty summary."""
+    r = await client.get("/v1/plan/00000000-0000-0000-0000-000000000000/progress")
+    assert r.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_plan_units_unknown_field(client: AsyncClient):
+    """GET /plan/{id}?fields= rejects fields a unit does not have."""
+    r = await client.get("/v1/plan/00000000-0000-0000-0000-000000000000?fields=unit_index,text")
+    assert r.status_code == 400
+
+
+async def _create_plan(client: AsyncClient, **fields) -> str:
+    """Create a plan over the first book; skips the test when Bible data is not loaded."""
+    books = (await client.get("/v1/books")).json()
+    if not books:
+        pytest.skip("Bible data not loaded")
+    r = await client.post("/v1/plan/create", json={"books": books[:1], **fields})
+    assert r.status_code == 200
+    return r.json()["plan_id"]
+
+
+@pytest.mark.asyncio
+async def test_virtual_next_unit_concurrent(client: AsyncClient):
+    """Concurrent next-unit calls on a virtual plan all get the same stored unit, not a 500."""
+    import asyncio
+
+    plan_id = await _create_plan(client, unit_mode="virtual")
+    responses = await asyncio.gather(*(client.get(f"/v1/plan/{plan_id}/next-unit") for _ in range(5)))
+    assert [r.status_code for r in responses] == [200] * 5
+    assert len({r.json()["unit"]["unit_index"] for r in responses}) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_count_once(client: AsyncClient):
+    """Concurrent PUT /read on one unit mark it once and add it to the daily rollup once."""
+    import asyncio
+
+    plan_id = await _create_plan(client)
+    unit = (await client.get(f"/v1/plan/{plan_id}", params={"limit": 1})).json()["units"][0]
+    responses = await asyncio.gather(*(client.put(f"/v1/unit/{unit['id']}/read") for _ in range(5)))
+    assert [r.status_code for r in responses] == [200] * 5
+    assert sum(r.json()["message"] == "Unit marked as read" for r in responses) == 1
+    history = (await client.get(f"/v1/plan/{plan_id}/progress")).json()["daily_history"]
+    assert sum(day["units_read"] for day in history) == 1
+    assert sum(day["verses_read"] for day in history) == unit["verse_end"] - unit["verse_start"] + 1
+
+
+@pytest.mark.asyncio
+async def test_virtual_plan_layout_fields_are_fixed(client: AsyncClient):
+    """Books/boundaries of a virtual plan define its unit indexes, so they cannot change."""
+    plan_id = await _create_plan(client, unit_mode="virtual")
+    books = (await client.get("/v1/books")).json()
+    r = await client.put(f"/v1/plan/{plan_id}/update", json={"books": books[1:2] or books[:1]})
+    assert r.status_code == 400
+    r = await client.put(f"/v1/plan/{plan_id}/update", json={"boundaries": {"chapter_start": 2}})
+    assert r.status_code == 400
+    r = await client.put(f"/v1/plan/{plan_id}/update", json={"time_lap_minutes": 90})
+    assert r.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_extend_plan_resumes_by_unit_index(client: AsyncClient):
+    """A plan listing a book twice resumes in the second copy, not back at the first."""
+    books = (await client.get("/v1/books")).json()
+    if not books:
+        pytest.skip("Bible data not loaded")
+    r = await client.post(
+        "/v1/plan/create", json={"books": [books[0], books[0]], "max_verses_per_unit": 50}
+    )
+    assert r.status_code == 200
+    plan_id = r.json()["plan_id"]
+    units = (await client.get(f"/v1/plan/{plan_id}")).json()["units"]
+    copy_verses = sum(u["verse_end"] - u["verse_start"] + 1 for u in units) // 2
+    for u in units[: len(units) // 2]:
+        assert (await client.put(f"/v1/unit/{u['id']}/read")).status_code == 200
+
+    assert (await client.put(f"/v1/plan/{plan_id}/extend")).status_code == 200
+    after = (await client.get(f"/v1/plan/{plan_id}")).json()["units"]
+    unread = [u for u in after if u["state"] != "read"]
+    assert sum(u["verse_end"] - u["verse_start"] + 1 for u in unread) == copy_verses
+    assert min(u["unit_index"] for u in unread) == len(units) // 2
+    assert [u for u in after if u["state"] == "read"] == [{**u, "state": "read"} for u in units[: len(units) // 2]]
+
+
+@pytest.mark.asyncio
+async def test_next_unit_is_one_statement(client: AsyncClient):
+    """GET /next-unit on a materialized plan costs one database round trip."""
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    plan_id = await _create_plan(client)
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        r = await client.get(f"/v1/plan/{plan_id}/next-unit")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    assert r.status_code == 200
+    assert r.json()["unit"]["unit_index"] == 0
+    assert len(statements) == 1, statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("unit_mode", ["materialized", "virtual"])
+async def test_bundled_units_are_not_delivered_again(client: AsyncClient, unit_mode: str):
+    plan_id = await _create_plan(client, unit_mode=unit_mode)
+    bundle = (await client.get(f"/v1/plan/{plan_id}/delivery-bundle", params={"count": 3})).json()
+    assert [u["unit_index"] for u in bundle["units"]] == [0, 1, 2]
+    assert bundle["version"] == (await client.get(f"/v1/plan/{plan_id}", params={"limit": 1})).json()["version"]
+    r = await client.get(f"/v1/plan/{plan_id}/next-unit")
+    next_unit = r.json()["unit"]
+    assert next_unit["unit_index"] == 3
+    assert (await client.get(f"/v1/plan/{plan_id}/next-unit")).json()["unit"] == next_unit
+    # Unread bundled units lead the next bundle; unit 3 keeps the id /next-unit gave it
+    again = (await client.get(f"/v1/plan/{plan_id}/delivery-bundle", params={"count": 4})).json()
+    assert [u["unit_index"] for u in again["units"]] == [0, 1, 2, 3]
+    assert again["units"][3]["id"] == next_unit["id"]
+
+
+@pytest.mark.asyncio
+async def test_push_delivers_the_next_unit_each_lap(client: AsyncClient):
+    """Pushed units are marked delivered, so the next lap pushes the following unit."""
+    import uuid
+    from datetime import datetime, timedelta, timezone
+
+    from app.core.database import async_session_factory
+    from app.services.plan_service import PlanService
+
+    plan_id = uuid.UUID(await _create_plan(client, time_lap_minutes=1))
+    now = datetime.now(timezone.utc)
+    pushed = []
+    for lap in range(2):
+        async with async_session_factory() as session:
+            delivered = await PlanService(session).deliver_units([plan_id], now + timedelta(minutes=lap))
+            await session.commit()
+        pushed.append(delivered[plan_id].unit["unit_index"])
+    assert pushed == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_push_claim_honours_the_window(client: AsyncClient):
+    """A due plan inside its quiet hours is not delivered; the claim reports its last delivery."""
+    import uuid
+    from datetime import datetime, timezone
+
+    from app.core.database import async_session_factory
+    from app.services.plan_service import PlanService
+
+    plan_id = uuid.UUID(
+        await _create_plan(client, time_lap_minutes=1, quiet_hours={"start": "00:00", "end": "23:59"})
+    )
+    noon = datetime.now(timezone.utc).replace(hour=12, minute=0)
+    async with async_session_factory() as session:
+        delivered = await PlanService(session).deliver_units([plan_id], noon)
+        await session.commit()
+    assert delivered[plan_id].unit is None and delivered[plan_id].last_delivered_at is None
@@ -0,0 +1,350 @@
+"""Unit tests for in-memory service structures. No DB required."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.bible_corpus import BibleCorpus
+from app.services.bible_service import BibleService
+from app.services.delivery_scheduler import DeliveryScheduler, PlanTiming
+from app.services.topic_catalogue import CatalogueTopic, TopicCatalogue, TopicVerse
+from app.services.push_hub import PushHub
+from app.services.verse_search import VerseSearchIndex
+from app.utils.delivery_window import DeliveryWindow
+
+
+@pytest.fixture
+def corpus() -> BibleCorpus:
+    return BibleCorpus(
+        [
+            ("ኦሪት ዘፍጥረት", [["g1:1", "g1:2", "g1:3"], ["g2:1", "g2:2"]]),
+            ("የዮሐንስ ወንጌል", [["j1:1"], ["j2:1", "j2:2", "j2:3", "j2:4"]]),
+        ]
+    )
+
+
+class TestBibleCorpus:
+    """Architecture: Bible text served from memory after startup."""
+
+    def test_list_books_in_order(self, corpus):
+        assert corpus.list_books() == ["ኦሪት ዘፍጥረት", "የዮሐንስ ወንጌል"]
+        assert len(corpus) == 10
+
+    def test_metadata(self, corpus):
+        meta = corpus.get_metadata("የዮሐንስ ወንጌል")
+        assert meta.chapter_count == 2
+        assert meta.verse_counts == [1, 4]
+        assert corpus.get_metadata("Unknown") is None
+
+    def test_verse_range(self, corpus):
+        verses = corpus.get_verse_range("የዮሐንስ ወንጌል", 2, 2, 3)
+        assert [(v.verse, v.text) for v in verses] == [(2, "j2:2"), (3, "j2:3")]
+
+    def test_verse_range_clamped_to_chapter(self, corpus):
+        verses = corpus.get_verse_range("ኦሪት ዘፍጥረት", 2, 1, 99)
+        assert [v.text for v in verses] == ["g2:1", "g2:2"]
+        assert corpus.get_verse_range("ኦሪት ዘፍጥረት", 3, 1, 5) == []
+        assert corpus.get_verse_range("Unknown", 1, 1, 5) == []
+
+    def test_locate(self, corpus):
+        assert corpus.locate(0) == ("ኦሪት ዘፍጥረት", 1, 1)
+        assert corpus.locate(4) == ("ኦሪት ዘፍጥረት", 2, 2)
+        assert corpus.locate(5) == ("የዮሐንስ ወንጌል", 1, 1)
+        assert corpus.locate(9) == ("የዮሐንስ ወንጌል", 2, 4)
+        assert corpus.verse_text(9) == "j2:4"
+
+    def test_ordinal_round_trip(self, corpus):
+        assert corpus.ordinal("ኦሪት ዘፍጥረት", 1, 1) == 1
+        assert corpus.ordinal("የዮሐንስ ወንጌል", 2, 3) == 9
+        assert corpus.locate(9 - 1) == ("የዮሐንስ ወንጌል", 2, 3)
+        assert corpus.ordinal("የዮሐንስ ወንጌል", 2, 5) is None
+        assert corpus.ordinal("የዮሐንስ ወንጌል", 3, 1) is None
+
+
+@pytest.fixture
+def catalogue() -> TopicCatalogue:
+    names = ["ፍቅር", "ትዕግስት", "ተስፋ", "የእግዚአብሔር ፍቅር", "ሰላም", "እምነት"]
+    topics = [CatalogueTopic(i + 1, n, i) for i, n in enumerate(names)]
+    verses = {1: (TopicVerse("text", "1 ቆሮ 13:4"),)}
+    return TopicCatalogue(list(reversed(topics)), verses)
+
+
+class TestTopicCatalogue:
+    """FR-4.1.1 / FR-4.1.2: theme filter and time-of-day buckets."""
+
+    def test_sorted_by_topic_index(self, catalogue):
+        assert [t.topic_index for t in catalogue.topics] == [0, 1, 2, 3, 4, 5]
+
+    def test_buckets(self, catalogue):
+        assert [t.id for t in catalogue.bucket(catalogue.topics, "morning")] == [1, 2]
+        assert [t.id for t in catalogue.bucket(catalogue.topics, "afternoon")] == [3, 4]
+        assert [t.id for t in catalogue.bucket(catalogue.topics, "evening")] == [5, 6]
+
+    def test_match_themes(self, catalogue):
+        matched = catalogue.match_themes(["ፍቅር"])
+        assert [t.id for t in matched] == [1, 4]
+        assert [t.id for t in catalogue.bucket(matched, "morning")] == [1]
+
+    def test_match_themes_fidel_variants(self, catalogue):
+        # ሠ/ሰ and ሃ/ሀ spellings resolve to the same topics
+        assert [t.id for t in catalogue.match_themes(["ሠላም"])] == [5]
+        assert [t.id for t in catalogue.match_themes(["ተሥፋ"])] == [3]
+        assert [t.id for t in catalogue.match_themes(["የእግዚአብሄር"])] == [4]
+
+    def test_match_themes_fuzzy(self, catalogue):
+        assert [t.id for t in catalogue.match_themes(["ትዕግሥቶች"])] == [2]
+
+    def test_verses(self, catalogue):
+        assert catalogue.verses(1)[0].book_and_verse == "1 ቆሮ 13:4"
+        assert catalogue.verses(2) == ()
+
+
+class TestVerseSearchIndex:
+    @pytest.fixture
+    def index(self) -> VerseSearchIndex:
+        corpus = BibleCorpus(
+            [
+                ("ዮሐንስ", [["በመጀመሪያ ቃል ነበረ", "ቃልም በእግዚአብሔር ዘንድ ነበረ"], ["ብርሃንም በጨለማ ይበራል"]]),
+                ("ሮሜ", [["ፍቅር ግብዝነት የሌለበት ይሁን", "ፍቅር ለባልንጀራው ክፉ አያደርግም ፍቅር"]]),
+            ]
+        )
+        return VerseSearchIndex(corpus)
+
+    def test_exact_word(self, index):
+        assert [i for i, _ in index.search("ፍቅር")] == [3, 4]
+
+    def test_prefix_match_ranks_below_exact(self, index):
+        hits = index.search("ቃል")
+        assert [i for i, _ in hits] == [0, 1]  # ቃል, then ቃልም
+        assert hits[0][1] > hits[1][1]
+
+    def test_fidel_variants(self, index):
+        # ብርሐን and ብርሃን are the same word after fidel folding
+        assert [i for i, _ in index.search("ብርሐን")] == [2]
+
+    def test_more_words_rank_higher(self, index):
+        hits = index.search("ፍቅር ክፉ")
+        assert hits[0][0] == 4
+
+    def test_no_match(self, index):
+        assert index.search("ሰላም") == []
+        assert index.search("።") == []
+
+    def test_top_is_a_prefix_of_search(self, index):
+        ranked = index.search("ቃል ፍቅር")
+        for k in range(len(ranked) + 2):
+            assert index.top("ቃል ፍቅር", k) == (len(ranked), ranked[:k])
+        assert index.top("ሰላም", 5) == (0, [])
+
+    async def test_service_search_needs_the_index(self, index):
+        svc = BibleService(None)
+        svc.search_index = None
+        assert await svc.search("ፍቅር") is None
+        svc.search_index = index
+        result = await svc.search("ፍቅር", page=1, page_size=1)
+        assert result.total == 2 and [(h.book, h.verse) for h in result.hits] == [("ሮሜ", 1)]
+
+
+class TestPushHub:
+    """Push channel: device streams registry and due-unit timers."""
+
+    async def test_publish_reaches_every_stream_of_device(self):
+        hub = PushHub()
+        device, other = uuid.uuid4(), uuid.uuid4()
+        a, b, c = hub.subscribe(device), hub.subscribe(device), hub.subscribe(other)
+        assert (len(hub), hub.devices) == (3, 2)
+        assert hub.publish(device, "unit", {"book": "ዮሐ", "unit_index": 4}) == 2
+        frames = await a.wait(1)
+        assert frames == ['event: unit\ndata: {"book": "ዮሐ", "unit_index": 4}\n\n']
+        assert await b.wait(1) == frames
+        assert await c.wait(0.01) == []
+
+    async def test_wait_wakes_on_push(self):
+        hub = PushHub()
+        device = uuid.uuid4()
+        sub = hub.subscribe(device)
+        waiting = asyncio.ensure_future(sub.wait(5))
+        await asyncio.sleep(0)
+        hub.publish(device, "unit", {"unit_index": 0})
+        assert len(await asyncio.wait_for(waiting, 1)) == 1
+
+    async def test_unsubscribe_drops_device(self):
+        hub = PushHub()
+        device = uuid.uuid4()
+        sub = hub.subscribe(device)
+        hub.unsubscribe(sub)
+        assert not hub.is_connected(device)
+        assert hub.publish(device, "unit", {}) == 0
+
+    async def test_on_connect_fires_for_first_stream_only(self):
+        connected = []
+        hub = PushHub(on_connect=connected.append)
+        device = uuid.uuid4()
+        first = hub.subscribe(device)
+        hub.subscribe(device)
+        assert connected == [device]
+        hub.unsubscribe(first)
+        assert hub.is_connected(device)
+
+    async def test_on_disconnect_fires_for_last_stream_only(self):
+        disconnected = []
+        hub = PushHub(on_disconnect=disconnected.append)
+        device = uuid.uuid4()
+        first, second = hub.subscribe(device), hub.subscribe(device)
+        hub.unsubscribe(first)
+        assert disconnected == []
+        hub.unsubscribe(second)
+        assert disconnected == [device] and hub.connected_devices() == []
+
+
+def _timing(device_id=None, lap=30) -> PlanTiming:
+    return PlanTiming(device_id or uuid.uuid4(), DeliveryWindow.compile(None, None), lap)
+
+
+class TestDeliveryScheduler:
+    """Push delivery: min-heap of active plans keyed on next delivery time."""
+
+    T0 = datetime(2026, 3, 2, 6, 0, tzinfo=timezone.utc)
+
+    def test_pop_due_in_time_order(self):
+        s = DeliveryScheduler()
+        plans = [uuid.uuid4() for _ in range(5)]
+        for minutes, plan_id in zip([30, 10, 50, 20, 40], plans):
+            s.track(plan_id, _timing(), self.T0 + timedelta(minutes=minutes))
+        assert s.next_due() == self.T0 + timedelta(minutes=10)
+        assert s.pop_due(self.T0 + timedelta(minutes=30)) == [plans[1], plans[3], plans[0]]
+        assert s.next_due() == self.T0 + timedelta(minutes=40)
+        assert len(s) == 5  # popped plans stay tracked, unscheduled
+        assert s.due_at(plans[1]) is None
+
+    def test_reschedule_and_untrack_leave_stale_entries_behind(self):
+        s = DeliveryScheduler()
+        a, b = uuid.uuid4(), uuid.uuid4()
+        s.track(a, _timing(), self.T0)
+        s.track(b, _timing(), self.T0 + timedelta(minutes=5))
+        s.reschedule(a, self.T0 + timedelta(minutes=10))
+        assert s.pop_due(self.T0 + timedelta(minutes=5)) == [b]
+        s.untrack(a)
+        assert s.next_due() is None
+        assert s.pop_due(self.T0 + timedelta(days=1)) == []
+
+    def test_reschedule_after_uses_plan_timing(self):
+        s = DeliveryScheduler()
+        plan_id = uuid.uuid4()
+        s.track(plan_id, _timing(lap=45), self.T0)
+        s.pop_due(self.T0)
+        s.reschedule_after(plan_id, self.T0, self.T0)
+        assert s.due_at(plan_id) == self.T0 + timedelta(minutes=45)
+
+    def test_device_index(self):
+        s = DeliveryScheduler()
+        device = uuid.uuid4()
+        a, b = uuid.uuid4(), uuid.uuid4()
+        s.track(a, _timing(device), self.T0)
+        s.track(b, _timing(device), None)
+        assert s.plans_of(device) == {a, b}
+        assert s.device_of(a) == device
+        s.track(a, _timing(), self.T0)  # moved to another device
+        assert s.plans_of(device) == {b}
+        s.untrack_device(device)
+        assert b not in s and a in s and s.plans_of(device) == set()
+
+    def test_rebuild_replaces_everything(self):
+        s = DeliveryScheduler()
+        old = uuid.uuid4()
+        s.track(old, _timing(), self.T0)
+        minutes = {uuid.uuid4(): (i * 7919) % 1000 for i in range(1000)}
+        s.rebuild((p, _timing(), self.T0 + timedelta(minutes=m)) for p, m in minutes.items())
+        assert old not in s and len(s) == 1000
+        due = s.pop_due(self.T0 + timedelta(minutes=999))
+        assert [minutes[p] for p in due] == list(range(1000))
+
+    def test_heap_stays_compact_under_reschedules(self):
+        s = DeliveryScheduler()
+        plan_id = uuid.uuid4()
+        s.track(plan_id, _timing(), self.T0)
+        for m in range(1000):
+            s.reschedule(plan_id, self.T0 + timedelta(minutes=m))
+        assert len(s._heap) <= 2 * len(s) + 64
+        assert s.next_due() == self.T0 + timedelta(minutes=999)
+
+    async def test_run_delivers_due_plans_and_wakes_for_earlier_ones(self):
+        s = DeliveryScheduler()
+        calls = []
+
+        async def deliver(plan_ids, now):
+            calls.append(plan_ids)
+
+        task = asyncio.create_task(s.run(deliver))
+        await asyncio.sleep(0)
+        plan_id = uuid.uuid4()
+        s.track(plan_id, _timing(), datetime.now(timezone.utc) + timedelta(milliseconds=20))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        assert calls == [[plan_id]]
+
+
+class _FakeListenConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = None
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    def is_closed(self):
+        return self.closed
+
+    def terminate(self):
+        self.closed = True
+
+    async def close(self):
+        self.closed = True
+
+    def notify(self, channel, payload):
+        self.listeners[channel](self, 1, channel, payload)
+
+    def drop(self):
+        self.closed = True
+        self.on_terminate(self)
+
+
+class TestListen:
+    """LISTEN survives a failed connect and a dropped connection."""
+
+    async def test_reconnects_and_resyncs(self, monkeypatch):
+        from app.core import database
+
+        conns: list[_FakeListenConnection] = []
+        attempts = []
+
+        async def connect(dsn):
+            attempts.append(dsn)
+            if len(attempts) == 2:
+                raise OSError("connection refused")
+            conn = _FakeListenConnection()
+            conns.append(conn)
+            return conn
+
+        monkeypatch.setattr(database.asyncpg, "connect", connect)
+        monkeypatch.setattr(database, "LISTEN_RETRY_SECONDS", (0,))
+        received: list[str | None] = []
+        task = asyncio.create_task(database.listen("ch", received.append))
+        await asyncio.sleep(0)
+        conns[0].notify("ch", "a")
+        conns[0].drop()
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert len(attempts) == 3 and len(conns) == 2
+        conns[1].notify("ch", "b")
+        assert received == ["a", None, "b"]
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert conns[1].closed
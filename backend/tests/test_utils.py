@@ -1,6 +1,9 @@
 """Unit tests for utils (SRS/SDS traceability). No DB required."""
 
-from datetime import datetime, time
+import random
+from collections import OrderedDict
+from datetime import datetime, time, timedelta, timezone
+from types import SimpleNamespace
 from zoneinfo import ZoneInfo
 
 import pytest
@@ -9,11 +12,32 @@ from app.utils.time_helpers import (
     is_in_quiet_hours,
     get_time_of_day,
     next_valid_delivery_timestamp,
+    next_delivery_times,
+    next_delivery_after,
+    next_delivery_after_batch,
+    next_delivery_after_windows,
 )
 from app.utils.compensation import (
     calculate_missed_working_days,
     adjusted_verses_per_unit,
 )
+from app.utils.verse_index import VerseIndex
+from app.utils.amharic import normalize_fidel, tokenize
+from app.utils.trigram import TrigramIndex
+from app.utils.read_state import ReadState
+from app.utils import delivery_window
+from app.utils.delivery_window import DeliveryWindow, plan_window
+from app.utils.segmentation import UnitLayout, chapter_spans, segment, unit_spans
+
+
+def _hhmm(m: int) -> str:
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+def _in_hours(hours: dict, t: time) -> bool:
+    """Plain time comparison, end minute included, wrapping past midnight (no masks)."""
+    start, end = time.fromisoformat(hours["start"]), time.fromisoformat(hours["end"])
+    return start <= t <= end if start <= end else t >= start or t <= end
 
 
 class TestTimeHelpers:
@@ -48,6 +72,149 @@ class TestTimeHelpers:
         dt = datetime(2026, 2, 22, 20, 0, 0)
         assert get_time_of_day(dt) == "evening"
 
+    def test_next_delivery_outside_quiet_hours_is_now(self):
+        q = {"start": "22:00", "end": "06:00"}
+        now = datetime(2026, 2, 22, 12, 30, tzinfo=ZoneInfo("UTC"))
+        assert next_valid_delivery_timestamp(q, None, now) == now
+
+    def test_next_delivery_skips_quiet_and_waits_for_work(self):
+        q = {"start": "22:00", "end": "06:00"}
+        w = {"start": "08:00", "end": "17:00"}
+        now = datetime(2026, 2, 22, 23, 0, tzinfo=ZoneInfo("UTC"))
+        assert next_valid_delivery_timestamp(q, None, now) == datetime(2026, 2, 23, 6, 1, tzinfo=ZoneInfo("UTC"))
+        assert next_valid_delivery_timestamp(q, w, now) == datetime(2026, 2, 23, 8, 0, tzinfo=ZoneInfo("UTC"))
+
+    def test_next_delivery_times_spacing(self):
+        w = {"start": "08:00", "end": "17:00"}
+        now = datetime(2026, 2, 22, 15, 0, tzinfo=ZoneInfo("UTC"))
+        times = next_delivery_times(None, w, 90, 4, now)
+        assert [t.strftime("%d %H:%M") for t in times] == ["22 15:00", "22 16:30", "23 08:00", "23 09:30"]
+
+    def test_next_delivery_after_waits_time_lap(self):
+        utc = ZoneInfo("UTC")
+        now = datetime(2026, 2, 22, 10, 0, tzinfo=utc)
+        assert next_delivery_after(None, None, 60, None, now) == now
+        last = datetime(2026, 2, 22, 9, 30, tzinfo=utc)
+        assert next_delivery_after(None, None, 60, last, now) == datetime(2026, 2, 22, 10, 30, tzinfo=utc)
+        assert next_delivery_after(None, None, 15, last, now) == now
+
+    def test_next_delivery_times_never_allowed(self):
+        always_quiet = {"start": "00:00", "end": "23:59"}
+        assert next_delivery_times(always_quiet, None, 60, 3, datetime(2026, 2, 22, tzinfo=ZoneInfo("UTC"))) == []
+
+    @pytest.mark.parametrize(
+        "now",
+        [
+            datetime(2026, 2, 22, 21, 45, tzinfo=ZoneInfo("UTC")),
+            datetime(2026, 3, 8, 6, 30, tzinfo=ZoneInfo("UTC")),  # New York springs forward
+            datetime(2026, 4, 4, 15, 0, tzinfo=ZoneInfo("UTC")),  # Lord Howe falls back 30 min
+            datetime(2026, 11, 1, 5, 30, tzinfo=ZoneInfo("UTC")),  # New York falls back
+        ],
+    )
+    def test_next_delivery_after_batch_matches_scalar(self, now):
+        rng = random.Random(now.toordinal())
+        zones = [None, "Africa/Addis_Ababa", "America/New_York", "Asia/Kolkata", "Australia/Lord_Howe"]
+
+        def hours():
+            if rng.random() < 0.3:
+                return None
+            return {"start": _hhmm(rng.randrange(1440)), "end": _hhmm(rng.randrange(1440))}
+
+        n = 400
+        quiet = [hours() for _ in range(n)]
+        working = [hours() for _ in range(n)]
+        laps = [rng.randrange(1, 1441) for _ in range(n)]
+        last = [
+            None if rng.random() < 0.3 else now - timedelta(seconds=rng.randrange(-86400, 86400)) for _ in range(n)
+        ]
+        tzs = [rng.choice(zones) for _ in range(n)]
+        got = next_delivery_after_batch(quiet, working, laps, last, now, tzs)
+        windows = [DeliveryWindow.compile(q, w, tz) for q, w, tz in zip(quiet, working, tzs)]
+        assert next_delivery_after_windows(windows, laps, last, now) == got
+        for i in range(n):
+            if tzs[i] is None:
+                expected = next_delivery_after(quiet[i], working[i], laps[i], last[i], now)
+            else:
+                expected = windows[i].next_after(laps[i], last[i], now)
+            # Compare instants: == between zones is never true for a repeated (fall-back) wall time
+            assert (got[i] and got[i].timestamp()) == (expected and expected.timestamp()), i
+            assert got[i] is None or got[i].tzinfo is timezone.utc
+            assert expected is None or expected >= now
+
+    def test_next_delivery_after_batch_edge_cases(self):
+        now = datetime(2026, 2, 22, 12, 0, tzinfo=ZoneInfo("UTC"))
+        assert next_delivery_after_batch([], [], [], [], now) == []
+        always_quiet = {"start": "00:00", "end": "23:59"}
+        got = next_delivery_after_batch([always_quiet, None], [None, None], [60, 60], [None, now], now)
+        assert got == [None, datetime(2026, 2, 22, 13, 0, tzinfo=ZoneInfo("UTC"))]
+
+
+class TestDeliveryWindow:
+    """FR-4.7.1: quiet/working hours compiled to a minute-of-day mask."""
+
+    def test_overnight_quiet_hours_mask(self):
+        w = DeliveryWindow.compile({"start": "22:00", "end": "06:00"}, None)
+        assert w.allowed_minutes == 1440 - (2 * 60 + 6 * 60 + 1)
+        assert not w.allows_minute(22 * 60) and not w.allows_minute(6 * 60)
+        assert w.allows_minute(6 * 60 + 1) and w.allows_minute(21 * 60 + 59)
+        assert w.wait_minutes(23 * 60) == 7 * 60 + 1
+
+    def test_compiled_once_per_distinct_windows(self):
+        q = {"start": "22:00", "end": "06:00"}
+        assert DeliveryWindow.compile(q, None) is DeliveryWindow.compile(dict(q), None)
+        assert DeliveryWindow.compile(q, None) is not DeliveryWindow.compile(q, None, "Africa/Addis_Ababa")
+
+    def test_matches_minute_by_minute_scan(self):
+        rng = random.Random(7)
+        utc = ZoneInfo("UTC")
+        for _ in range(50):
+            q = {"start": _hhmm(rng.randrange(1440)), "end": _hhmm(rng.randrange(1440))}
+            wk = {"start": _hhmm(rng.randrange(1440)), "end": _hhmm(rng.randrange(1440))}
+            w = DeliveryWindow.compile(q, wk)
+            at = datetime(2026, 2, 22, tzinfo=utc) + timedelta(minutes=rng.randrange(1440))
+            expected = None
+            for k in range(1441):
+                t = (at + timedelta(minutes=k)).time()
+                if not _in_hours(q, t) and _in_hours(wk, t):
+                    expected = at + timedelta(minutes=k)
+                    break
+            assert w.next_allowed(at) == expected
+
+    def test_reads_minutes_in_plan_time_zone(self):
+        w = DeliveryWindow.compile({"start": "22:00", "end": "06:00"}, None, "Africa/Addis_Ababa")
+        at = datetime(2026, 2, 22, 20, 0, tzinfo=ZoneInfo("UTC"))  # 23:00 in Addis Ababa
+        assert not w.allows(at)
+        assert w.next_allowed(at) == datetime(2026, 2, 23, 3, 1, tzinfo=ZoneInfo("UTC"))
+
+    def test_next_allowed_skips_dst_gap(self):
+        ny = ZoneInfo("America/New_York")
+        w = DeliveryWindow.compile({"start": "00:00", "end": "02:29"}, None, ny)
+        # 2026-03-08 02:00-03:00 does not exist in New York
+        got = w.next_allowed(datetime(2026, 3, 8, 1, 30, tzinfo=ny))
+        assert got == datetime(2026, 3, 8, 3, 0, tzinfo=ny)
+        assert w.allows(got)
+
+    def test_plan_window_follows_version(self):
+        plan = SimpleNamespace(
+            id=1, version=1, quiet_hours=None, working_hours={"start": "08:00", "end": "17:00"}, timezone=None
+        )
+        first = plan_window(plan)
+        assert plan_window(plan) is first
+        plan.working_hours, plan.version = None, 2
+        assert plan_window(plan).allowed_minutes == 1440
+
+    def test_plan_window_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(delivery_window, "PLAN_WINDOW_CACHE_SIZE", 3)
+        monkeypatch.setattr(delivery_window, "_plan_windows", OrderedDict())
+        plans = [
+            SimpleNamespace(id=i, version=1, quiet_hours=None, working_hours=None, timezone=None) for i in range(4)
+        ]
+        for plan in plans[:3]:
+            plan_window(plan)
+        plan_window(plans[0])  # most recently used again
+        plan_window(plans[3])
+        assert list(delivery_window._plan_windows) == [2, 0, 3]
+
 
 class TestCompensation:
     """SDS: compensation logic - increase verses per unit, never frequency."""
@@ -81,3 +248,228 @@ class TestCompensation:
         )
         assert vpu >= 1
         assert vpu <= 5
+
+
+class TestVerseIndex:
+    """SDS: verse counting for plan segmentation without per-chapter queries."""
+
+    def test_single_chapter(self):
+        index = VerseIndex([31, 25, 24])
+        assert index.count(2, 3, 2, 10) == 8
+        assert index.count(2, 20, 2, 99) == 6  # clamped to chapter length
+
+    def test_cross_chapter(self):
+        index = VerseIndex([31, 25, 24])
+        assert index.count(1, 1, 3, 24) == 80
+        assert index.count(1, 30, 3, 2) == 2 + 25 + 2
+
+    def test_out_of_range(self):
+        index = VerseIndex([31, 25, 24])
+        assert index.count(3, 1, 2, 1) == 0
+        assert index.count(4, 1, 9, 9) == 0
+        assert index.count(3, 1, 9, 9) == 24
+
+    def test_offset(self):
+        index = VerseIndex([31, 25, 24])
+        assert index.offset(1, 1) == 0
+        assert index.offset(3, 1) == 56
+
+
+class TestAmharic:
+    """FR-4.1.1: theme matching tolerant of fidel spelling variants."""
+
+    def test_normalize_h_family(self):
+        assert len({normalize_fidel(c) for c in "ሀሃኀኃሐሓ"}) == 1
+
+    def test_normalize_keeps_vowel_orders(self):
+        assert normalize_fidel("ሑ") == "ሁ"
+        assert normalize_fidel("ዖ") == "ኦ"
+        assert normalize_fidel("ሁ") != normalize_fidel("ሀ")
+
+    def test_tokenize_ethiopic_punctuation(self):
+        assert tokenize("በመጀመሪያ፡ቃል፡ነበረ።") == ["በመጀመሪያ", "ቃል", "ነበረ"]
+
+
+class TestTrigramIndex:
+    def test_substring_scores_one(self):
+        index = TrigramIndex(["ፍቅር", "ሰላም", "የእግዚአብሔር ፍቅር"])
+        assert index.search("ፍቅር") == [(0, 1.0), (2, 1.0)]
+
+    def test_fuzzy_ranked_below_exact(self):
+        index = TrigramIndex(["ትዕግስት", "ትዕግስትና ጽናት"])
+        hits = index.search("ትዕግስቶች")
+        assert [pos for pos, _ in hits] == [0, 1]
+        assert all(score < 1.0 for _, score in hits)
+
+    def test_short_query(self):
+        index = TrigramIndex(["ፍቅር", "ሰላም"])
+        assert index.search("ቅ") == [(0, 1.0)]
+        assert index.search("") == []
+
+
+def _reference_segment(book_meta, boundaries, verses_per_unit):
+    """The original per-verse PlanService._segment loop, kept as the oracle for segment()."""
+    books = [book for book, _ in book_meta]
+    b = boundaries or {}
+    ch_start = b.get("chapter_start", 1)
+    v_start = b.get("verse_start", 1)
+    ch_end = b.get("chapter_end")
+    v_end = b.get("verse_end")
+    out = []
+    acc = 0
+    unit_book, unit_ch, unit_vs, unit_ve = "", 0, 0, 0
+    for bi, (book, v_counts) in enumerate(book_meta):
+        nch = len(v_counts)
+        if len(books) == 1:
+            start_ch, start_v = ch_start, v_start
+            end_ch = ch_end if ch_end is not None else nch
+            end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
+        elif bi == 0:
+            start_ch, start_v = ch_start, v_start
+            end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
+        elif bi == len(books) - 1:
+            start_ch, start_v = 1, 1
+            end_ch = ch_end if ch_end is not None else nch
+            end_v = v_end if v_end is not None else (v_counts[end_ch - 1] if end_ch <= nch else 1)
+        else:
+            start_ch, start_v = 1, 1
+            end_ch, end_v = nch, v_counts[nch - 1] if v_counts else 1
+        for c in range(start_ch, end_ch + 1):
+            vc = v_counts[c - 1] if c <= len(v_counts) else 0
+            low = start_v if c == start_ch else 1
+            high = end_v if c == end_ch else vc
+            for v in range(low, high + 1):
+                if acc == 0:
+                    unit_book, unit_ch, unit_vs, unit_ve = book, c, v, v
+                    acc = 1
+                elif unit_book == book and unit_ch == c and unit_ve == v - 1 and acc < verses_per_unit:
+                    unit_ve = v
+                    acc += 1
+                else:
+                    out.append((unit_book, unit_ch, unit_vs, unit_ve))
+                    unit_book, unit_ch, unit_vs, unit_ve = book, c, v, v
+                    acc = 1
+                if acc == verses_per_unit:
+                    out.append((unit_book, unit_ch, unit_vs, unit_ve))
+                    acc = 0
+    if acc > 0:
+        out.append((unit_book, unit_ch, unit_vs, unit_ve))
+    return out
+
+
+class TestSegmentation:
+    """SDS: plan segmentation - chunk arithmetic matches the per-verse loop."""
+
+    def test_single_book(self):
+        units = segment([("John", [5, 3])], None, 2)
+        assert units == [
+            ("John", 1, 1, 2), ("John", 1, 3, 4), ("John", 1, 5, 5),
+            ("John", 2, 1, 2), ("John", 2, 3, 3),
+        ]
+
+    def test_boundaries_span_books(self):
+        meta = [("A", [4, 4]), ("B", [3]), ("C", [2, 6])]
+        bounds = {"chapter_start": 2, "verse_start": 3, "chapter_end": 2, "verse_end": 4}
+        assert segment(meta, bounds, 3) == [
+            ("A", 2, 3, 4), ("B", 1, 1, 3), ("C", 1, 1, 2), ("C", 2, 1, 3), ("C", 2, 4, 4),
+        ]
+
+    def test_matches_reference_on_random_plans(self):
+        rng = random.Random(12)
+        names = ["A", "B", "C"]
+        for _ in range(3000):
+            book_meta = [
+                (rng.choice(names), [rng.randint(1, 12) for _ in range(rng.randint(1, 6))])
+                for _ in range(rng.randint(1, 4))
+            ]
+            boundaries = None
+            if rng.random() < 0.7:
+                boundaries = {
+                    "chapter_start": rng.randint(1, 7),
+                    "verse_start": rng.randint(1, 14),
+                    "chapter_end": rng.choice([None, rng.randint(1, 7)]),
+                    "verse_end": rng.choice([None, rng.randint(1, 14)]),
+                }
+            vpu = rng.randint(1, 8)
+            assert segment(book_meta, boundaries, vpu) == _reference_segment(book_meta, boundaries, vpu)
+
+
+class TestUnitLayout:
+    """Virtual plans: unit i is computed from chapter-span prefix sums."""
+
+    META = [("A", [4, 7]), ("B", [3, 5, 2])]
+
+    def test_unit_matches_segment(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            meta = [(b, [rng.randint(1, 9) for _ in range(rng.randint(1, 5))]) for b in "AB"]
+            vpu = rng.randint(1, 6)
+            units = segment(meta, None, vpu)
+            layout = UnitLayout(chapter_spans(meta, None), vpu)
+            assert len(layout) == len(units)
+            assert [layout.unit(i) for i in range(len(layout))] == units
+            assert layout.total_verses == sum(ve - vs + 1 for _, _, vs, ve in units)
+            i = rng.randrange(len(units))
+            assert layout.verses_before(i) == sum(ve - vs + 1 for _, _, vs, ve in units[:i])
+
+    def test_out_of_range(self):
+        layout = UnitLayout(chapter_spans(self.META, None), 3)
+        with pytest.raises(IndexError):
+            layout.unit(len(layout))
+        with pytest.raises(IndexError):
+            layout.unit(-1)
+
+    def test_unit_spans(self):
+        spans = chapter_spans(self.META, None)
+        assert unit_spans(segment(self.META, None, 2)) == spans
+        # A book listed twice keeps both runs, in order
+        twice = segment(self.META + self.META, None, 3)
+        assert unit_spans(twice) == spans + spans
+        # A gap (a read unit left out) splits the chapter run
+        assert unit_spans([("A", 2, 1, 2), ("A", 2, 5, 7)]) == [("A", 2, 1, 2), ("A", 2, 5, 7)]
+
+    def test_resume_and_origin_round_trip(self):
+        spans = chapter_spans(self.META, None)
+        layout = UnitLayout(spans, 3)
+        assert layout.origin() is None
+        # Unit 3 is A 2:4-6; the rest is re-cut two verses at a time from A 2:4
+        resumed = layout.resume(3, 2)
+        assert resumed.first_index == 3
+        assert list(resumed)[:3] == [("A", 2, 4, 5), ("A", 2, 6, 7), ("B", 1, 1, 2)]
+        assert resumed.total_verses == layout.total_verses - layout.verses_before(3)
+        rebuilt = UnitLayout.from_origin(spans, 2, resumed.origin())
+        assert [rebuilt.unit(i) for i in range(3, rebuilt.end)] == list(resumed)
+
+
+class TestReadState:
+    """Plan read/delivered bitmaps with verse-weight prefix sums."""
+
+    def test_counts_match_rows(self):
+        rng = random.Random(8)
+        for _ in range(200):
+            rows = [
+                (i, rng.randint(1, 5), rng.choice(["pending", "delivered", "read"]))
+                for i in range(rng.randint(0, 90))
+            ]
+            rng.shuffle(rows)
+            state = ReadState.build(rows)
+            read = [r for r in rows if r[2] == "read"]
+            assert state.units == len(rows)
+            assert state.total_verses == sum(r[1] for r in rows)
+            assert state.completed_units == len(read)
+            assert state.completed_verses == sum(r[1] for r in read)
+            assert state.remaining_verses == state.total_verses - state.completed_verses
+            assert state.next_pending() == min((r[0] for r in rows if r[2] == "pending"), default=None)
+            assert state.first_delivered() == min((r[0] for r in rows if r[2] == "delivered"), default=None)
+
+    def test_column_round_trip(self):
+        state = ReadState.build([(0, 3, "read"), (1, 2, "pending"), (9, 4, "delivered")])
+        columns = state.to_columns()
+        # Postgres set_bit numbering: bit 9 is bit 1 of the second byte
+        assert columns["read_bitmap"] == b"\x01\x00"
+        assert columns["delivered_bitmap"] == b"\x00\x02"
+        restored = ReadState.from_columns(**columns)
+        assert restored.units == 10
+        assert restored.total_verses == 9
+        assert restored.next_pending() == 1
+        assert restored.first_delivered() == 9
@@ -2,18 +2,48 @@ import { setupAlarms } from './services/background/alarmManager';
 import { createNotification, markUnitAsRead } from './services/background/notificationManager';
 import { checkDeliveryWindow } from './services/background/environmentDetector';
 import { syncOfflineActions } from './services/background/syncManager';
-import { getLocal } from './services/storage/local';
+import { getLocal, removeLocal, setLocal } from './services/storage/local';
 import { getSync } from './services/storage/sync';
 import { getOrCreateDeviceId } from './utils/deviceId';
-import { getNextUnit } from './services/api/plans';
+import { getDeliveryBundle, getPlanVersion } from './services/api/plans';
 import { UserSettings } from './types/storage';
 import { Plan } from './types/plan';
-import { Unit } from './types/api';
+import { DeliveryBundle, ScheduledUnit, Unit } from './types/api';
 
 console.log('Service Worker Loaded');
 
 const ACTIVE_PLAN_KEY = 'activePlan';
 const USER_SETTINGS_KEY = 'userSettings';
+const DELIVERY_BUNDLE_KEY = 'deliveryBundle';
+
+const fetchBundle = async (planId: string): Promise<DeliveryBundle> => {
+  const fresh = await getDeliveryBundle(planId);
+  await setLocal(DELIVERY_BUNDLE_KEY, fresh);
+  return fresh;
+};
+
+// Units not yet shown, from the local bundle; the server is contacted only when it runs out.
+const loadBundle = async (planId: string): Promise<{ bundle: DeliveryBundle; stored: boolean }> => {
+  const bundle: DeliveryBundle | null = await getLocal(DELIVERY_BUNDLE_KEY);
+  if (bundle && bundle.plan_id === planId && bundle.units.length > 0) {
+    return { bundle, stored: true };
+  }
+  return { bundle: await fetchBundle(planId), stored: false };
+};
+
+// A stored bundle is stale once the plan was updated or extended (version bumped).
+// Offline, the stored units are still shown.
+const isCurrent = async (bundle: DeliveryBundle): Promise<boolean> => {
+  try {
+    return (await getPlanVersion(bundle.plan_id)) === bundle.version;
+  } catch (error) {
+    console.warn('Could not check plan version; using the stored bundle.', error);
+    return true;
+  }
+};
+
+const dueUnits = (bundle: DeliveryBundle, now: number): ScheduledUnit[] =>
+  bundle.units.filter((u) => new Date(u.deliver_at).getTime() <= now);
 
 // Initialize on install/startup
 chrome.runtime.onInstalled.addListener(async () => {
@@ -58,20 +88,34 @@ chrome.alarms.onAlarm.addListener(async (alarm) => {
     return;
   }
 
-  console.log('Delivery window open. Fetching next unit for plan ID:', currentPlan.id);
+  console.log('Delivery window open. Checking delivery bundle for plan ID:', currentPlan.id);
 
   try {
-    const response = await getNextUnit(currentPlan.id);
-    console.log('Response from getNextUnit:', response);
-
-    if (response && response.unit) {
-      console.log('Units found! Creating notification for:', response.unit.book, response.unit.chapter);
-      createNotification(response.unit);
-    } else {
-      console.log('No pending units found for this plan:', response?.message || 'Empty response');
+    const loaded = await loadBundle(currentPlan.id);
+    let bundle = loaded.bundle;
+    const now = Date.now();
+    let due = dueUnits(bundle, now);
+    if (due.length > 0 && loaded.stored && !(await isCurrent(bundle))) {
+      console.log('Stored bundle is from an older plan version; fetching a fresh one.');
+      bundle = await fetchBundle(currentPlan.id);
+      due = dueUnits(bundle, now);
+    }
+    if (bundle.units.length === 0) {
+      console.log('No pending units found for this plan.');
+      return;
     }
+    if (due.length === 0) {
+      console.log('Next unit scheduled for:', bundle.units[0].deliver_at);
+      return;
+    }
+
+    // One unit per alarm, in reading order; units still due show on the following alarms
+    const unit = due[0];
+    console.log('Unit due! Creating notification for:', unit.book, unit.chapter);
+    createNotification(unit);
+    await setLocal(DELIVERY_BUNDLE_KEY, { ...bundle, units: bundle.units.slice(1) });
   } catch (error) {
-    console.error('API Error while fetching next unit:', error);
+    console.error('API Error while fetching delivery bundle:', error);
   }
 });
 
@@ -133,6 +177,8 @@ chrome.runtime.onMessage.addListener((request, _sender, sendResponse) => {
   if (request.action === 'refreshPlan') {
 
     console.log('Received refreshPlan message from popup.');
+    // Plan may have changed (new version); the next alarm fetches a fresh bundle
+    removeLocal(DELIVERY_BUNDLE_KEY);
 
     sendResponse({ status: 'Plan refresh initiated in background.' });
   }
@@ -160,6 +160,7 @@ const CreatePlan = () => {
         time_lap_minutes: timeLapMinutes,
         quiet_hours: quietHours,
         working_hours: workingHours,
+        timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
       };
       if (selectedBooks.length > 0) {
         planData.boundaries = {
@@ -189,6 +190,7 @@ const CreatePlan = () => {
         time_lap_minutes: timeLapMinutes,
         quiet_hours: settings.quietHours,
         working_hours: settings.workingHours,
+        timezone: Intl.DateTimeFormat().resolvedOptions().timeZone,
       };
       const newPlan = await createPlan(planData);
       if (newPlan) {
@@ -1,5 +1,5 @@
 import apiClient from './client';
-import { CreatePlanRequest, CreatePlanResponse, PlanProgress } from '../../types/api';
+import { CreatePlanRequest, CreatePlanResponse, DeliveryBundle, PlanProgress } from '../../types/api';
 import { getOrCreateDeviceId } from '../../utils/deviceId';
 
 export const createPlan = async (planData: CreatePlanRequest): Promise<CreatePlanResponse> => {
@@ -13,6 +13,18 @@ export const getNextUnit = async (planId: string): Promise<any> => { // TODO: De
   return response.data;
 };
 
+export const getDeliveryBundle = async (planId: string, count: number = 10): Promise<DeliveryBundle> => {
+  const tz = Intl.DateTimeFormat().resolvedOptions().timeZone;
+  const response = await apiClient.get(`/plan/${planId}/delivery-bundle`, { params: { count, tz } });
+  return response.data;
+};
+
+// Current plan version, from a one-unit page of the plan listing
+export const getPlanVersion = async (planId: string): Promise<number> => {
+  const response = await apiClient.get(`/plan/${planId}`, { params: { limit: 1, fields: 'unit_index' } });
+  return response.data.version;
+};
+
 export const getPlanProgress = async (planId: string): Promise<PlanProgress> => {
   const response = await apiClient.get(`/plan/${planId}/progress`);
   return response.data;
@@ -12,6 +12,7 @@ export interface CreatePlanRequest {
   time_lap_minutes?: number;
   quiet_hours?: { start: string; end: string };
   working_hours?: { start: string; end: string };
+  timezone?: string;
   boundaries?: {
     chapter_start: number;
     verse_start: number;
@@ -35,6 +36,17 @@ export interface Unit {
   state: 'pending' | 'read';
 }
 
+export interface ScheduledUnit extends Unit {
+  deliver_at: string; // ISO timestamp
+}
+
+export interface DeliveryBundle {
+  plan_id: string;
+  version: number;
+  units: ScheduledUnit[];
+  refresh_at: string | null;
+}
+
 export interface PlanProgress {
   completed_units: number;
   total_units: number;
@@ -0,0 +1,80 @@
+"""
+Rebuild plan_daily_stats from reading_units.read_at.
+
+mark_unit_read keeps the rollup current; run this once after migrating a
+database with existing reads, or to repair the table.
+
+    python scripts/backfill_plan_daily_stats.py
+"""
+from pathlib import Path
+import sys
+import logging
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / ".env")
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+def _sync_db_url(url: str) -> str:
+    if "+asyncpg" in url:
+        return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    return url
+
+
+def backfill_plan_daily_stats(session: Session) -> int:
+    """Replace every plan's daily rows with totals of its read units by UTC day. Returns rows written."""
+    session.execute(text("DELETE FROM plan_daily_stats"))
+    result = session.execute(
+        text(
+            """
+            INSERT INTO plan_daily_stats (plan_id, date, verses_read, units_read)
+            SELECT plan_id, date(timezone('UTC', read_at)), sum(verse_end - verse_start + 1), count(*)
+            FROM reading_units
+            WHERE state = 'read' AND read_at IS NOT NULL
+            GROUP BY plan_id, date(timezone('UTC', read_at))
+            """
+        )
+    )
+    session.flush()
+    logger.info(f"Daily stats written: {result.rowcount} plan-days")
+    return result.rowcount
+
+
+def main() -> None:
+    sync_url = _sync_db_url(settings.database_url)
+    logger.info(f"Connecting to database: {sync_url.split('@')[-1] if '@' in sync_url else 'local'}")
+    engine = create_engine(sync_url)
+
+    try:
+        with Session(engine) as session:
+            # Serialize with mark_unit_read so no read lands between DELETE and INSERT
+            session.execute(text("LOCK TABLE plan_daily_stats IN EXCLUSIVE MODE"))
+            backfill_plan_daily_stats(session)
+            session.commit()
+        logger.info("✓ Backfill committed")
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Time and peak Python memory of plan creation: ORM objects vs plain-row INSERTs.
+
+Creates materialized one-verse-per-unit plans for one book, the four gospels and
+the whole canon, once through PlanService.create_plan (batched insert of dicts)
+and once with the units added as ReadingUnit objects and flushed, the way plans
+were created before. Every run is rolled back. Needs a migrated database with
+Bible data loaded (DATABASE_URL / .env).
+
+    python scripts/bench_create_plan.py --repeat 3
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / ".env")
+
+from sqlalchemy import func, select
+
+from app.core.database import async_session_factory, engine
+from app.models import ReadingUnit
+from app.schemas.plan import PlanCreate
+from app.services.bible_service import BibleService
+from app.services.plan_service import PlanService
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Book titles as loaded into bible_books (the extension's AMHARIC_BOOK_NAMES); the
+# Ethiopian canon numbers books differently from the 66-book ordering.
+GOSPELS = ["ወንጌል ዘማቴዎስ", "ወንጌል ዘማርቆስ", "ወንጌል ዘሉቃስ", "ወንጌል ዘዮሐንስ"]
+
+
+class OrmPlanService(PlanService):
+    """create_plan with the pre-change unit insert: one ORM object per unit."""
+
+    async def _insert_units(self, plan_id, units, first_index=0) -> None:
+        self.db.add_all(
+            ReadingUnit(
+                plan_id=plan_id,
+                book=book,
+                chapter=chapter,
+                verse_start=vs,
+                verse_end=ve,
+                unit_index=first_index + i,
+                state="pending",
+            )
+            for i, (book, chapter, vs, ve) in enumerate(units)
+        )
+        await self.db.flush()
+
+
+async def create_once(service_cls, books: list[str]) -> tuple[float, float, int]:
+    """(seconds, peak MiB, units) for one create_plan, rolled back."""
+    payload = PlanCreate(books=books, max_verses_per_unit=1, time_lap_minutes=1)
+    async with async_session_factory() as session:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        plan = await service_cls(session).create_plan(None, payload)
+        await session.flush()
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        units = (
+            await session.execute(select(func.count(ReadingUnit.id)).where(ReadingUnit.plan_id == plan.id))
+        ).scalar_one()
+        await session.rollback()
+    return elapsed, peak, units
+
+
+async def main(repeat: int) -> None:
+    async with async_session_factory() as session:
+        books = await BibleService(session).list_books()
+    if not books:
+        logger.error("No Bible data loaded; run scripts/migrate_bible_data.py first")
+        return
+    gospels = [b for b in GOSPELS if b in books]
+    if len(gospels) != len(GOSPELS):
+        logger.warning(f"Gospel titles not found: {sorted(set(GOSPELS) - set(gospels))}")
+    cases = {"one book": books[:1], "four gospels": gospels, "whole canon": books}
+    for name, selection in cases.items():
+        if not selection:
+            continue
+        for label, service_cls in (("orm", OrmPlanService), ("bulk", PlanService)):
+            await create_once(service_cls, selection)  # warm up
+            runs = [await create_once(service_cls, selection) for _ in range(repeat)]
+            logger.info(
+                f"{name:<13} {label:<5} units={runs[0][2]:>6} "
+                f"time={statistics.median(r[0] for r in runs):6.2f}s peak={max(r[1] for r in runs):6.1f}MiB"
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.repeat))
@@ -0,0 +1,87 @@
+"""
+Time of PlanService.extend_plan on a large materialized plan.
+
+Creates a one-verse-per-unit plan over the given number of books (the whole canon
+by default), marks the first half of its units read, then times extend_plan.
+Everything is rolled back. Needs a migrated database with Bible data loaded
+(DATABASE_URL / .env).
+
+    python scripts/bench_extend_plan.py --books 66 --repeat 3
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / ".env")
+
+from sqlalchemy import func, select, update
+
+from app.core.database import async_session_factory, engine
+from app.models import ReadingUnit
+from app.schemas.plan import PlanCreate
+from app.services.bible_service import BibleService
+from app.services.plan_service import PlanService
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+async def extend_once(books: list[str]) -> tuple[float, int]:
+    """(seconds for extend_plan, units re-cut), rolled back."""
+    async with async_session_factory() as session:
+        svc = PlanService(session)
+        plan = await svc.create_plan(None, PlanCreate(books=books, max_verses_per_unit=1))
+        units = (
+            await session.execute(select(func.count(ReadingUnit.id)).where(ReadingUnit.plan_id == plan.id))
+        ).scalar_one()
+        await session.execute(
+            update(ReadingUnit)
+            .where(ReadingUnit.plan_id == plan.id, ReadingUnit.unit_index < units // 2)
+            .values(state="read")
+        )
+        await svc._persist_read_state(plan)
+        t0 = time.perf_counter()
+        await svc.extend_plan(plan.id, additional_days=30)
+        elapsed = time.perf_counter() - t0
+        await session.rollback()
+    return elapsed, units - units // 2
+
+
+async def main(book_count: int, repeat: int) -> None:
+    async with async_session_factory() as session:
+        books = (await BibleService(session).list_books())[:book_count]
+    if not books:
+        logger.error("No Bible data loaded; run scripts/migrate_bible_data.py first")
+        return
+    await extend_once(books)  # warm up
+    runs = [await extend_once(books) for _ in range(repeat)]
+    logger.info(
+        f"{len(books)} books, {runs[0][1]} unread units re-cut: "
+        f"median={statistics.median(r[0] for r in runs) * 1000:.0f}ms max={max(r[0] for r in runs) * 1000:.0f}ms"
+    )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--books", type=int, default=66)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.books, args.repeat))
@@ -0,0 +1,96 @@
+"""
+Latency and response size of GET /v1/plan/{id} unit listings.
+
+Creates a whole-canon one-verse-per-unit plan in each unit mode through the API
+(in-process, no server needed), then times full listings, pages and ?fields=
+projections. The plans' devices are deleted afterwards. Needs a migrated database
+with Bible data loaded (DATABASE_URL / .env).
+
+    python scripts/bench_plan_units.py --runs 10
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / ".env")
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from app.core.database import async_session_factory, engine
+from app.main import app
+from app.models import Device
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+LISTINGS = {
+    "all units": {},
+    "page of 100": {"limit": 100},
+    "page far in": {"after": 20000, "limit": 100},
+    "index+state": {"fields": "unit_index,state"},
+    "pending page": {"state": "pending", "limit": 100},
+}
+
+
+async def time_listing(client: AsyncClient, plan_id: str, params: dict, runs: int) -> tuple[float, int]:
+    """(median ms, response bytes)."""
+    times = []
+    size = 0
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        r = await client.get(f"/v1/plan/{plan_id}", params=params)
+        times.append((time.perf_counter() - t0) * 1000)
+        r.raise_for_status()
+        size = len(r.content)
+    return statistics.median(times), size
+
+
+async def main(runs: int) -> None:
+    devices = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        books = (await client.get("/v1/books")).json()
+        if not books:
+            logger.error("No Bible data loaded; run scripts/migrate_bible_data.py first")
+            return
+        try:
+            for mode in ("materialized", "virtual"):
+                r = await client.post(
+                    "/v1/plan/create",
+                    json={"books": books, "max_verses_per_unit": 1, "unit_mode": mode},
+                )
+                r.raise_for_status()
+                plan_id = r.json()["plan_id"]
+                devices.append((await client.get(f"/v1/plan/{plan_id}", params={"limit": 1})).json()["device_id"])
+                for name, params in LISTINGS.items():
+                    ms, size = await time_listing(client, plan_id, params, runs)
+                    logger.info(f"{mode:<12} {name:<13} median={ms:8.1f}ms size={size / 1024:9.1f}KiB")
+        finally:
+            async with async_session_factory() as session:
+                await session.execute(delete(Device).where(Device.id.in_(devices)))
+                await session.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
@@ -0,0 +1,86 @@
+"""
+Memory per idle push connection and publish cost on one worker.
+
+Opens N event streams on a PushHub, each a task iterating the same generator loop
+as GET /v1/push/{device_id}/events (the per-request task the ASGI server would
+run), lets them go idle, and reports the tracemalloc growth per connection. Then
+publishes one unit event to every device. No database needed.
+
+    python scripts/bench_push_connections.py --connections 10000
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+import uuid
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from app.services.push_hub import PushHub
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 3600  # idle for the whole run
+
+
+async def consume(hub: PushHub, device_id: uuid.UUID, received: list[int]) -> None:
+    """The endpoint's stream() loop, with the frames counted instead of written to a socket."""
+    sub = hub.subscribe(device_id)
+    try:
+        while True:
+            frames = await sub.wait(HEARTBEAT_SECONDS)
+            received[0] += len(frames)
+    finally:
+        hub.unsubscribe(sub)
+
+
+async def main(connections: int) -> None:
+    hub = PushHub()
+    devices = [uuid.uuid4() for _ in range(connections)]
+    received = [0]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [asyncio.create_task(consume(hub, d, received)) for d in devices]
+    await asyncio.sleep(0.1)  # every stream reaches its idle wait
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    logger.info(
+        f"{len(hub)} idle streams: {(after - before) / 2**20:.1f} MiB, "
+        f"{(after - before) / connections:.0f} bytes per connection"
+    )
+
+    unit = {"plan_id": str(uuid.uuid4()), "unit_index": 0, "book": "ዮሐንስ", "chapter": 3, "text": "ቃል " * 40}
+    t0 = time.perf_counter()
+    for device_id in devices:
+        hub.publish(device_id, "unit", unit)
+    while received[0] < connections:
+        await asyncio.sleep(0)
+    logger.info(f"published to {connections} devices and drained in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connections", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(main(args.connections))
@@ -0,0 +1,102 @@
+"""
+Latency of the random-verse fallback under concurrent load (p50/p95/p99).
+
+Compares the old COUNT + OFFSET query with BibleService._random_verse_from_db
+(primary-key probe without the corpus, bisect over the corpus with it).
+Needs a migrated database with bible_verses loaded (DATABASE_URL / .env).
+
+    python scripts/bench_random_verse.py --requests 2000 --concurrency 50
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / ".env")
+
+from sqlalchemy import func, select
+
+from app.core.database import async_session_factory, engine
+from app.models import BibleBook, BibleVerse
+from app.services.bible_corpus import load_corpus, set_corpus
+from app.services.bible_service import BibleService
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+
+async def offset_scan(session) -> None:
+    """The pre-change query: count every verse, then skip a random number of rows."""
+    n = (await session.execute(select(func.count(BibleVerse.id)))).scalar_one()
+    await session.execute(
+        select(BibleVerse, BibleBook)
+        .join(BibleBook, BibleVerse.book_id == BibleBook.id)
+        .offset(random.randint(0, n - 1))
+        .limit(1)
+    )
+
+
+async def service_fallback(session) -> None:
+    await BibleService(session)._random_verse_from_db()
+
+
+async def run(call, requests: int, concurrency: int) -> list[float]:
+    """Wall time (ms) of each call, at most `concurrency` in flight, each in its own session."""
+    gate = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one() -> None:
+        async with gate:
+            async with async_session_factory() as session:
+                t0 = time.perf_counter()
+                await call(session)
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(name: str, latencies: list[float]) -> None:
+    q = statistics.quantiles(latencies, n=100)
+    logger.info(
+        f"{name:<16} n={len(latencies)} p50={q[49]:.2f}ms p95={q[94]:.2f}ms p99={q[98]:.2f}ms max={max(latencies):.2f}ms"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    modes = [("offset (before)", offset_scan), ("pk probe", service_fallback)]
+    set_corpus(None)
+    for name, call in modes:
+        await run(call, min(requests, 50), concurrency)  # warm the pool and caches
+        report(name, await run(call, requests, concurrency))
+
+    async with async_session_factory() as session:
+        corpus = await load_corpus(session)
+    if corpus:
+        report("corpus", await run(service_fallback, requests, concurrency))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
@@ -0,0 +1,122 @@
+"""
+Latency of one /v1/search page against the in-memory VerseSearchIndex.
+
+Uses the loaded Bible when DATABASE_URL points at a database with verses,
+otherwise (or with --synthetic) a seeded Bible-sized corpus: 66 books,
+~31,000 verses, words drawn from a Zipf distribution so the top word occurs
+in roughly a third of all verses, like the commonest Amharic words.
+
+    python scripts/bench_search.py --synthetic --runs 50
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from dotenv import load_dotenv
+load_dotenv(PROJECT_ROOT / ".env")
+
+from app.services.bible_corpus import BibleCorpus
+from app.services.verse_search import VerseSearchIndex
+from app.utils.amharic import tokenize
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+FIDEL = [chr(c) for c in range(0x1200, 0x1358)]
+PAGE_SIZE = 20
+
+
+def synthetic_corpus(seed: int) -> BibleCorpus:
+    rng = random.Random(seed)
+    vocab = list(dict.fromkeys(
+        "".join(rng.choice(FIDEL) for _ in range(rng.randint(2, 7))) for _ in range(25000)
+    ))
+    weights = [1 / (rank + 1) ** 0.8 for rank in range(len(vocab))]
+    books = []
+    for b in range(66):
+        chapters = [
+            [" ".join(rng.choices(vocab, weights, k=rng.randint(8, 22))) for _ in range(rng.randint(12, 36))]
+            for _ in range(rng.randint(10, 30))
+        ]
+        books.append((f"book {b + 1}", chapters))
+    return BibleCorpus(books)
+
+
+async def database_corpus() -> BibleCorpus | None:
+    from app.core.database import async_session_factory, engine
+
+    try:
+        async with async_session_factory() as session:
+            corpus = await BibleCorpus.load(session)
+    except Exception as e:
+        logger.info(f"No database corpus ({e}); using the synthetic one")
+        return None
+    finally:
+        await engine.dispose()
+    return corpus if len(corpus) else None
+
+
+def page(index: VerseSearchIndex, query: str) -> None:
+    """What BibleService.search does with the index for page 1."""
+    total, hits = index.top(query, PAGE_SIZE)
+    for i, _ in hits:
+        index.corpus.locate(i)
+        index.corpus.verse_text(i)
+
+
+def main(runs: int, synthetic: bool, seed: int) -> None:
+    corpus = None if synthetic else asyncio.run(database_corpus())
+    corpus = corpus or synthetic_corpus(seed)
+    t0 = time.perf_counter()
+    index = VerseSearchIndex(corpus)
+    logger.info(f"{len(corpus)} verses indexed in {time.perf_counter() - t0:.1f}s")
+
+    frequency = {}
+    for i in range(len(corpus)):
+        for word in set(tokenize(corpus.verse_text(i))):
+            frequency[word] = frequency.get(word, 0) + 1
+    by_frequency = sorted(frequency, key=frequency.get, reverse=True)
+    queries = {
+        "most frequent word": by_frequency[0],
+        "10th most frequent": by_frequency[9],
+        "mid-frequency word": by_frequency[len(by_frequency) // 100],
+        "two common words": f"{by_frequency[0]} {by_frequency[1]}",
+        "2-letter prefix": by_frequency[0][:2],
+    }
+    for name, query in queries.items():
+        page(index, query)  # warm up
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            page(index, query)
+            times.append((time.perf_counter() - t0) * 1000)
+        matches = index.top(query, 0)[0]
+        logger.info(
+            f"{name:<20} {matches:>6} hits  median={statistics.median(times):6.2f}ms  max={max(times):6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--synthetic", action="store_true", help="skip the database corpus")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args.runs, args.synthetic, args.seed)
@@ -0,0 +1,79 @@
+"""
+Per-theme lookup cost of random-mode theme matching.
+
+Compares the old case-insensitive substring scan over every topic name with
+TopicCatalogue.match_themes (fidel-normalized trigram index) on synthetic
+Ethiopic topic names. No database needed.
+
+    python scripts/bench_theme_match.py --topics 2000 --themes 200
+"""
+from pathlib import Path
+import argparse
+import logging
+import random
+import sys
+import time
+
+# Project root = parent of scripts/
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BACKEND = PROJECT_ROOT / "backend"
+
+# Ensure backend is on path for app imports
+if str(BACKEND) not in sys.path:
+    sys.path.insert(0, str(BACKEND))
+
+from app.services.topic_catalogue import CatalogueTopic, TopicCatalogue
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+# Ethiopic syllables U+1200..U+1357
+FIDEL = [chr(c) for c in range(0x1200, 0x1358)]
+
+
+def word(rng: random.Random) -> str:
+    return "".join(rng.choice(FIDEL) for _ in range(rng.randint(2, 6)))
+
+
+def topic_names(n: int, rng: random.Random) -> list[str]:
+    return [" ".join(word(rng) for _ in range(rng.randint(1, 4))) for _ in range(n)]
+
+
+def linear_match(names: list[str], themes: list[str]) -> list[int]:
+    """The pre-index filter: every name scanned for every theme."""
+    lowered = [t.lower() for t in themes]
+    return [i for i, name in enumerate(names) if any(t in name.lower() for t in lowered)]
+
+
+def per_call_us(fn, calls: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls * 1e6
+
+
+def main(topics: int, themes: int, seed: int) -> None:
+    rng = random.Random(seed)
+    names = topic_names(topics, rng)
+    catalogue = TopicCatalogue([CatalogueTopic(i, name, i) for i, name in enumerate(names)], {})
+    # Half the themes are words of existing names, half are fresh words that mostly miss
+    queries = [rng.choice(rng.choice(names).split()) if i % 2 else word(rng) for i in range(themes)]
+
+    linear = sum(per_call_us(lambda q=q: linear_match(names, [q]), 20) for q in queries) / themes
+    indexed = sum(per_call_us(lambda q=q: catalogue.match_themes([q]), 20) for q in queries) / themes
+    logger.info(f"{topics} topics, {themes} themes")
+    logger.info(f"linear scan    {linear:8.1f} us/theme")
+    logger.info(f"trigram index  {indexed:8.1f} us/theme  ({linear / indexed:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, default=2000)
+    parser.add_argument("--themes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args.topics, args.themes, args.seed)
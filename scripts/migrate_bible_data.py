@@ -17,11 +17,12 @@ if str(BACKEND) not in sys.path:
 from dotenv import load_dotenv
 load_dotenv(PROJECT_ROOT / ".env")
 
-from sqlalchemy import create_engine, select, func
+from sqlalchemy import create_engine, select, func, text
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
 from app.core.config import settings
+from app.core.database import BIBLE_DATA_CHANNEL
 from app.models import BibleBook, BibleVerse, BibleTopic, BibleTopicVerse
 
 # Setup logging
@@ -132,6 +133,54 @@ def migrate_individual_books(session: Session) -> tuple[int, int]:
     return books_added, verses_added
 
 
+def refresh_book_verse_counts(session: Session) -> int:
+    """Materialize bible_books.verse_counts (per-chapter verse counts) from bible_verses. Returns books updated."""
+    result = session.execute(
+        text(
+            """
+            UPDATE bible_books b
+            SET verse_counts = c.counts
+            FROM (
+                SELECT book_id, jsonb_agg(n ORDER BY chapter) AS counts
+                FROM (
+                    SELECT book_id, chapter, count(*) AS n
+                    FROM bible_verses
+                    GROUP BY book_id, chapter
+                ) per_chapter
+                GROUP BY book_id
+            ) c
+            WHERE c.book_id = b.id
+            """
+        )
+    )
+    session.flush()
+    logger.info(f"Verse counts refreshed for {result.rowcount} books")
+    return result.rowcount
+
+
+def refresh_verse_ordinals(session: Session) -> int:
+    """Number bible_verses.ordinal 1..N by (book_number, chapter, verse_number). Returns verses renumbered."""
+    result = session.execute(
+        text(
+            """
+            UPDATE bible_verses v
+            SET ordinal = o.n
+            FROM (
+                SELECT bv.id, row_number() OVER (
+                    ORDER BY bb.book_number, bv.chapter, bv.verse_number
+                ) AS n
+                FROM bible_verses bv
+                JOIN bible_books bb ON bb.id = bv.book_id
+            ) o
+            WHERE o.id = v.id AND v.ordinal IS DISTINCT FROM o.n
+            """
+        )
+    )
+    session.flush()
+    logger.info(f"Verse ordinals refreshed for {result.rowcount} verses")
+    return result.rowcount
+
+
 def migrate_amharic_topics(session: Session) -> tuple[int, int]:
     """Load amharic_bible_topics.json into bible_topics and bible_topic_verses. Returns (topics_count, verses_count)."""
     import json
@@ -232,6 +281,8 @@ def main() -> None:
             logger.info("=" * 70)
             books_count, verses_count = migrate_individual_books(session)
             logger.info(f"✓ Completed: {books_count} books, {verses_count} verses processed")
+            refresh_book_verse_counts(session)
+            refresh_verse_ordinals(session)
 
             # Topics -> bible_topics, bible_topic_verses
             logger.info("")
@@ -241,6 +292,9 @@ def main() -> None:
             topics_count, topic_verses_count = migrate_amharic_topics(session)
             logger.info(f"✓ Completed: {topics_count} topics, {topic_verses_count} topic verses processed")
 
+            # Delivered on commit: running API workers drop their cached corpus/topics.
+            session.execute(select(func.pg_notify(BIBLE_DATA_CHANNEL, "")))
+
             logger.info("")
             logger.info("Committing transaction...")
             session.commit()